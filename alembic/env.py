@@ -5,14 +5,23 @@ from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 from alembic import context
 from events_app.database import Base
-from events_app.models import Event
+from events_app.models import Event, EventArchive, EventCalendarBucket, EventOutbox, EventSeries, EventWatermark
 
 config = context.config
 
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-MICROSERVICE_TABLES = {"event"}
+if os.getenv("DATABASE_URL"):
+    # The app and its migrations always target the same database; "%" is escaped for configparser.
+    config.set_main_option("sqlalchemy.url", os.environ["DATABASE_URL"].replace("%", "%%"))
+elif not config.get_main_option("sqlalchemy.url"):
+    raise ValueError("No database URL found. Please set DATABASE_URL environment variable.")
+
+MICROSERVICE_TABLES = {"event", "event_series", "event_watermark", "event_archive", "event_outbox",
+                       "event_calendar_bucket"}
+# Created by raw DDL (see models.POSTGRES_SEARCH_DDL), not mapped; autogenerate must not drop them.
+UNMAPPED_OBJECTS = {"search_vector", "ix_event_search_vector"}
 
 target_metadata = Base.metadata
 
@@ -20,6 +29,9 @@ def include_object(object, name, type_, reflected, compare_to):
     """
     Return True if the object should be included in the migration, False otherwise.
     """
+    if reflected and compare_to is None and name in UNMAPPED_OBJECTS:
+        return False
+
     if type_ == "table" and name in MICROSERVICE_TABLES:
         return True
     
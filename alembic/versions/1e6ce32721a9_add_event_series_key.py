@@ -0,0 +1,42 @@
+"""add event series key
+
+Revision ID: 1e6ce32721a9
+Revises: d3a09f0cca88
+Create Date: 2026-10-16 09:12:31.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1e6ce32721a9'
+down_revision: Union[str, Sequence[str], None] = 'd3a09f0cca88'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('event', sa.Column('series_key', sa.String(length=150), nullable=True))
+    op.execute("UPDATE event SET series_key = trim(split_part(title, ' - ', 1))")
+    # Rows that already collide on (series_key, start_date) keep their data but get a
+    # distinct key, so the unique index can be created without deleting anything.
+    op.execute(
+        """
+        UPDATE event SET series_key = left(series_key, 130) || ' #' || id
+        WHERE id NOT IN (
+            SELECT min(id) FROM event GROUP BY series_key, start_date
+        )
+        """
+    )
+    op.alter_column('event', 'series_key', nullable=False)
+    op.create_index('uq_event_series_key_start_date', 'event', ['series_key', 'start_date'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_event_series_key_start_date', table_name='event')
+    op.drop_column('event', 'series_key')
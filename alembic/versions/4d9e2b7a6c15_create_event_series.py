@@ -0,0 +1,47 @@
+"""create event series
+
+Revision ID: 4d9e2b7a6c15
+Revises: c5a8e3f17b42
+Create Date: 2026-10-17 00:41:08.250391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d9e2b7a6c15'
+down_revision: Union[str, Sequence[str], None] = 'c5a8e3f17b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_series',
+    sa.Column('key', sa.String(length=150), nullable=False),
+    sa.Column('frequency', sa.String(length=10), nullable=False),
+    sa.Column('interval_count', sa.Integer(), nullable=False),
+    sa.Column('duration_seconds', sa.Integer(), nullable=False),
+    sa.Column('deadline_offset_seconds', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.CheckConstraint("frequency IN ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY')", name='check_series_frequency'),
+    sa.CheckConstraint('interval_count >= 1', name='check_series_interval_positive'),
+    sa.CheckConstraint('duration_seconds > 0', name='check_series_duration_positive'),
+    sa.CheckConstraint('deadline_offset_seconds > 0', name='check_series_deadline_offset_positive'),
+    sa.PrimaryKeyConstraint('key')
+    )
+    # Existing series keep the rule that used to be hard-coded: monthly, 5 days, deadline 1 second before start.
+    op.execute(
+        """
+        INSERT INTO event_series (key, frequency, interval_count, duration_seconds, deadline_offset_seconds)
+        SELECT DISTINCT series_key, 'MONTHLY', 1, 432000, 1 FROM event
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('event_series')
@@ -0,0 +1,42 @@
+"""create event calendar bucket
+
+Revision ID: 5d2a7c9e3b16
+Revises: 3b7e1d9c5f04
+Create Date: 2026-10-17 04:21:36.804512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a7c9e3b16'
+down_revision: Union[str, Sequence[str], None] = '3b7e1d9c5f04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_calendar_bucket',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('registration_deadline', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('end_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('event_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'registration_deadline', 'end_date', 'is_active')
+    )
+    op.execute(
+        "INSERT INTO event_calendar_bucket (day, registration_deadline, end_date, is_active, event_count) "
+        "SELECT (start_date AT TIME ZONE 'Europe/Kyiv')::date, registration_deadline, end_date, is_active, count(*) "
+        "FROM (SELECT start_date, registration_deadline, end_date, is_active FROM event "
+        "UNION ALL SELECT start_date, registration_deadline, end_date, is_active FROM event_archive) AS events "
+        "GROUP BY 1, 2, 3, 4"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('event_calendar_bucket')
@@ -0,0 +1,30 @@
+"""add event keyset index
+
+Revision ID: 7b2f4c91d0e3
+Revises: 1e6ce32721a9
+Create Date: 2026-10-16 10:02:47.903115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2f4c91d0e3'
+down_revision: Union[str, Sequence[str], None] = '1e6ce32721a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_event_start_date_id', 'event', ['start_date', 'id'], unique=False)
+    op.create_index('ix_event_is_active_start_date_id', 'event', ['is_active', 'start_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_is_active_start_date_id', table_name='event')
+    op.drop_index('ix_event_start_date_id', table_name='event')
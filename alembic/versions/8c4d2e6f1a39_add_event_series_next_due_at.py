@@ -0,0 +1,34 @@
+"""add event_series next_due_at
+
+Revision ID: 8c4d2e6f1a39
+Revises: 6e3b9f2a8c51
+Create Date: 2026-10-17 03:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4d2e6f1a39'
+down_revision: Union[str, Sequence[str], None] = '6e3b9f2a8c51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('event_series', sa.Column('next_due_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        "UPDATE event_series SET next_due_at = "
+        "(SELECT max(event.start_date) FROM event WHERE event.series_key = event_series.key)"
+    )
+    op.create_index('ix_event_series_next_due_at', 'event_series', ['next_due_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_series_next_due_at', table_name='event_series')
+    op.drop_column('event_series', 'next_due_at')
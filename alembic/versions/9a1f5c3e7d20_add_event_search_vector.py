@@ -0,0 +1,40 @@
+"""add event search vector
+
+Revision ID: 9a1f5c3e7d20
+Revises: 4d9e2b7a6c15
+Create Date: 2026-10-17 01:12:44.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a1f5c3e7d20'
+down_revision: Union[str, Sequence[str], None] = '4d9e2b7a6c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Generated column: Postgres keeps it current on every insert and update, no trigger needed.
+    # Adding a stored generated column rewrites the table once.
+    op.execute(
+        """
+        ALTER TABLE event ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(theme, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+        ) STORED
+        """
+    )
+    op.create_index('ix_event_search_vector', 'event', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_search_vector', table_name='event', postgresql_using='gin')
+    op.drop_column('event', 'search_vector')
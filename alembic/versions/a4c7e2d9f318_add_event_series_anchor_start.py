@@ -0,0 +1,37 @@
+"""add event_series anchor_start
+
+Revision ID: a4c7e2d9f318
+Revises: 5d2a7c9e3b16
+Create Date: 2026-10-17 14:06:22.503117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7e2d9f318'
+down_revision: Union[str, Sequence[str], None] = '5d2a7c9e3b16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('event_series', sa.Column('anchor_start', sa.DateTime(timezone=True), nullable=True))
+    # Rows chained before this migration may be off the anchor's grid; RecurrenceRule skips grid
+    # points within half a step of the latest row, so they get no second occurrence in its period.
+    op.execute(
+        "UPDATE event_series SET anchor_start = (SELECT min(starts.start_date) FROM ("
+        "SELECT start_date FROM event WHERE event.series_key = event_series.key "
+        "UNION ALL "
+        "SELECT start_date FROM event_archive WHERE event_archive.series_key = event_series.key"
+        ") AS starts)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('event_series', 'anchor_start')
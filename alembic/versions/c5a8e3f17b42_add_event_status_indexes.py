@@ -0,0 +1,30 @@
+"""add event status indexes
+
+Revision ID: c5a8e3f17b42
+Revises: 7b2f4c91d0e3
+Create Date: 2026-10-17 00:05:12.664730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a8e3f17b42'
+down_revision: Union[str, Sequence[str], None] = '7b2f4c91d0e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_event_registration_deadline', 'event', ['registration_deadline'], unique=False)
+    op.create_index('ix_event_end_date', 'event', ['end_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_end_date', table_name='event')
+    op.drop_index('ix_event_registration_deadline', table_name='event')
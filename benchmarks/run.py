@@ -0,0 +1,270 @@
+"""
+Benchmark suite for the events API, EventManager and the recurrence task.
+
+Seeds a database with weekly series, times the hot paths and writes the results as JSON,
+so runs from different commits can be compared:
+
+    python -m benchmarks.run --sizes 10000 100000 --series 100 --output results.json
+    python -m benchmarks.run --sizes 10000 --compare baseline.json
+
+The database is WIPED before every size. By default a SQLite file in the temp directory is used
+(needs aiosqlite, see benchmarks/requirements.txt); pass --database-url or set BENCH_DATABASE_URL
+to run against a local Postgres instead. Redis is optional: the list cache is disabled so every
+request hits the database.
+"""
+from datetime import datetime, timedelta, timezone
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_DATABASE_URL = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'events_bench.db')}"
+SEED_CHUNK_SIZE = 10000
+PAGE_SIZE = 100
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the events microservice.")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000], help="Numbers of seeded events")
+    parser.add_argument("--series", type=int, default=100, help="Number of series the events are spread across")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per timed operation")
+    parser.add_argument("--bulk-size", type=int, default=500, help="Items per POST /events/bulk request")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="Print the median change against an earlier JSON result")
+    return parser.parse_args(argv)
+
+
+def configure_environment(database_url: str) -> None:
+    """Must run before events_app is imported: the engines are created from these variables."""
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ["EVENTS_CACHE_ENABLED"] = "false"
+    os.environ.setdefault("REDIS_URL", "redis://127.0.0.1:6379/15")
+
+
+def timed(fn, repeat: int) -> dict:
+    """Runs fn `repeat` times and returns min/median/max wall time in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "runs": repeat,
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def reset_schema() -> None:
+    from events_app.database import Base, get_engine
+    from events_app import models  # noqa: F401
+    Base.metadata.drop_all(bind=get_engine())
+    Base.metadata.create_all(bind=get_engine())
+
+
+def seed(size: int, series_count: int) -> float:
+    """
+    Inserts `size` events spread evenly over `series_count` weekly series.
+    The latest occurrence of every series started 1-6 days ago, so every series is due for the daily task.
+    Returns the seeding time in seconds.
+    """
+    from sqlalchemy import insert
+    from events_app.database import get_engine
+    from events_app.models import Event, EventSeries
+    from events_app.recurrence import RecurrenceRule
+
+    rule = RecurrenceRule("WEEKLY", 1, duration=timedelta(days=2), deadline_offset=timedelta(days=1))
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    created_at = datetime.now(timezone.utc)
+    per_series = [size // series_count + (1 if index < size % series_count else 0) for index in range(series_count)]
+    anchors = [
+        today - timedelta(days=1 + index % 6) - timedelta(weeks=count - 1) for index, count in enumerate(per_series)
+    ]
+
+    started = time.perf_counter()
+    with get_engine().begin() as conn:
+        conn.execute(insert(EventSeries.__table__), [
+            {
+                "key": f"Bench {index}",
+                "next_due_at": rule.start_of(anchors[index], per_series[index] - 1),
+                "anchor_start": anchors[index],
+                "frequency": rule.frequency,
+                "interval_count": rule.interval,
+                "duration_seconds": int(rule.duration.total_seconds()),
+                "deadline_offset_seconds": int(rule.deadline_offset.total_seconds()),
+            }
+            for index in range(series_count)
+        ])
+        rows = []
+        for index, count in enumerate(per_series):
+            series_key = f"Bench {index}"
+            for k in range(count):
+                start_date = rule.start_of(anchors[index], k)
+                rows.append({
+                    "title": rule.title_for(series_key, start_date),
+                    "series_key": series_key,
+                    "theme": "Benchmark",
+                    "description": None,
+                    "is_active": k % 10 != 0,
+                    "created_at": created_at,
+                    **rule.dates_for_start(start_date),
+                })
+                if len(rows) >= SEED_CHUNK_SIZE:
+                    conn.execute(insert(Event.__table__), rows)
+                    rows = []
+        if rows:
+            conn.execute(insert(Event.__table__), rows)
+    return time.perf_counter() - started
+
+
+def deep_cursor(size: int) -> str:
+    """Cursor pointing PAGE_SIZE events before the end of the list."""
+    from sqlalchemy import select
+    from events_app.database import SessionLocal
+    from events_app.models import Event
+    from events_app.pagination import encode_cursor
+
+    with SessionLocal() as db:
+        start_date, event_id = db.execute(
+            select(Event.start_date, Event.id)
+            .order_by(Event.start_date, Event.id)
+            .offset(max(size - PAGE_SIZE - 1, 0))
+            .limit(1)
+        ).one()
+    return encode_cursor(start_date, event_id)
+
+
+def run_size(client, size: int, series_count: int, repeat: int, bulk_size: int) -> dict:
+    from events_app.database import SessionLocal
+    from events_app.managers import EventManager
+    from events_app.tasks import generate_recurring_events
+
+    reset_schema()
+    seed_seconds = seed(size, series_count)
+    cursor = deep_cursor(size)
+    deep_skip = max(size - PAGE_SIZE, 0)
+    timings = {}
+
+    def get(url, **params):
+        response = client.get(url, params=params)
+        response.raise_for_status()
+
+    timings["list_first_page"] = timed(lambda: get("/events/", limit=PAGE_SIZE), repeat)
+    timings["list_deep_offset"] = timed(lambda: get("/events/", skip=deep_skip, limit=PAGE_SIZE), repeat)
+    timings["list_deep_cursor"] = timed(lambda: get("/events/", cursor=cursor, limit=PAGE_SIZE), repeat)
+    timings["list_status_open"] = timed(lambda: get("/events/", status="Open", limit=PAGE_SIZE), repeat)
+
+    def due_events():
+        with SessionLocal() as db:
+            EventManager(db).get_due_events(due_before=datetime.now(timezone.utc))
+    timings["manager_due_events"] = timed(due_events, repeat)
+
+    counter = iter(range(sys.maxsize))
+    start = (datetime.now(timezone.utc) + timedelta(days=30)).date()
+    dates = {
+        "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=2)).isoformat(),
+        "registration_deadline": (start - timedelta(days=1)).isoformat(),
+    }
+
+    def create_initial():
+        response = client.post("/events/initial", json={"title": f"Initial {next(counter)}", "theme": "Benchmark", **dates})
+        response.raise_for_status()
+    timings["create_initial"] = timed(create_initial, repeat)
+
+    def create_bulk():
+        batch = next(counter)
+        payload = [{"title": f"Bulk {batch}-{item}", "theme": "Benchmark", **dates} for item in range(bulk_size)]
+        response = client.post("/events/bulk", json=payload)
+        response.raise_for_status()
+    timings["create_bulk"] = timed(create_bulk, repeat)
+
+    created = {}
+    def daily_task():
+        created.update(generate_recurring_events())
+    timings["daily_task"] = timed(daily_task, 1)
+    timings["daily_task"]["created_count"] = created.get("created_count")
+    timings["daily_task_nothing_due"] = timed(generate_recurring_events, repeat)
+
+    return {"size": size, "series": series_count, "seed_seconds": round(seed_seconds, 3), "timings": timings}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Prints the median change of every timing present in both runs."""
+    baseline_by_size = {entry["size"]: entry for entry in baseline["results"]}
+    for entry in results["results"]:
+        previous = baseline_by_size.get(entry["size"])
+        if previous is None:
+            continue
+        for name, timing in entry["timings"].items():
+            before = previous["timings"].get(name)
+            if before is None or not before["median_ms"]:
+                continue
+            change = (timing["median_ms"] - before["median_ms"]) / before["median_ms"] * 100
+            print(
+                f"{entry['size']:>9} {name:<24} {before['median_ms']:>10.2f} -> {timing['median_ms']:>10.2f} ms "
+                f"({change:+.1f}%)",
+                file=sys.stderr,
+            )
+
+
+def main(argv=None) -> dict:
+    args = parse_args(argv)
+    configure_environment(args.database_url)
+    # Per-event info logs and "Redis unavailable" errors would dominate the output and the timings.
+    logging.getLogger("events_app").setLevel(logging.CRITICAL)
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy.engine import make_url
+    import sqlalchemy
+    from events_app.main import app
+
+    client = TestClient(app)
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "database": make_url(args.database_url).get_backend_name(),
+            "repeat": args.repeat,
+            "page_size": PAGE_SIZE,
+            "bulk_size": args.bulk_size,
+        },
+        "results": [
+            run_size(client, size, args.series, args.repeat, args.bulk_size) for size in args.sizes
+        ],
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    return results
+
+
+if __name__ == "__main__":
+    main()
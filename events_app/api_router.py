@@ -1,27 +1,50 @@
-from fastapi import APIRouter, Depends, status, HTTPException, Query 
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from fastapi import APIRouter, Depends, status, HTTPException, Query, Header, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional 
-from .database import get_db
-from datetime import datetime, timezone, time
+from .database import get_async_db, get_async_read_db
+from datetime import date
 import logging
-from .schemas import EventSerializer, EventCreate 
-from .models import Event
-from .managers import EventManager 
-from .tasks import generate_recurring_events 
-import pytz
-
-KYIV_TZ = pytz.timezone('Europe/Kyiv')
+from .schemas import (
+    EventSerializer, EventCreate, EventBulkResult, EventBulkConflict, EventStatus, OccurrenceSerializer, SearchSort,
+    TaskTriggerResult, TaskStatusSerializer, CalendarDaySerializer,
+)
+from .models import series_key_from_title
+from .managers import AsyncEventManager, occurrence_key, BULK_MAX_ITEMS
+from .pagination import next_cursor
+from .cache import event_list_cache, pack_page, unpack_page
+from .serialization import render_event_rows
+from .conditional import list_validators, http_date, is_not_modified
+from .export import ExportFormat, EXPORT_MEDIA_TYPES, stream_events
+from .tasks import trigger_recurring_events, task_status
+from redis.exceptions import RedisError
+from .celery_app import RECURRENCE_TASK_KWARGS
+from .profiling import profiling_requested
+from .local_time import to_aware_utc_midnight, month_days, kyiv_day
 
 router = APIRouter(prefix="/events")
 logger = logging.getLogger(__name__)
 
-def to_aware_utc_midnight(dt_date):
-    """Converts a date to 00:00:00 Kyiv time, then to UTC."""
-    tz_utc = timezone.utc
-    dt_naive = datetime.combine(dt_date, time(0, 0, 0))
-    dt_aware_kyiv = KYIV_TZ.localize(dt_naive)
-    return dt_aware_kyiv.astimezone(tz_utc).replace(microsecond=0)
+def normalize_event_in(event_in: EventCreate) -> EventCreate:
+    """
+    Moves all dates of an incoming event to Kyiv midnight (UTC) and renames it to "Base - Month Year".
+    Raises ValueError if the dates are not in deadline < start < end order.
+    """
+    event_in.start_date = to_aware_utc_midnight(event_in.start_date)
+    event_in.end_date = to_aware_utc_midnight(event_in.end_date)
+    event_in.registration_deadline = to_aware_utc_midnight(event_in.registration_deadline)
+    if event_in.registration_deadline >= event_in.start_date:
+        raise ValueError(
+            f"Registration deadline ({event_in.registration_deadline}) must be strictly before the start date ({event_in.start_date})."
+        )
+    if event_in.start_date >= event_in.end_date:
+        raise ValueError(
+            f"Start date ({event_in.start_date}) must be strictly before the end date ({event_in.end_date})."
+        )
+    base_title = series_key_from_title(event_in.title)
+    month_year = kyiv_day(event_in.start_date).strftime('%B %Y')
+    event_in.title = f"{base_title} - {month_year}"
+    return event_in
 
 @router.post(
     "/initial",
@@ -29,31 +52,23 @@ def to_aware_utc_midnight(dt_date):
     status_code=status.HTTP_201_CREATED,
     summary="Create the initial base event for recurrence",
 )
-def create_initial_event(
+async def create_initial_event(
     event_in: EventCreate, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Creates the initial base event"""
-    manager = EventManager(db)
+    manager = AsyncEventManager(db)
     
-    event_in.start_date = to_aware_utc_midnight(event_in.start_date)
-    event_in.end_date = to_aware_utc_midnight(event_in.end_date)
-    event_in.registration_deadline = to_aware_utc_midnight(event_in.registration_deadline)
-    if event_in.registration_deadline >= event_in.start_date:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Registration deadline ({event_in.registration_deadline}) must be strictly before the start date ({event_in.start_date})."
-        )
-    base_title = event_in.title.split(' - ')[0].strip()
-    month_year = event_in.start_date.strftime('%B %Y')
-    event_in.title = f"{base_title} - {month_year}"
+    try:
+        normalize_event_in(event_in)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
     try:
-        db_event = manager.create_base_event(event_in)
-        db.commit()
+        db_event = await manager.create_base_event(event_in)
+        await event_list_cache.invalidate()
         return db_event
-    except IntegrityError as e:
-        db.rollback()
+    except ValueError as e:
         logger.error(f"IntegrityError creating event: {e}")
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -61,38 +76,256 @@ def create_initial_event(
         )
 
 
+@router.post(
+    "/bulk",
+    response_model=EventBulkResult,
+    summary="Create many initial base events in one request",
+)
+async def create_bulk_events(
+    events_in: List[EventCreate],
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Creates many base events at once. Invalid items and items that already exist
+    are reported in `conflicts` instead of failing the whole batch.
+    Payloads of more than BULK_MAX_ITEMS events are rejected with 413.
+    """
+    if len(events_in) > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"A bulk request may create at most {BULK_MAX_ITEMS} events, got {len(events_in)}.",
+        )
+    manager = AsyncEventManager(db)
+    conflicts = []
+    accepted = {}
+
+    for index, event_in in enumerate(events_in):
+        try:
+            normalize_event_in(event_in)
+        except ValueError as e:
+            conflicts.append(EventBulkConflict(index=index, title=event_in.title, detail=str(e)))
+            continue
+        key = occurrence_key(series_key_from_title(event_in.title), event_in.start_date)
+        if key in accepted:
+            conflicts.append(EventBulkConflict(
+                index=index, title=event_in.title, detail=f"Duplicate of item {accepted[key][0]} in this request."
+            ))
+            continue
+        accepted[key] = (index, event_in)
+
+    created = await manager.create_base_events([event_in for _, event_in in accepted.values()])
+    created_by_key = {occurrence_key(event.series_key, event.start_date): event for event in created}
+    if created:
+        await event_list_cache.invalidate()
+
+    for key, (index, event_in) in accepted.items():
+        if key not in created_by_key:
+            conflicts.append(EventBulkConflict(
+                index=index, title=event_in.title, detail="An event with the same series and start date already exists."
+            ))
+    conflicts.sort(key=lambda conflict: conflict.index)
+    logger.info(f"Bulk creation finished: {len(created)} created, {len(conflicts)} conflicts.")
+    return EventBulkResult(
+        created=[created_by_key[key] for key in accepted if key in created_by_key],
+        conflicts=conflicts,
+    )
+
+
 @router.get(
     "/",
     response_model=List[EventSerializer],
     summary="Get all events with optional filtering and pagination"
 )
-def get_all_events(
-    db: Session = Depends(get_db),
+async def get_all_events(
+    db: AsyncSession = Depends(get_async_read_db),
     is_active: Optional[bool] = Query(None, description="Filter by event activity status"),
     skip: int = Query(0, description="Number of events to skip (offset)"),
-    limit: int = Query(100, description="Maximum number of events to return (limit)")
+    limit: int = Query(100, description="Maximum number of events to return (limit)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header; replaces skip"),
+    event_status: Optional[EventStatus] = Query(None, alias="status", description="Filter by registration status"),
+    include_archived: bool = Query(False, description="Also list events moved to the archive"),
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
 ):
-    """Gets all events"""
-    query = db.query(Event)
-    if is_active is not None:
-        query = query.filter(Event.is_active == is_active)
-    query = query.order_by(Event.start_date)
-    query = query.offset(skip).limit(limit)
-    
-    events = query.all()
-    return events
+    """
+    Gets all events. The cursor of the next page is returned in the X-Next-Cursor header.
+    Responses carry ETag / Last-Modified derived from the event watermark; a matching
+    If-None-Match (or If-Modified-Since) gets 304 before the list query runs.
+    Pages are served from the event list cache until the next write bumps its version.
+    """
+    manager = AsyncEventManager(db)
+    watermark = await manager.get_watermark()
+    version = watermark.version if watermark else 0
+    etag, last_modified = list_validators(version, watermark.modified_at if watermark else None)
+    headers = {"ETag": etag, "Last-Modified": http_date(last_modified), "Cache-Control": "no-cache"}
+    if is_not_modified(etag, last_modified, if_none_match, if_modified_since):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    params = {
+        "is_active": is_active,
+        "status": event_status.value if event_status else None,
+        "skip": None if cursor else skip,
+        "limit": limit,
+        "cursor": cursor,
+        "archived": include_archived,
+        "watermark": version,
+        # Bodies carry the computed status: a page cached in one status window is not served in the next.
+        "etag": etag,
+    }
+    cache_key = await event_list_cache.key_for(params)
+    cached = await event_list_cache.get(cache_key) if cache_key else None
+
+    if cached is not None:
+        body, cursor_for_next_page = unpack_page(cached)
+    else:
+        try:
+            events = await manager.list_event_rows(
+                is_active=is_active, skip=skip, limit=limit, cursor=cursor, event_status=event_status,
+                include_archived=include_archived,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        body = render_event_rows(events)
+        cursor_for_next_page = next_cursor(events, limit)
+        if cache_key:
+            await event_list_cache.set(cache_key, pack_page(body, cursor_for_next_page))
+
+    if cursor_for_next_page:
+        headers["X-Next-Cursor"] = cursor_for_next_page
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/search",
+    response_model=List[EventSerializer],
+    summary="Full-text search over event title, theme and description",
+)
+async def search_events(
+    db: AsyncSession = Depends(get_async_read_db),
+    q: str = Query(..., min_length=1, max_length=200, description="Words that must all appear in the event"),
+    is_active: Optional[bool] = Query(None, description="Filter by event activity status"),
+    skip: int = Query(0, description="Number of events to skip (offset)"),
+    limit: int = Query(100, description="Maximum number of events to return (limit)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header (sort=start_date only)"),
+    sort: SearchSort = Query(SearchSort.RELEVANCE, description="relevance or start_date"),
+):
+    """
+    Searches events by title, theme and description. Matches are ranked with title above theme
+    above description. With sort=start_date the X-Next-Cursor header works like on GET /events/.
+    """
+    manager = AsyncEventManager(db)
+    try:
+        events = await manager.search_event_rows(
+            q, is_active=is_active, skip=skip, limit=limit, cursor=cursor, sort=sort
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    cursor_for_next_page = next_cursor(events, limit) if sort == SearchSort.START_DATE else None
+    headers = {"X-Next-Cursor": cursor_for_next_page} if cursor_for_next_page else None
+    return Response(content=render_event_rows(events), media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/occurrences",
+    response_model=List[OccurrenceSerializer],
+    summary="Get real and virtual occurrences of all series in a date window",
+)
+async def get_occurrences(
+    db: AsyncSession = Depends(get_async_read_db),
+    window_start: date = Query(..., alias="from", description="First day of the window (Kyiv time)"),
+    window_end: date = Query(..., alias="to", description="Day after the window (Kyiv time, exclusive)"),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of occurrences to return"),
+):
+    """
+    Returns stored events plus the occurrences each series' recurrence rule would produce
+    in the window, without writing rows. Virtual occurrences have no id.
+    """
+    window_start_utc = to_aware_utc_midnight(window_start)
+    window_end_utc = to_aware_utc_midnight(window_end)
+    if window_end_utc <= window_start_utc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"The end of the window ({window_end}) must be after its start ({window_start})."
+        )
+    manager = AsyncEventManager(db)
+    return await manager.list_occurrences(window_start_utc, window_end_utc, limit=limit)
+
+
+@router.get(
+    "/calendar",
+    response_model=List[CalendarDaySerializer],
+    summary="Get per-day event counts by status for one month",
+)
+async def get_calendar(
+    db: AsyncSession = Depends(get_async_read_db),
+    month: str = Query(..., description="Month as YYYY-MM (Kyiv time)"),
+    is_active: Optional[bool] = Query(None, description="Filter by event activity status"),
+):
+    """
+    Returns the Open / Closed / Completed counts of events starting on each Kyiv day of the month,
+    from the precomputed calendar buckets. Days without events are left out.
+    """
+    try:
+        first_day, end_day = month_days(month)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    manager = AsyncEventManager(db)
+    return await manager.get_calendar(first_day, end_day, is_active=is_active)
+
+
+@router.get(
+    "/export",
+    summary="Stream all events as NDJSON or CSV",
+    response_class=StreamingResponse,
+)
+async def export_events(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format", description="ndjson or csv"),
+    is_active: Optional[bool] = Query(None, description="Filter by event activity status"),
+):
+    """Streams every event from a server-side cursor; memory use does not grow with the table."""
+    return StreamingResponse(
+        stream_events(export_format, is_active=is_active),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="events.{export_format.value}"'},
+    )
 
 
 @router.post(
     "/celery/trigger-manual",
+    response_model=TaskTriggerResult,
     summary="Manually trigger Celery task (for instant testing)",
     status_code=status.HTTP_202_ACCEPTED
 )
-def trigger_celery_task():
-    '''Manually triggers the Celery task to generate recurring events.'''
-    task = generate_recurring_events.delay()
-    logger.info(f"Celery task generated. Task ID: {task.id}")
-    return {
-        "message": "Celery task successfully triggered.",
-        "task_id": task.id
-    }
\ No newline at end of file
+def trigger_celery_task(request: Request):
+    '''
+    Manually triggers the Celery task to generate recurring events.
+    While a triggered run is queued or running, its task id is returned instead of enqueuing another.
+    X-Profile: 1 from a trusted address makes the run write a profile report on the worker.
+    '''
+    task_kwargs = dict(RECURRENCE_TASK_KWARGS)
+    if profiling_requested(request):
+        task_kwargs["profile"] = True
+    trigger = trigger_recurring_events(**task_kwargs)
+    if trigger["coalesced"]:
+        logger.info(f"Celery task already queued or running. Task ID: {trigger['task_id']}")
+        message = "Celery task already queued or running."
+    else:
+        logger.info(f"Celery task generated. Task ID: {trigger['task_id']}")
+        message = "Celery task successfully triggered."
+    return {"message": message, **trigger}
+
+
+@router.get(
+    "/celery/tasks/{task_id}",
+    response_model=TaskStatusSerializer,
+    summary="Get the status and result of a Celery task",
+)
+def get_celery_task_status(task_id: str):
+    '''Reports the task state from the result backend; poll this instead of re-triggering.'''
+    try:
+        return task_status(task_id)
+    except (RedisError, OSError) as e:
+        logger.error(f"Cannot read task {task_id} from the result backend: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="The task result backend is unavailable."
+        )
\ No newline at end of file
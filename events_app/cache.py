@@ -0,0 +1,137 @@
+from typing import Optional, Tuple
+from collections import OrderedDict
+import threading
+import time
+import logging
+import os
+from redis.exceptions import RedisError
+from .redis_client import get_redis, get_async_redis
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENABLED = os.getenv("EVENTS_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+CACHE_TTL_SECONDS = int(os.getenv("EVENTS_CACHE_TTL_SECONDS", "60"))
+CACHE_LOCAL_TTL_SECONDS = float(os.getenv("EVENTS_CACHE_LOCAL_TTL_SECONDS", "5"))
+CACHE_LOCAL_MAX_ENTRIES = int(os.getenv("EVENTS_CACHE_LOCAL_MAX_ENTRIES", "256"))
+
+VERSION_KEY = "events:list:version"
+ENTRY_KEY_PREFIX = "events:list:page"
+
+
+class LocalLRUCache:
+    '''Small in-process LRU with a per-entry TTL. Safe to share between threads.'''
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def pack_page(body: bytes, next_cursor: Optional[str]) -> bytes:
+    '''Packs a rendered page and its next cursor into one cache value.'''
+    return (next_cursor or "").encode() + b"\n" + body
+
+
+def unpack_page(value: bytes) -> Tuple[bytes, Optional[str]]:
+    '''Reverse of pack_page.'''
+    cursor, _, body = value.partition(b"\n")
+    return body, cursor.decode() or None
+
+
+class EventListCache:
+    '''
+    Read-through cache for event list pages: a LocalLRUCache in front of Redis.
+
+    Every key embeds the current list version stored in Redis. Writers bump the
+    version after committing, which makes all older entries unreachable in both
+    tiers at once. If Redis is unavailable the cache is bypassed, never trusted.
+    '''
+    def __init__(self, local: LocalLRUCache, ttl_seconds: int, enabled: bool = True):
+        self.local = local
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+    @staticmethod
+    def build_key(version: str, params: dict) -> str:
+        query = "&".join(f"{name}={params[name]}" for name in sorted(params) if params[name] is not None)
+        return f"{ENTRY_KEY_PREFIX}:{version}:{query}"
+
+    async def key_for(self, params: dict) -> Optional[str]:
+        '''Returns the cache key for the current version, or None if the cache cannot be used.'''
+        if not self.enabled:
+            return None
+        try:
+            version = await get_async_redis().get(VERSION_KEY)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Event list cache bypassed, Redis unavailable: {e}")
+            return None
+        return self.build_key(version.decode() if version else "0", params)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        try:
+            value = await get_async_redis().get(key)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Event list cache read failed: {e}")
+            return None
+        if value is not None:
+            self.local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        self.local.set(key, value)
+        try:
+            await get_async_redis().set(key, value, ex=self.ttl_seconds)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Event list cache write failed: {e}")
+
+    async def invalidate(self) -> None:
+        '''Bumps the list version after a committed write (async routes).'''
+        self.local.clear()
+        try:
+            await get_async_redis().incr(VERSION_KEY)
+        except (RedisError, OSError) as e:
+            logger.error(f"Cannot bump event list version: {e}")
+
+
+event_list_cache = EventListCache(
+    LocalLRUCache(CACHE_LOCAL_MAX_ENTRIES, CACHE_LOCAL_TTL_SECONDS),
+    CACHE_TTL_SECONDS,
+    enabled=CACHE_ENABLED,
+)
+
+
+def bump_event_list_version() -> None:
+    '''Bumps the list version after a committed write (Celery tasks and other sync code).'''
+    try:
+        get_redis().incr(VERSION_KEY)
+    except (RedisError, OSError) as e:
+        logger.error(f"Cannot bump event list version: {e}")
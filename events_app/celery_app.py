@@ -4,6 +4,24 @@ import os
 
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/2") 
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://redis:6379/3")
+RECURRENCE_CATCH_UP = os.getenv("RECURRENCE_CATCH_UP", "true").lower() in ("1", "true", "yes")
+RECURRENCE_HORIZON_MONTHS = int(os.getenv("RECURRENCE_HORIZON_MONTHS", "0"))
+RECURRENCE_SHARD_COUNT = int(os.getenv("RECURRENCE_SHARD_COUNT", "8"))
+RECURRENCE_INTERVAL_MINUTES = int(os.getenv("RECURRENCE_INTERVAL_MINUTES", "60"))
+RECURRENCE_LOCK_KEY = "events:lock:recurrence"
+RECURRENCE_LOCK_TTL_SECONDS = int(os.getenv("RECURRENCE_LOCK_TTL_SECONDS", "900"))
+MANUAL_TRIGGER_KEY = "events:trigger:recurrence"
+MANUAL_TRIGGER_TTL_SECONDS = int(os.getenv("MANUAL_TRIGGER_TTL_SECONDS", "3600"))
+RECURRENCE_TASK_KWARGS = {
+    'catch_up': RECURRENCE_CATCH_UP,
+    'horizon_months': RECURRENCE_HORIZON_MONTHS,
+}
+ARCHIVE_AFTER_DAYS = int(os.getenv("EVENT_ARCHIVE_AFTER_DAYS", "365"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("EVENT_ARCHIVE_BATCH_SIZE", "5000"))
+OUTBOX_RELAY_INTERVAL_SECONDS = float(os.getenv("EVENT_OUTBOX_RELAY_INTERVAL_SECONDS", "5"))
+OUTBOX_RELAY_MAX_BATCHES = int(os.getenv("EVENT_OUTBOX_RELAY_MAX_BATCHES", "20"))
+OUTBOX_RELAY_LOCK_KEY = "events:lock:outbox-relay"
+OUTBOX_RELAY_LOCK_TTL_SECONDS = int(os.getenv("EVENT_OUTBOX_RELAY_LOCK_TTL_SECONDS", "60"))
 celery_app = Celery(
     'event_scheduler',
     broker=CELERY_BROKER_URL,
@@ -13,11 +31,25 @@ celery_app = Celery(
 
 celery_app.conf.update(
     beat_schedule={
-        'generate-recurring-events-daily': {
-            'task': 'events_app.tasks.generate_recurring_events', 
-            'schedule': timedelta(days=1), 
+        'generate-recurring-events': {
+            'task': 'events_app.tasks.dispatch_recurring_events', 
+            'schedule': timedelta(minutes=RECURRENCE_INTERVAL_MINUTES), 
+            'args': (),
+            'kwargs': RECURRENCE_TASK_KWARGS,
+        },
+        'archive-completed-events-daily': {
+            'task': 'events_app.tasks.archive_completed_events',
+            'schedule': timedelta(days=1),
+            'args': (),
+            'kwargs': {'after_days': ARCHIVE_AFTER_DAYS, 'batch_size': ARCHIVE_BATCH_SIZE},
+        },
+        'relay-event-outbox': {
+            'task': 'events_app.tasks.relay_event_outbox',
+            'schedule': timedelta(seconds=OUTBOX_RELAY_INTERVAL_SECONDS),
             'args': (),
         },
     },
     timezone='Europe/Kyiv', 
+    # Lets GET /events/celery/tasks/{id} tell a queued run (PENDING) from a running one (STARTED).
+    task_track_started=True,
 )
\ No newline at end of file
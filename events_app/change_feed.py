@@ -0,0 +1,85 @@
+from typing import List, Optional, Tuple
+import logging
+import os
+from redis.exceptions import ResponseError
+from sqlalchemy.orm import Session
+from .managers import EventManager
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = os.getenv("EVENT_STREAM_KEY", "events:stream:changes")
+# Approximate cap on the stream length (XADD MAXLEN ~); consumers further behind than this lose entries.
+STREAM_MAXLEN = int(os.getenv("EVENT_STREAM_MAXLEN", "100000"))
+OUTBOX_BATCH_SIZE = int(os.getenv("EVENT_OUTBOX_BATCH_SIZE", "500"))
+
+
+def publish_outbox_batch(db: Session, batch_size: int = OUTBOX_BATCH_SIZE) -> int:
+    '''
+    Publishes the oldest batch_size outbox rows to the stream in one pipeline, then deletes
+    them and commits. Delivery is at least once: if the commit fails after XADD the rows are
+    published again by the next run, so consumers deduplicate on outbox_id.
+    Returns the number of published rows.
+    '''
+    manager = EventManager(db)
+    rows = manager.pending_outbox(batch_size)
+    if not rows:
+        db.rollback()
+        return 0
+    pipeline = get_redis().pipeline(transaction=False)
+    for row in rows:
+        pipeline.xadd(
+            STREAM_KEY,
+            {"outbox_id": row.id, "topic": row.topic, "event_id": row.event_id, "payload": row.payload},
+            maxlen=STREAM_MAXLEN,
+            approximate=True,
+        )
+    pipeline.execute()
+    manager.delete_outbox([row.id for row in rows])
+    db.commit()
+    return len(rows)
+
+
+def ensure_consumer_group(group: str, start_id: str = "0") -> None:
+    '''
+    Creates the consumer group (and the stream) if missing. start_id "0" replays everything
+    still in the stream to a new group, "$" only delivers changes published from now on.
+    '''
+    try:
+        get_redis().xgroup_create(STREAM_KEY, group, id=start_id, mkstream=True)
+    except ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def _decode_entries(entries) -> List[Tuple[str, dict]]:
+    decoded = []
+    for entry_id, fields in entries:
+        decoded.append((
+            entry_id.decode(),
+            {key.decode(): value.decode() for key, value in fields.items()},
+        ))
+    return decoded
+
+
+def read_changes(group: str, consumer: str, count: int = 100, block_ms: Optional[int] = None) -> List[Tuple[str, dict]]:
+    '''
+    Reads up to count changes for consumer as (entry id, fields) pairs. Entries this consumer
+    read earlier but never acknowledged come first, so a restarted consumer resumes where
+    it crashed; then new entries, waiting up to block_ms for them.
+    Acknowledge processed entries with ack_changes.
+    '''
+    redis = get_redis()
+    pending = redis.xreadgroup(group, consumer, {STREAM_KEY: "0"}, count=count)
+    entries = pending[0][1] if pending else []
+    if not entries:
+        fresh = redis.xreadgroup(group, consumer, {STREAM_KEY: ">"}, count=count, block=block_ms)
+        entries = fresh[0][1] if fresh else []
+    return _decode_entries(entries)
+
+
+def ack_changes(group: str, entry_ids: List[str]) -> int:
+    '''Acknowledges processed entries; the group's offset stays in Redis. Returns the acknowledged count.'''
+    if not entry_ids:
+        return 0
+    return get_redis().xack(STREAM_KEY, group, *entry_ids)
@@ -0,0 +1,53 @@
+from typing import Optional, Tuple
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from .local_time import as_utc
+import os
+
+# Status (Open/Closed/Completed) changes with time, not only with writes, so validators
+# also roll over every ETAG_STATUS_WINDOW_SECONDS; a 304 is never staler than that.
+ETAG_STATUS_WINDOW_SECONDS = int(os.getenv("EVENTS_ETAG_STATUS_WINDOW_SECONDS", "60"))
+
+
+def list_validators(version: int, modified_at: Optional[datetime], now: Optional[datetime] = None) -> Tuple[str, datetime]:
+    '''
+    Returns (ETag, Last-Modified) of event listings at watermark `version`.
+    Both also change when a new status window starts.
+    '''
+    now = now or datetime.now(timezone.utc)
+    window = int(now.timestamp()) // ETAG_STATUS_WINDOW_SECONDS
+    window_start = datetime.fromtimestamp(window * ETAG_STATUS_WINDOW_SECONDS, timezone.utc)
+    last_modified = max(as_utc(modified_at), window_start) if modified_at else window_start
+    return f'W/"{version}-{window}"', last_modified.replace(microsecond=0)
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_value(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(
+    etag: str,
+    last_modified: datetime,
+    if_none_match: Optional[str] = None,
+    if_modified_since: Optional[str] = None,
+) -> bool:
+    '''
+    RFC 9110 evaluation for GET: If-None-Match (weak comparison) wins over If-Modified-Since,
+    which is only used when the client sent no ETag.
+    '''
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return _etag_value(etag) in {_etag_value(tag) for tag in if_none_match.split(",")}
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return last_modified <= as_utc(since)
+    return False
@@ -1,24 +1,161 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from .metrics import TimedQueuePool, TimedAsyncAdaptedQueuePool, instrument_engine
+from .profiling import profile_engine
+from uuid import uuid4
 import os
 
-DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+psycopg2://postgres:585662vcxz@db:5432/miniF_db")
+DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
 
-if DATABASE_URL is None:
-    raise ValueError("No database URL found. Please set DATABASE_URL environment variable.")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() in ("1", "true", "yes")
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    """Returns the same database URL with its async driver (asyncpg for Postgres)."""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or (to_async_url(DATABASE_URL) if DATABASE_URL else None)
+ASYNC_DATABASE_READ_URL = os.getenv("ASYNC_DATABASE_READ_URL") or (
+    to_async_url(DATABASE_READ_URL) if DATABASE_READ_URL else None
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def require_url(url: str, variable: str) -> str:
+    if not url:
+        raise ValueError(f"No database URL found. Please set {variable} environment variable.")
+    return url
+
+def engine_options(url: str, poolclass, logging_name: str) -> dict:
+    """
+    Pool and driver options shared by all engines. SQLite keeps its default pool.
+    With DB_PGBOUNCER asyncpg never reuses prepared statements, which a transaction-pooling
+    PgBouncer would route to another server connection.
+    """
+    options = {"pool_pre_ping": True, "pool_logging_name": logging_name}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        return options
+    options.update(
+        poolclass=poolclass,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+    if DB_PGBOUNCER and parsed.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return options
+
 Base = declarative_base()
 
+_engine = None
+_async_engine = None
+_async_read_engine = None
+
+def get_engine():
+    """Returns the sync engine, creating it on first use (importing the app never touches the database)."""
+    global _engine
+    if _engine is None:
+        url = require_url(DATABASE_URL, "DATABASE_URL")
+        _engine = create_engine(url, **engine_options(url, TimedQueuePool, "primary"))
+        instrument_engine(_engine, "primary")
+        profile_engine(_engine)
+    return _engine
+
+def get_async_engine():
+    """Returns the async engine of the primary, creating it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        url = require_url(ASYNC_DATABASE_URL, "DATABASE_URL")
+        _async_engine = create_async_engine(url, **engine_options(url, TimedAsyncAdaptedQueuePool, "async"))
+        instrument_engine(_async_engine.sync_engine, "async")
+        profile_engine(_async_engine.sync_engine)
+    return _async_engine
+
+def get_async_read_engine():
+    """
+    Returns the async engine of the read replica (DATABASE_READ_URL), or the primary's
+    async engine when no replica is configured.
+    """
+    global _async_read_engine
+    if ASYNC_DATABASE_READ_URL is None:
+        return get_async_engine()
+    if _async_read_engine is None:
+        url = ASYNC_DATABASE_READ_URL
+        _async_read_engine = create_async_engine(url, **engine_options(url, TimedAsyncAdaptedQueuePool, "async_read"))
+        instrument_engine(_async_read_engine.sync_engine, "async_read")
+        profile_engine(_async_read_engine.sync_engine)
+    return _async_read_engine
+
+class LazySessionMaker(sessionmaker):
+    """sessionmaker that binds its sessions to the engine returned by engine_factory at call time."""
+    def __init__(self, engine_factory, **kw):
+        super().__init__(**kw)
+        self.engine_factory = engine_factory
+
+    def __call__(self, **local_kw):
+        local_kw.setdefault("bind", self.engine_factory())
+        return super().__call__(**local_kw)
+
+class LazyAsyncSessionMaker(async_sessionmaker):
+    """async_sessionmaker counterpart of LazySessionMaker."""
+    def __init__(self, engine_factory, **kw):
+        super().__init__(**kw)
+        self.engine_factory = engine_factory
+
+    def __call__(self, **local_kw):
+        local_kw.setdefault("bind", self.engine_factory())
+        return super().__call__(**local_kw)
+
+SessionLocal = LazySessionMaker(get_engine, autocommit=False, autoflush=False)
+AsyncSessionLocal = LazyAsyncSessionMaker(get_async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = LazyAsyncSessionMaker(get_async_read_engine, autoflush=False, expire_on_commit=False)
+
+def __getattr__(name):
+    """Keeps `database.engine` and the other engine attributes working; each is created on first access."""
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    if name == "async_read_engine":
+        return get_async_read_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def get_db():
     """Dependency that provides a database session."""
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    """Dependency that provides an async database session for async routes."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    """
+    Dependency for read-only routes: a session on the read replica (or the primary if none is configured).
+    Replicas lag behind the primary, so routes that must see their own writes use get_async_db.
+    """
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -0,0 +1,83 @@
+from typing import AsyncIterator, Optional
+from enum import Enum
+from datetime import datetime
+import csv
+import io
+import json
+import os
+from sqlalchemy import select
+from .database import AsyncReadSessionLocal
+from .models import Event
+from .schemas import event_status
+
+EXPORT_BATCH_SIZE = int(os.getenv("EVENTS_EXPORT_BATCH_SIZE", "1000"))
+EXPORT_COLUMNS = [
+    "id", "title", "series_key", "theme", "description",
+    "start_date", "end_date", "registration_deadline", "is_active", "created_at",
+]
+
+
+class ExportFormat(str, Enum):
+    '''Output formats supported by GET /events/export.'''
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _export_row(row) -> dict:
+    data = {name: row[name] for name in EXPORT_COLUMNS}
+    data["status"] = event_status(row["registration_deadline"], row["end_date"]).value
+    return data
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def encode_ndjson(rows) -> str:
+    '''Encodes a batch of rows as newline-delimited JSON.'''
+    return "".join(json.dumps(_export_row(row), default=_json_default, ensure_ascii=False) + "\n" for row in rows)
+
+
+def encode_csv(rows, header: bool = False) -> str:
+    '''Encodes a batch of rows as CSV, optionally preceded by the header line.'''
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS + ["status"])
+    if header:
+        writer.writeheader()
+    for row in rows:
+        writer.writerow({
+            name: value.isoformat() if isinstance(value, datetime) else value
+            for name, value in _export_row(row).items()
+        })
+    return buffer.getvalue()
+
+
+async def stream_events(export_format: ExportFormat, is_active: Optional[bool] = None) -> AsyncIterator[bytes]:
+    '''
+    Yields the event table in (start_date, id) order, one encoded batch at a time.
+    Rows come from a server-side cursor as plain column mappings (no ORM objects),
+    so memory stays bounded by EXPORT_BATCH_SIZE whatever the table size.
+    The session is owned by the generator because it outlives the request handler.
+    '''
+    query = select(*(Event.__table__.c[name] for name in EXPORT_COLUMNS))
+    if is_active is not None:
+        query = query.where(Event.is_active == is_active)
+    query = query.order_by(Event.start_date, Event.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    if export_format == ExportFormat.CSV:
+        yield encode_csv([], header=True).encode("utf-8")
+    async with AsyncReadSessionLocal() as db:
+        result = await db.stream(query)
+        async for rows in result.mappings().partitions():
+            if export_format == ExportFormat.CSV:
+                yield encode_csv(rows).encode("utf-8")
+            else:
+                yield encode_ndjson(rows).encode("utf-8")
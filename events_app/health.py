@@ -0,0 +1,72 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from typing import Optional
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from .database import get_async_engine, get_async_read_engine, ASYNC_DATABASE_READ_URL
+import asyncio
+import logging
+import os
+
+router = APIRouter(prefix="/health", tags=["health"])
+logger = logging.getLogger(__name__)
+
+ALEMBIC_CONFIG = os.getenv(
+    "ALEMBIC_CONFIG", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+)
+READINESS_TIMEOUT_SECONDS = float(os.getenv("READINESS_TIMEOUT_SECONDS", "2.0"))
+
+_migration_head = None
+
+def migration_head() -> Optional[str]:
+    """Head revision of the Alembic scripts shipped with the app (read once, then cached)."""
+    global _migration_head
+    if _migration_head is None:
+        _migration_head = ScriptDirectory.from_config(Config(ALEMBIC_CONFIG)).get_current_head()
+    return _migration_head
+
+async def _check_database() -> dict:
+    """
+    Runs SELECT 1 through the async pool and compares the applied revision with the head.
+    The read replica, if configured, must answer too.
+    """
+    async with get_async_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        try:
+            applied = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+        except SQLAlchemyError:
+            applied = None
+    head = migration_head()
+    checks = {
+        "database": "ok",
+        "migrations": "ok" if applied == head else f"applied {applied or 'none'}, expected {head}",
+    }
+    if ASYNC_DATABASE_READ_URL:
+        async with get_async_read_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        checks["read_replica"] = "ok"
+    return checks
+
+@router.get("/live", summary="Liveness probe")
+async def live():
+    """The process is up and serving requests; never touches the database."""
+    return {"status": "alive"}
+
+@router.get("/ready", summary="Readiness probe")
+async def ready():
+    """
+    Ready once the database answers through the pool and its schema is at the Alembic head.
+    Returns 503 otherwise, so the instance is kept out of rotation until migrations have run.
+    """
+    try:
+        checks = await asyncio.wait_for(_check_database(), timeout=READINESS_TIMEOUT_SECONDS)
+    except (SQLAlchemyError, OSError, asyncio.TimeoutError) as e:
+        logger.warning(f"Readiness check failed: {e!r}")
+        checks = {"database": f"unavailable: {e.__class__.__name__}", "migrations": "unknown"}
+    is_ready = all(value == "ok" for value in checks.values())
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if is_ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "ready" if is_ready else "not ready", "checks": checks},
+    )
@@ -0,0 +1,48 @@
+from datetime import datetime, timezone, time, date
+from typing import Tuple
+import re
+import pytz
+
+KYIV_TZ = pytz.timezone('Europe/Kyiv')
+MONTH_PATTERN = re.compile(r"^(\d{4})-(0[1-9]|1[0-2])$")
+
+
+def to_aware_utc_midnight(dt_date):
+    """Converts a date to 00:00:00 Kyiv time, then to UTC."""
+    tz_utc = timezone.utc
+    dt_naive = datetime.combine(dt_date, time(0, 0, 0))
+    dt_aware_kyiv = KYIV_TZ.localize(dt_naive)
+    return dt_aware_kyiv.astimezone(tz_utc).replace(microsecond=0)
+
+
+def as_utc(value: datetime) -> datetime:
+    """
+    Returns value as an aware UTC datetime; naive values (SQLite) are taken to be UTC,
+    plain dates (EventCreate fields that were not normalized) to be UTC midnight.
+    """
+    if not isinstance(value, datetime):
+        return datetime.combine(value, time.min, tzinfo=timezone.utc)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def kyiv_day(value: datetime) -> date:
+    """Kyiv calendar day of a datetime (see as_utc for naive values); plain dates are kept."""
+    if not isinstance(value, datetime):
+        return value
+    return as_utc(value).astimezone(KYIV_TZ).date()
+
+
+def month_days(month: str) -> Tuple[date, date]:
+    """
+    Returns the first day of a "YYYY-MM" month and the first day of the next one.
+    Raises ValueError for anything else.
+    """
+    match = MONTH_PATTERN.match(month)
+    if match is None:
+        raise ValueError(f"Month must look like YYYY-MM, got {month!r}.")
+    year, month_number = int(match.group(1)), int(match.group(2))
+    first = date(year, month_number, 1)
+    following = date(year + 1, 1, 1) if month_number == 12 else date(year, month_number + 1, 1)
+    return first, following
@@ -0,0 +1,53 @@
+from typing import Optional
+from uuid import uuid4
+import logging
+from redis.exceptions import RedisError
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Token returned when Redis cannot be reached: the caller proceeds unlocked (every writer
+# it protects is idempotent) and release_lock() ignores it.
+UNLOCKED = "unlocked"
+
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def acquire_lock(name: str, ttl_seconds: int, token: Optional[str] = None) -> Optional[str]:
+    '''
+    Takes the named lock for at most ttl_seconds (SET NX EX) and returns its token
+    (a random one unless given), or None if another holder has it.
+    Returns UNLOCKED if Redis is unavailable.
+    '''
+    token = token or uuid4().hex
+    try:
+        acquired = get_redis().set(name, token, nx=True, ex=ttl_seconds)
+    except (RedisError, OSError) as e:
+        logger.warning(f"Cannot take lock {name}, continuing without it: {e}")
+        return UNLOCKED
+    return token if acquired else None
+
+
+def lock_holder(name: str) -> Optional[str]:
+    '''Returns the token the lock is currently held with, or None if it is free or Redis is unavailable.'''
+    try:
+        token = get_redis().get(name)
+    except (RedisError, OSError) as e:
+        logger.warning(f"Cannot read lock {name}: {e}")
+        return None
+    return token.decode() if isinstance(token, bytes) else token
+
+
+def release_lock(name: str, token: Optional[str]) -> None:
+    '''Releases the lock if it is still held with token; an expired or taken-over lock is left alone.'''
+    if not token or token == UNLOCKED:
+        return
+    try:
+        get_redis().eval(_RELEASE_SCRIPT, 1, name, token)
+    except (RedisError, OSError) as e:
+        logger.warning(f"Cannot release lock {name}, it expires on its own: {e}")
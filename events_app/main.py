@@ -1,11 +1,10 @@
-from fastapi import FastAPI
-from .database import engine, Base 
+from fastapi import FastAPI, Response
 from .api_router import router
-from . import models 
+from .health import router as health_router
+from .metrics import registry, metrics_middleware, render_task_metrics, CONTENT_TYPE
+from .profiling import profiling_middleware
 import logging
 
-Base.metadata.create_all(bind=engine)
-
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
@@ -14,11 +13,20 @@ app = FastAPI(
     version="1.0.0"
 )
 
+app.middleware("http")(metrics_middleware)
+app.middleware("http")(profiling_middleware)
 app.include_router(router)
+app.include_router(health_router)
 
 @app.get("/")
 def root():
     return {
         "service": "Events",
         "status": "running"
-    }
\ No newline at end of file
+    }
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics of this API process plus the task metrics shared by the Celery workers."""
+    body = registry.render() + await render_task_metrics()
+    return Response(content=body, media_type=CONTENT_TYPE)
@@ -1,43 +1,643 @@
-from typing import Optional, List, Dict
-from datetime import timedelta
-from sqlalchemy.orm import Session
+from typing import Optional, List, Dict, Sequence, Tuple
+from collections import Counter
+from datetime import datetime, timezone, date
+from itertools import islice
+import heapq
+from sqlalchemy import (
+    func, select, insert, update, delete, union_all, text, table, column, and_, or_, case, bindparam, DateTime,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from dateutil.relativedelta import relativedelta
-from .models import Event 
-from .schemas import EventCreate
+from .models import Event, EventArchive, EventCalendarBucket, EventOutbox, EventSeries, EventWatermark, series_key_from_title
+from .schemas import EventCreate, EventSerializer, EventStatus, RecurrenceRuleIn, SearchSort, event_status
+from .pagination import after_cursor
+from .search import postgres_match, sqlite_matches
+from .recurrence import RecurrenceRule
+from .serialization import event_to_json
+from .local_time import as_utc, kyiv_day
+import os
+
+BULK_COPY_THRESHOLD = int(os.getenv("BULK_COPY_THRESHOLD", "5000"))
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "20000"))
+BULK_COLUMNS = [
+    "title", "series_key", "theme", "description",
+    "start_date", "end_date", "registration_deadline", "is_active",
+]
+SERIES_RULE_COLUMNS = ["frequency", "interval_count", "duration_seconds", "deadline_offset_seconds"]
+RULE_LOOKUP_CHUNK_SIZE = 1000
+WATERMARK_ID = 1
+EVENT_CREATED_TOPIC = "event.created"
+# Stored fields of EventSerializer, in its field order; status is computed from them.
+LIST_COLUMNS = [Event.__table__.c[name] for name in EventSerializer.__fields__ if name != "status"]
+
+
+def occurrence_key(series_key: str, start_date: datetime) -> Tuple[str, datetime]:
+    """
+    Returns the (series_key, start_date) identity of an occurrence with start_date as naive UTC,
+    so aware input dates compare equal to dates read back from any backend.
+    """
+    if start_date.tzinfo is not None:
+        start_date = start_date.astimezone(timezone.utc).replace(tzinfo=None)
+    return series_key, start_date.replace(microsecond=0)
+
+
+def _dialect_insert(dialect_name: str, model):
+    """INSERT construct supporting ON CONFLICT on Postgres and SQLite, plain INSERT elsewhere."""
+    if dialect_name == "postgresql":
+        return postgresql.insert(model)
+    if dialect_name == "sqlite":
+        return sqlite.insert(model)
+    return insert(model)
+
+
+def insert_ignoring_duplicates(dialect_name: str, from_select: Optional[tuple] = None):
+    """
+    Builds INSERT ... ON CONFLICT (series_key, start_date) DO NOTHING RETURNING event.*
+    for Postgres and SQLite. Other dialects get a plain INSERT ... RETURNING.
+    """
+    stmt = _dialect_insert(dialect_name, Event)
+    if from_select is not None:
+        stmt = stmt.from_select(*from_select)
+    if dialect_name in ("postgresql", "sqlite"):
+        stmt = stmt.on_conflict_do_nothing(index_elements=["series_key", "start_date"])
+    return stmt.returning(Event)
+
+
+def bump_watermark_statement(dialect_name: str):
+    """
+    Builds the statement that increments the event watermark and sets its modified_at to now.
+    Upserts on Postgres and SQLite, so databases created without the migration's seed row work too.
+    """
+    if dialect_name not in ("postgresql", "sqlite"):
+        return (
+            update(EventWatermark)
+            .where(EventWatermark.id == WATERMARK_ID)
+            .values(version=EventWatermark.version + 1, modified_at=func.now())
+        )
+    stmt = _dialect_insert(dialect_name, EventWatermark).values(id=WATERMARK_ID, version=1, modified_at=func.now())
+    return stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={"version": EventWatermark.version + 1, "modified_at": func.now()},
+    )
+
+
+def series_row(series_key: str, recurrence: Optional[RecurrenceRuleIn] = None) -> dict:
+    """Column values of the EventSeries row of a series; no recurrence gives the default rule."""
+    recurrence = recurrence or RecurrenceRuleIn()
+    return {
+        "key": series_key,
+        "frequency": recurrence.frequency.value,
+        "interval_count": recurrence.interval,
+        "duration_seconds": recurrence.duration_days * 24 * 60 * 60,
+        "deadline_offset_seconds": recurrence.deadline_offset_seconds,
+    }
+
+
+def upsert_series_statement(dialect_name: str, overwrite: bool):
+    """
+    Builds the INSERT for EventSeries rows. With overwrite the stored rule is replaced
+    (ON CONFLICT DO UPDATE), otherwise an existing series keeps its rule (DO NOTHING).
+    """
+    stmt = _dialect_insert(dialect_name, EventSeries)
+    if dialect_name not in ("postgresql", "sqlite"):
+        return stmt
+    if overwrite:
+        return stmt.on_conflict_do_update(
+            index_elements=["key"],
+            set_={name: stmt.excluded[name] for name in SERIES_RULE_COLUMNS},
+        )
+    return stmt.on_conflict_do_nothing(index_elements=["key"])
+
+
+def advance_next_due_statement():
+    """
+    UPDATE moving EventSeries.next_due_at forward to :due_start_date, never backwards
+    (an older occurrence inserted late must not make the series due again), and setting
+    anchor_start to :due_anchor_start if the series has none yet.
+    Executed with one parameter set per series, see next_due_params.
+    """
+    series = EventSeries.__table__
+    new_start = bindparam("due_start_date", type_=DateTime(timezone=True))
+    return (
+        update(series)
+        .where(series.c.key == bindparam("due_series_key"))
+        .values(
+            next_due_at=case(
+                (or_(series.c.next_due_at.is_(None), series.c.next_due_at < new_start), new_start),
+                else_=series.c.next_due_at,
+            ),
+            anchor_start=func.coalesce(
+                series.c.anchor_start, bindparam("due_anchor_start", type_=DateTime(timezone=True))
+            ),
+        )
+    )
+
+
+def next_due_params(events) -> List[dict]:
+    """Parameter sets for advance_next_due_statement: the earliest and latest start per series among events."""
+    earliest, latest = {}, {}
+    for event in events:
+        start_date = as_utc(event.start_date)
+        if event.series_key not in latest or latest[event.series_key] < start_date:
+            latest[event.series_key] = start_date
+        if event.series_key not in earliest or earliest[event.series_key] > start_date:
+            earliest[event.series_key] = start_date
+    return [
+        {"due_series_key": key, "due_start_date": start, "due_anchor_start": earliest[key]}
+        for key, start in latest.items()
+    ]
+
+
+def outbox_rows(events, topic: str = EVENT_CREATED_TOPIC) -> List[dict]:
+    """EventOutbox rows for events that were just inserted (they must have their ids)."""
+    return [
+        {"topic": topic, "event_id": event.id, "payload": event_to_json(event).decode()}
+        for event in events
+    ]
+
+
+def calendar_bucket_rows(events) -> List[dict]:
+    """EventCalendarBucket increments for newly inserted events, one row per bucket."""
+    counts = Counter(
+        (kyiv_day(event.start_date), as_utc(event.registration_deadline), as_utc(event.end_date), event.is_active)
+        for event in events
+    )
+    return [
+        {"day": day, "registration_deadline": deadline, "end_date": end_date, "is_active": is_active, "event_count": count}
+        for (day, deadline, end_date, is_active), count in counts.items()
+    ]
+
+
+def bump_calendar_statement(dialect_name: str):
+    """
+    INSERT of EventCalendarBucket rows that adds event_count to an existing bucket
+    (ON CONFLICT DO UPDATE on Postgres and SQLite; a plain INSERT elsewhere).
+    """
+    stmt = _dialect_insert(dialect_name, EventCalendarBucket)
+    if dialect_name not in ("postgresql", "sqlite"):
+        return stmt
+    return stmt.on_conflict_do_update(
+        index_elements=["day", "registration_deadline", "end_date", "is_active"],
+        set_={"event_count": EventCalendarBucket.event_count + stmt.excluded.event_count},
+    )
+
+
+def calendar_days(buckets, now: Optional[datetime] = None) -> List[dict]:
+    """Sums calendar buckets into per-day Open / Closed / Completed counts, in day order."""
+    now = now or datetime.now(timezone.utc)
+    days: Dict[date, Dict[str, int]] = {}
+    for bucket in buckets:
+        counts = days.setdefault(bucket.day, {status.value.lower(): 0 for status in EventStatus})
+        counts[event_status(bucket.registration_deadline, bucket.end_date, now).value.lower()] += bucket.event_count
+    return [{"day": day, **counts} for day, counts in sorted(days.items())]
+
+
+def due_events_query(due_before: datetime, series_keys: Optional[List[str]] = None):
+    """
+    SELECT of the latest event of every series whose next_due_at is before due_before.
+    A range scan on ix_event_series_next_due_at plus one unique-index lookup per due series,
+    so the cost follows the number of due series, not the size of the event history.
+    """
+    query = (
+        select(Event)
+        .join(EventSeries, and_(EventSeries.key == Event.series_key, EventSeries.next_due_at == Event.start_date))
+        .where(EventSeries.next_due_at < due_before)
+    )
+    if series_keys is not None:
+        query = query.where(EventSeries.key.in_(series_keys))
+    return query
+
+
+def series_rows_for(events: List[EventCreate]) -> Tuple[List[dict], List[dict]]:
+    """
+    Splits the series of incoming events into (rows with an explicit rule, rows with the default rule).
+    The last explicit rule wins when a series appears more than once.
+    """
+    explicit, default = {}, {}
+    for event_data in events:
+        series_key = series_key_from_title(event_data.title)
+        if event_data.recurrence is not None:
+            explicit[series_key] = series_row(series_key, event_data.recurrence)
+            default.pop(series_key, None)
+        elif series_key not in explicit:
+            default[series_key] = series_row(series_key)
+    return list(explicit.values()), list(default.values())
+
+
+def created_event_data(events: List[EventCreate], created: List[Event]) -> List[EventCreate]:
+    """
+    Incoming events that were actually inserted, matched to the created rows by (series_key, start_date).
+    When the same pair appears twice in a batch, the first item is the one the INSERT kept.
+    """
+    remaining = {occurrence_key(event.series_key, event.start_date) for event in created}
+    kept = []
+    for event_data in events:
+        key = occurrence_key(series_key_from_title(event_data.title), event_data.start_date)
+        if key in remaining:
+            remaining.discard(key)
+            kept.append(event_data)
+    return kept
+
+
+def event_row(event_data: EventCreate) -> dict:
+    """Column values of an incoming event (the recurrence rule is stored on its series)."""
+    return dict(event_data.dict(exclude={"recurrence"}), series_key=series_key_from_title(event_data.title))
+
+
+def next_event_row(previous_event: Event, new_dates: dict, rule: Optional[RecurrenceRule] = None) -> dict:
+    """Returns the column values of previous_event's series occurrence at new_dates."""
+    rule = rule or RecurrenceRule()
+    new_event_title = rule.title_for(previous_event.series_key, new_dates['start_date'])
+    new_event_theme = previous_event.theme 
+    
+    return {
+        "title": new_event_title,
+        "series_key": previous_event.series_key,
+        "theme": new_event_theme,
+        "description": "will be generated based on theme of new_event_theme",
+        "start_date": new_dates['start_date'],
+        "end_date": new_dates['end_date'],
+        "registration_deadline": new_dates['registration_deadline'],
+        "is_active": True,
+    }
+
+
+def _latest_events_subquery(series_keys: Optional[List[str]] = None):
+    """
+    Ranks events inside each series by start_date (newest first) using the
+    (series_key, start_date) index. Optionally limited to the given series.
+    """
+    ranked = select(
+        Event.id.label("id"),
+        func.row_number().over(
+            partition_by=Event.series_key,
+            order_by=(Event.start_date.desc(), Event.id.desc()),
+        ).label("row_number"),
+    )
+    if series_keys is not None:
+        ranked = ranked.where(Event.series_key.in_(series_keys))
+    return ranked.subquery()
+
+
+def latest_events_query(
+    due_before: Optional[datetime] = None,
+    series_keys: Optional[List[str]] = None,
+    with_series: bool = False,
+):
+    """
+    SELECT of the latest event of every series (optionally only those starting before due_before).
+    With with_series the series' EventSeries row (or None) is selected alongside each event.
+    """
+    ranked = _latest_events_subquery(series_keys)
+    query = select(Event, EventSeries) if with_series else select(Event)
+    query = query.join(ranked, Event.id == ranked.c.id).where(ranked.c.row_number == 1)
+    if with_series:
+        query = query.outerjoin(EventSeries, EventSeries.key == Event.series_key)
+    if due_before is not None:
+        query = query.where(Event.start_date < due_before)
+    return query
+
+
+OCCURRENCE_COLUMNS = ["series_key", "title", "theme", "description"]
+
+
+def _occurrence(row: dict, event_id: Optional[int] = None) -> dict:
+    """Occurrence payload (see OccurrenceSerializer) of an event row; rows without id are virtual."""
+    start_date, end_date, deadline = (as_utc(row[name]) for name in ("start_date", "end_date", "registration_deadline"))
+    return {
+        **{name: row[name] for name in OCCURRENCE_COLUMNS},
+        "id": event_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "registration_deadline": deadline,
+        "is_virtual": event_id is None,
+        "status": event_status(deadline, end_date),
+    }
+
+
+def _stored_occurrence(event: Event) -> dict:
+    columns = OCCURRENCE_COLUMNS + ["start_date", "end_date", "registration_deadline"]
+    return _occurrence({name: getattr(event, name) for name in columns}, event_id=event.id)
+
+
+def _virtual_occurrences(latest_event: Event, rule: RecurrenceRule, window_start: datetime, window_end: datetime):
+    """Lazily yields the virtual occurrences of a series inside the window."""
+    for dates in rule.between(latest_event.start_date, window_start, window_end):
+        yield _occurrence(next_event_row(latest_event, dates, rule))
+
+
+def status_filter(event_status: EventStatus, now: Optional[datetime] = None, source=Event):
+    """
+    Returns the SQL predicate for events having event_status at `now` (default: current time).
+    Range conditions on registration_deadline / end_date, mirroring schemas.event_status.
+    `source` is anything with those columns (the Event model by default).
+    """
+    now = now or datetime.now(timezone.utc)
+    if event_status == EventStatus.COMPLETED:
+        return source.end_date < now
+    if event_status == EventStatus.CLOSED:
+        return and_(source.registration_deadline < now, source.end_date >= now)
+    return source.registration_deadline >= now
+
+
+def archived_occurrences_query(rows: List[dict]):
+    """
+    SELECT (series_key, start_date) of archived events that may collide with the event rows.
+    Archived events are out of the unique index on event, so the create paths check them here;
+    the caller matches the pairs exactly with occurrence_key.
+    """
+    starts = [as_utc(row["start_date"]) for row in rows]
+    return select(EventArchive.series_key, EventArchive.start_date).where(
+        EventArchive.series_key.in_({row["series_key"] for row in rows}),
+        EventArchive.start_date.between(min(starts), max(starts)),
+    )
+
+
+def without_archived(rows: List[dict], archived: set) -> List[dict]:
+    """Event rows whose (series_key, start_date) is not in the archived occurrence keys."""
+    return [row for row in rows if occurrence_key(row["series_key"], as_utc(row["start_date"])) not in archived]
+
+
+ARCHIVED_DUPLICATE_DETAIL = "Duplicate event: an archived event has the same series and start date."
+
+
+def with_archive(columns: Sequence):
+    """
+    UNION ALL of `columns` from event and the same-named columns of event_archive, as a subquery.
+    Filters and ordering applied to it are pushed into both branches by Postgres.
+    """
+    names = [column.name for column in columns]
+    return union_all(
+        select(*columns),
+        select(*(EventArchive.__table__.c[name] for name in names)),
+    ).subquery("event_with_archive")
+
+
+def build_events_query(
+    is_active: Optional[bool] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    event_status: Optional[EventStatus] = None,
+    columns: Optional[Sequence] = None,
+    include_archived: bool = False,
+):
+    """
+    Builds the SELECT used by the event list endpoint, ordered by (start_date, id).
+    A cursor replaces skip; an invalid cursor raises ValueError.
+    With `columns` only those columns are selected instead of whole Event entities.
+    With include_archived archived events are listed too; rows of LIST_COLUMNS (or `columns`) are returned.
+    """
+    if include_archived:
+        combined = with_archive(columns or LIST_COLUMNS)
+        source = combined.c
+        query = select(*combined.c)
+    else:
+        source = Event
+        query = select(*columns) if columns else select(Event)
+    if is_active is not None:
+        query = query.where(source.is_active == is_active)
+    if event_status is not None:
+        query = query.where(status_filter(event_status, source=source))
+    if cursor is not None:
+        query = query.where(after_cursor(cursor, source=source))
+    query = query.order_by(source.start_date, source.id)
+    if cursor is None:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def archivable_events_query(completed_before: datetime, batch_size: int):
+    """
+    Ids of events that ended before completed_before, oldest first, excluding the latest
+    event of every series: recurrence continues from it, so it always stays in event.
+    The NOT EXISTS probe uses the (series_key, start_date) unique index.
+    """
+    newer = aliased(Event)
+    has_newer = select(newer.id).where(
+        newer.series_key == Event.series_key, newer.start_date > Event.start_date
+    ).exists()
+    return (
+        select(Event.id)
+        .where(Event.end_date < completed_before, has_newer)
+        .order_by(Event.id)
+        .limit(batch_size)
+    )
+
+
+def build_search_query(
+    dialect_name: str,
+    q: str,
+    is_active: Optional[bool] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: SearchSort = SearchSort.RELEVANCE,
+):
+    """
+    Builds the full-text search SELECT of LIST_COLUMNS: the tsvector column on Postgres,
+    the FTS5 table on SQLite. Relevance order pages with skip only (ranks change as events are
+    added); start_date order pages exactly like build_events_query, cursor included.
+    Raises ValueError for queries without words, unusable cursors and unsupported dialects.
+    """
+    if dialect_name == "postgresql":
+        match, rank = postgres_match(q)
+        query = select(*LIST_COLUMNS).where(match)
+    elif dialect_name == "sqlite":
+        matches = sqlite_matches(q)
+        query = select(*LIST_COLUMNS).join(matches, matches.c.event_id == Event.id)
+        rank = matches.c.rank
+    else:
+        raise ValueError(f"Full-text search is not supported on {dialect_name}.")
+
+    if is_active is not None:
+        query = query.where(Event.is_active == is_active)
+    if sort == SearchSort.RELEVANCE:
+        if cursor is not None:
+            raise ValueError("Cursors can only be used with sort=start_date.")
+        return query.order_by(rank.desc(), Event.id).offset(skip).limit(limit)
+    if cursor is not None:
+        query = query.where(after_cursor(cursor))
+    query = query.order_by(Event.start_date, Event.id)
+    if cursor is None:
+        query = query.offset(skip)
+    return query.limit(limit)
 
 class EventManager:
     def __init__(self, db: Session):
         self.db = db
 
-    def _calculate_next_dates(self, previous_event: Event) -> dict:
+    def _calculate_next_dates(self, previous_event: Event, rule: Optional[RecurrenceRule] = None) -> dict:
         """
-        Calculates new dates based on the following rules:
+        Calculates the dates of the occurrence following previous_event from the series' recurrence
+        rule (see RecurrenceRule for how starts follow the series anchor). The default rule is:
         1. Repetition always occurs 1 month later.
         2. Event duration is fixed at 5 days.
         3. Registration deadline is 1 second before the new event starts.
         """
-        date_shift = relativedelta(months=1) 
-        start_date_with_tz = previous_event.start_date
-        new_start_date = start_date_with_tz + date_shift
-        duration = timedelta(days=5) 
-        new_end_date = new_start_date + duration
-        one_second = timedelta(seconds=1)
-        new_registration_deadline = new_start_date - one_second
-        
-        return {
-            "start_date": new_start_date,
-            "end_date": new_end_date,
-            "registration_deadline": new_registration_deadline,
-        }
+        rule = rule or RecurrenceRule()
+        return next(rule.occurrences_after(previous_event.start_date))
+
+    def _calculate_pending_dates(
+        self,
+        previous_event: Event,
+        until: datetime,
+        rule: Optional[RecurrenceRule] = None,
+    ) -> List[dict]:
+        """
+        Calculates the dates of every missing occurrence after previous_event in one pass:
+        the next occurrence is due as long as its predecessor starts before `until`.
+        With the series anchor on the rule, a series on the 31st does not drift to the 28th after February.
+        """
+        rule = rule or RecurrenceRule()
+        return list(rule.pending(previous_event.start_date, until))
+
+    def _next_event_row(self, previous_event: Event, new_dates: dict, rule: Optional[RecurrenceRule] = None) -> dict:
+        """Returns the column values of previous_event's series occurrence at new_dates."""
+        return next_event_row(previous_event, new_dates, rule)
+
+    def _build_next_event(self, previous_event: Event, new_dates: dict, rule: Optional[RecurrenceRule] = None) -> Event:
+        """Builds (without adding) the occurrence of previous_event's series at new_dates."""
+        return Event(**self._next_event_row(previous_event, new_dates, rule))
+
+    def plan_next_events(
+        self,
+        previous_event: Event,
+        until: Optional[datetime] = None,
+        rule: Optional[RecurrenceRule] = None,
+    ) -> List[dict]:
+        """
+        Returns the rows of the occurrences to create after previous_event: only the next one,
+        or with `until` every pending one (catch-up). Nothing is written; see insert_events.
+        """
+        if until is None:
+            dates = [self._calculate_next_dates(previous_event, rule)]
+        else:
+            dates = self._calculate_pending_dates(previous_event, until, rule)
+        return [self._next_event_row(previous_event, new_dates, rule) for new_dates in dates]
+
+    def get_recurrence_rules(self, series_keys: List[str]) -> Dict[str, RecurrenceRule]:
+        """
+        Returns the stored recurrence rule of each given series that has one.
+        Series without an EventSeries row use the default rule.
+        """
+        series_keys = list(series_keys)
+        rules = {}
+        for start in range(0, len(series_keys), RULE_LOOKUP_CHUNK_SIZE):
+            chunk = series_keys[start:start + RULE_LOOKUP_CHUNK_SIZE]
+            for series in self.db.scalars(select(EventSeries).where(EventSeries.key.in_(chunk))):
+                rules[series.key] = RecurrenceRule.from_series(series)
+        return rules
+
+    def save_series(self, events: List[EventCreate]) -> None:
+        """
+        Stores the series rows of incoming events in the current transaction: explicit
+        recurrence rules replace the stored ones, other series get the default rule if new.
+        """
+        dialect_name = self.db.get_bind().dialect.name
+        explicit, default = series_rows_for(events)
+        if explicit:
+            self.db.execute(upsert_series_statement(dialect_name, overwrite=True), explicit)
+        if default:
+            self.db.execute(upsert_series_statement(dialect_name, overwrite=False), default)
+
+    def insert_events(self, rows: List[dict]) -> List[Event]:
+        """
+        Batch mode: inserts many events inside the current transaction and returns the created ones.
+        Does not commit, so callers can add any number of batches and commit once.
+        On Postgres and SQLite rows go out as multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING
+        statements, silently skipping occurrences that already exist. Other dialects insert row by row,
+        each inside a SAVEPOINT, so a duplicate only rolls back itself.
+        """
+        if not rows:
+            return []
+        dialect_name = self.db.get_bind().dialect.name
+        if dialect_name in ("postgresql", "sqlite"):
+            created = list(self.db.scalars(insert_ignoring_duplicates(dialect_name), rows).all())
+        else:
+            created = []
+            for row in rows:
+                event = Event(**row)
+                try:
+                    with self.db.begin_nested():
+                        self.db.add(event)
+                except IntegrityError:
+                    continue
+                created.append(event)
+        self.track_created(created)
+        return created
+
+    def advance_next_due(self, events: List[Event]) -> None:
+        """Moves next_due_at of the series of newly inserted events forward, in the current transaction."""
+        params = next_due_params(events)
+        if params:
+            self.db.execute(advance_next_due_statement(), params)
+
+    def track_created(self, events: List[Event]) -> None:
+        """
+        Bookkeeping for newly inserted events, in the current transaction: moves their series'
+        next_due_at, writes their outbox rows and adds them to the calendar counts.
+        """
+        self.advance_next_due(events)
+        self.add_outbox(events)
+        self.add_calendar_counts(events)
+
+    def add_calendar_counts(self, events: List[Event]) -> None:
+        """Adds newly inserted events to their EventCalendarBucket rows."""
+        rows = calendar_bucket_rows(events)
+        if rows:
+            self.db.execute(bump_calendar_statement(self.db.get_bind().dialect.name), rows)
+
+    def add_outbox(self, events: List[Event]) -> None:
+        """Writes an outbox row per newly inserted event in the current transaction (see EventOutbox)."""
+        rows = outbox_rows(events)
+        if rows:
+            self.db.execute(insert(EventOutbox.__table__), rows)
+
+    def pending_outbox(self, batch_size: int) -> List[EventOutbox]:
+        """
+        Oldest outbox rows first. On Postgres they are locked FOR UPDATE SKIP LOCKED until commit,
+        so a second relay never publishes the same rows concurrently.
+        """
+        query = select(EventOutbox).order_by(EventOutbox.id).limit(batch_size).with_for_update(skip_locked=True)
+        return list(self.db.scalars(query))
+
+    def delete_outbox(self, ids: List[int]) -> None:
+        """Deletes published outbox rows in the current transaction."""
+        if ids:
+            self.db.execute(delete(EventOutbox).where(EventOutbox.id.in_(ids)))
+
+    def bump_watermark(self) -> None:
+        """
+        Bumps the event watermark in the current transaction. Call it last before commit:
+        the watermark row stays locked until then.
+        """
+        self.db.execute(bump_watermark_statement(self.db.get_bind().dialect.name))
+
+    def archived_keys(self, rows: List[dict]) -> set:
+        """Occurrence keys of the archived events colliding with the event rows, see archived_occurrences_query."""
+        if not rows:
+            return set()
+        return {occurrence_key(*pair) for pair in self.db.execute(archived_occurrences_query(rows))}
 
     def create_base_event(self, event_data: EventCreate) -> Event:
         """
-        Creates a base event from provided data and handles potential duplicates.
+        Creates a base event from provided data and handles potential duplicates,
+        including events already moved to the archive.
         """
-        db_event = Event(**event_data.dict())
+        row = event_row(event_data)
+        if not without_archived([row], self.archived_keys([row])):
+            self.db.rollback()
+            raise ValueError(ARCHIVED_DUPLICATE_DETAIL)
+        db_event = Event(**row)
         try:
+            self.save_series([event_data])
             self.db.add(db_event)
+            self.db.flush()
+            self.track_created([db_event])
+            self.bump_watermark()
             self.db.commit()
             self.db.refresh(db_event)
             return db_event
@@ -49,25 +649,15 @@ class EventManager:
         """
         Creates the next event.
         """
-        new_dates = self._calculate_next_dates(previous_event)
-        month_year = new_dates['start_date'].strftime('%B %Y')
-        
-        base_title = previous_event.title.split(' - ')[0].strip()
-        new_event_title = f"{base_title} - {month_year}"
-        new_event_theme = previous_event.theme 
-        
-        new_event = Event(
-            title=new_event_title,
-            theme=new_event_theme,
-            description="will be generated based on theme of new_event_theme",
-            start_date=new_dates['start_date'],
-            end_date=new_dates['end_date'],
-            registration_deadline=new_dates['registration_deadline'],
-            is_active=True,
-        )
+        rule = self.get_recurrence_rules([previous_event.series_key]).get(previous_event.series_key)
+        new_dates = self._calculate_next_dates(previous_event, rule)
+        new_event = self._build_next_event(previous_event, new_dates, rule)
         
         try:
             self.db.add(new_event)
+            self.db.flush()
+            self.track_created([new_event])
+            self.bump_watermark()
             self.db.commit()
             self.db.refresh(new_event)
             return new_event
@@ -75,6 +665,40 @@ class EventManager:
             self.db.rollback()
             return None
 
+    def create_next_events(self, previous_event: Event, until: datetime) -> List[Event]:
+        """
+        Catch-up mode: creates every missing occurrence after previous_event up to `until`
+        (see _calculate_pending_dates) with a single commit. Occurrences that already exist are skipped.
+        """
+        created = self.insert_events(self.plan_next_events(previous_event, until=until))
+        if created:
+            self.bump_watermark()
+        self.db.commit()
+        return created
+
+    def archive_completed_events(self, completed_before: datetime, batch_size: int = 5000) -> int:
+        """
+        Moves events that ended before completed_before into event_archive, batch_size rows per
+        transaction (INSERT ... SELECT, then DELETE, then a watermark bump), and returns how many moved.
+        The latest event of each series is never archived, see archivable_events_query.
+        """
+        archived = 0
+        archive_columns = [column.name for column in Event.__table__.columns]
+        while True:
+            ids = list(self.db.scalars(archivable_events_query(completed_before, batch_size)))
+            if not ids:
+                return archived
+            self.db.execute(insert(EventArchive).from_select(
+                archive_columns,
+                select(*Event.__table__.columns).where(Event.id.in_(ids)),
+            ))
+            self.db.execute(delete(Event).where(Event.id.in_(ids)).execution_options(synchronize_session=False))
+            self.bump_watermark()
+            self.db.commit()
+            archived += len(ids)
+            if len(ids) < batch_size:
+                return archived
+
     def get_all_events(self) -> List[Event]:
         """
         Retrieves all events from the database.
@@ -82,15 +706,243 @@ class EventManager:
         """
         return self.db.query(Event).all()
 
-    def get_latest_events_by_title(self) -> Dict[str, Event]:
+    def get_latest_events_by_title(
+        self,
+        due_before: Optional[datetime] = None,
+        series_keys: Optional[List[str]] = None,
+    ) -> Dict[str, Event]:
+        """
+        Returns a mapping of series_key -> latest Event (by start_date).
+        Grouping happens in the database with a window function, so only one row per series is loaded.
+        If due_before is given, only series whose latest event starts before it are returned.
+        If series_keys is given, only those series are considered.
+        """
+        events = self.db.scalars(latest_events_query(due_before=due_before, series_keys=series_keys))
+        return {event.series_key: event for event in events}
+
+    def get_due_events(
+        self,
+        due_before: datetime,
+        series_keys: Optional[List[str]] = None,
+    ) -> Dict[str, Event]:
         """
-        Returns a mapping of base_title -> latest Event (by start_date).
-        The base_title is determined by splitting on ' - ' and taking the first part.
+        Returns series_key -> latest Event for series whose next_due_at is before due_before
+        (optionally only series_keys). Indexed counterpart of get_latest_events_by_title(due_before=...).
         """
-        events = self.db.query(Event).order_by(Event.start_date).all()
-        latest: Dict[str, Event] = {}
-        for e in events:
-            base_title = e.title.split(' - ')[0].strip()
-            if base_title not in latest or e.start_date > latest[base_title].start_date:
-                latest[base_title] = e
-        return latest
\ No newline at end of file
+        events = self.db.scalars(due_events_query(due_before, series_keys=series_keys))
+        return {event.series_key: event for event in events}
+
+    def get_due_series_keys(self, due_before: datetime) -> List[str]:
+        """
+        Returns the keys of all series whose next_due_at is before due_before,
+        from the next_due_at index alone.
+        """
+        query = select(EventSeries.key).where(EventSeries.next_due_at < due_before)
+        return list(self.db.scalars(query))
+
+
+class AsyncEventManager:
+    """Async counterpart of EventManager for request handlers using AsyncSession."""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def bump_watermark(self) -> None:
+        """Bumps the event watermark in the current transaction, see EventManager.bump_watermark."""
+        await self.db.execute(bump_watermark_statement(self.db.get_bind().dialect.name))
+
+    async def advance_next_due(self, events: List[Event]) -> None:
+        """Async counterpart of EventManager.advance_next_due."""
+        params = next_due_params(events)
+        if params:
+            await self.db.execute(advance_next_due_statement(), params)
+
+    async def track_created(self, events: List[Event]) -> None:
+        """Async counterpart of EventManager.track_created."""
+        await self.advance_next_due(events)
+        await self.add_outbox(events)
+        await self.add_calendar_counts(events)
+
+    async def add_calendar_counts(self, events: List[Event]) -> None:
+        """Async counterpart of EventManager.add_calendar_counts."""
+        rows = calendar_bucket_rows(events)
+        if rows:
+            await self.db.execute(bump_calendar_statement(self.db.get_bind().dialect.name), rows)
+
+    async def add_outbox(self, events: List[Event]) -> None:
+        """Async counterpart of EventManager.add_outbox."""
+        rows = outbox_rows(events)
+        if rows:
+            await self.db.execute(insert(EventOutbox.__table__), rows)
+
+    async def get_watermark(self) -> Optional[EventWatermark]:
+        """Returns the event watermark row, or None if nothing has bumped it yet."""
+        return await self.db.get(EventWatermark, WATERMARK_ID)
+
+    async def archived_keys(self, rows: List[dict]) -> set:
+        """Async counterpart of EventManager.archived_keys."""
+        if not rows:
+            return set()
+        return {occurrence_key(*pair) for pair in await self.db.execute(archived_occurrences_query(rows))}
+
+    async def create_base_event(self, event_data: EventCreate) -> Event:
+        """
+        Creates a base event from provided data and handles potential duplicates,
+        including events already moved to the archive.
+        """
+        row = event_row(event_data)
+        if not without_archived([row], await self.archived_keys([row])):
+            await self.db.rollback()
+            raise ValueError(ARCHIVED_DUPLICATE_DETAIL)
+        db_event = Event(**row)
+        try:
+            await self.save_series([event_data])
+            self.db.add(db_event)
+            await self.db.flush()
+            await self.track_created([db_event])
+            await self.bump_watermark()
+            await self.db.commit()
+            await self.db.refresh(db_event)
+            return db_event
+        except IntegrityError as e:
+            await self.db.rollback()
+            raise ValueError(f"Duplicate or invalid event: {e}")
+
+    async def create_base_events(self, events: List[EventCreate]) -> List[Event]:
+        """
+        Inserts many base events in a single transaction and returns the created rows.
+        Rows are sent as one multi-row INSERT ... RETURNING; events colliding with an existing
+        or archived (series_key, start_date) are skipped instead of failing the batch. On Postgres, payloads
+        of BULK_COPY_THRESHOLD rows or more are loaded with COPY into a staging table first.
+        Series rules are saved after the insert and only from the created events, so a skipped
+        item never replaces the rule of its series.
+        """
+        rows = [event_row(event_data) for event_data in events]
+        rows = without_archived(rows, await self.archived_keys(rows))
+        if not rows:
+            return []
+        dialect_name = self.db.get_bind().dialect.name
+        if dialect_name == "postgresql" and len(rows) >= BULK_COPY_THRESHOLD:
+            created = await self._copy_base_events(rows)
+        else:
+            created = (await self.db.scalars(insert_ignoring_duplicates(dialect_name), rows)).all()
+        if created:
+            await self.save_series(created_event_data(events, created))
+            await self.track_created(created)
+            await self.bump_watermark()
+        await self.db.commit()
+        return list(created)
+
+    async def save_series(self, events: List[EventCreate]) -> None:
+        """
+        Stores the series rows of incoming events in the current transaction, see EventManager.save_series.
+        """
+        dialect_name = self.db.get_bind().dialect.name
+        explicit, default = series_rows_for(events)
+        if explicit:
+            await self.db.execute(upsert_series_statement(dialect_name, overwrite=True), explicit)
+        if default:
+            await self.db.execute(upsert_series_statement(dialect_name, overwrite=False), default)
+
+    async def _copy_base_events(self, rows: List[dict]) -> List[Event]:
+        """
+        COPYs rows into a temporary staging table and moves them into event with a single
+        INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING.
+        """
+        await self.db.execute(text(
+            "CREATE TEMP TABLE event_bulk_stage (LIKE event INCLUDING DEFAULTS) ON COMMIT DROP"
+        ))
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "event_bulk_stage",
+            records=[tuple(row[name] for name in BULK_COLUMNS) for row in rows],
+            columns=BULK_COLUMNS,
+        )
+        stage = table("event_bulk_stage", *(column(name) for name in BULK_COLUMNS))
+        stmt = insert_ignoring_duplicates("postgresql", from_select=(BULK_COLUMNS, select(stage)))
+        return (await self.db.scalars(stmt)).all()
+
+    async def list_events(
+        self,
+        is_active: Optional[bool] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        event_status: Optional[EventStatus] = None,
+    ) -> List[Event]:
+        """
+        Returns one page of events, see build_events_query.
+        """
+        result = await self.db.scalars(build_events_query(is_active, skip, limit, cursor, event_status))
+        return list(result.all())
+
+    async def list_event_rows(
+        self,
+        is_active: Optional[bool] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        event_status: Optional[EventStatus] = None,
+        include_archived: bool = False,
+    ) -> list:
+        """
+        Same page as list_events, but as plain rows of LIST_COLUMNS: no ORM instances,
+        no identity map. Rows expose the columns as attributes, so next_cursor works on them.
+        With include_archived the page also covers event_archive.
+        """
+        query = build_events_query(
+            is_active, skip, limit, cursor, event_status, columns=LIST_COLUMNS, include_archived=include_archived
+        )
+        result = await self.db.execute(query)
+        return list(result.all())
+
+    async def search_event_rows(
+        self,
+        q: str,
+        is_active: Optional[bool] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort: SearchSort = SearchSort.RELEVANCE,
+    ) -> list:
+        """
+        Returns one page of events matching q as LIST_COLUMNS rows, see build_search_query.
+        """
+        dialect_name = self.db.get_bind().dialect.name
+        result = await self.db.execute(build_search_query(dialect_name, q, is_active, skip, limit, cursor, sort))
+        return list(result.all())
+
+
+    async def get_calendar(self, first_day: date, end_day: date, is_active: Optional[bool] = None) -> List[dict]:
+        """
+        Per-day Open / Closed / Completed counts of events starting (Kyiv time) in [first_day, end_day),
+        read from EventCalendarBucket with a primary-key range scan; see calendar_days.
+        """
+        query = select(EventCalendarBucket).where(
+            EventCalendarBucket.day >= first_day, EventCalendarBucket.day < end_day
+        )
+        if is_active is not None:
+            query = query.where(EventCalendarBucket.is_active == is_active)
+        return calendar_days(await self.db.scalars(query))
+
+    async def list_occurrences(self, window_start: datetime, window_end: datetime, limit: int = 1000) -> List[dict]:
+        """
+        Returns real and virtual occurrences starting in [window_start, window_end), ordered by start date.
+        Real occurrences are stored events. Virtual ones are expanded lazily from each series' rule after
+        its latest stored event and are never written. Expansion stops once `limit` occurrences are produced.
+        """
+        real_events = await self.db.scalars(
+            select(Event)
+            .where(Event.start_date >= window_start, Event.start_date < window_end)
+            .order_by(Event.start_date, Event.id)
+            .limit(limit)
+        )
+        latest = await self.db.execute(latest_events_query(due_before=window_end, with_series=True))
+
+        real = (_stored_occurrence(event) for event in real_events)
+        virtual = [
+            _virtual_occurrences(event, RecurrenceRule.from_series(series), window_start, window_end)
+            for event, series in latest
+        ]
+        merged = heapq.merge(real, *virtual, key=lambda occurrence: occurrence["start_date"])
+        return list(islice(merged, limit))
@@ -0,0 +1,324 @@
+from typing import Dict, Optional, Sequence, Tuple
+from contextvars import ContextVar
+import threading
+import time
+import logging
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from redis.exceptions import RedisError
+from .redis_client import get_redis, get_async_redis
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250)
+TASK_DURATION_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+TASK_METRICS_KEY = "events:metrics:task:{task}"
+TRACKED_TASKS = (
+    "generate_recurring_events",
+    "generate_recurring_events_shard",
+    "archive_completed_events",
+    "relay_event_outbox",
+)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    '''Base class of the in-process metrics; samples are keyed by label values.'''
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    _samples = Counter._samples
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._values.setdefault(key, [0] * len(self.buckets) + [0, 0.0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            counts[-2] += 1
+            counts[-1] += value
+
+    def load(self, bucket_counts: Sequence[int], count: int, total: float, **labels) -> None:
+        '''Sets the cumulative bucket counts, count and sum of one label set, e.g. aggregated in Redis.'''
+        with self._lock:
+            self._values[self._key(labels)] = list(bucket_counts) + [count, total]
+
+    def _samples(self):
+        with self._lock:
+            items = [(key, list(counts)) for key, counts in self._values.items()]
+        lines = []
+        for key, counts in items:
+            for bound, count in zip(self.buckets, counts):
+                bucket_labels = _format_labels(self.labelnames, key, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+            inf_labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf_labels} {counts[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {counts[-2]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(counts[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    '''Holds the metrics of this process and renders them in the Prometheus text format.'''
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector) -> None:
+        '''Registers a callable run before every render, e.g. to refresh pool gauges.'''
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    "events_http_request_duration_seconds", "Latency of HTTP requests by route.",
+    ("method", "route", "status"),
+))
+HTTP_REQUEST_SQL_STATEMENTS = registry.register(Histogram(
+    "events_http_request_sql_statements", "SQL statements executed per HTTP request.",
+    ("method", "route"), buckets=COUNT_BUCKETS,
+))
+HTTP_REQUEST_SQL_DURATION = registry.register(Histogram(
+    "events_http_request_sql_duration_seconds", "Total SQL time per HTTP request.",
+    ("method", "route"),
+))
+DB_STATEMENTS = registry.register(Counter(
+    "events_db_statements_total", "SQL statements executed.", ("engine",),
+))
+DB_STATEMENT_DURATION = registry.register(Histogram(
+    "events_db_statement_duration_seconds", "Duration of single SQL statements.", ("engine",),
+))
+POOL_CHECKOUT_WAIT = registry.register(Histogram(
+    "events_db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.", ("engine",),
+))
+POOL_CHECKED_OUT = registry.register(Gauge(
+    "events_db_pool_checked_out", "Connections currently checked out of the pool.", ("engine",),
+))
+POOL_SIZE = registry.register(Gauge(
+    "events_db_pool_size", "Configured pool size.", ("engine",),
+))
+POOL_OVERFLOW = registry.register(Gauge(
+    "events_db_pool_overflow", "Connections opened beyond the pool size.", ("engine",),
+))
+
+_request_sql: ContextVar[Optional[list]] = ContextVar("events_request_sql", default=None)
+_instrumented_pools = {}
+
+
+class TimedQueuePool(QueuePool):
+    '''QueuePool that records how long every checkout waited for a connection.'''
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, engine=self.logging_name or "default")
+
+
+class TimedAsyncAdaptedQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    '''Async-engine variant of TimedQueuePool.'''
+
+
+def _collect_pool_gauges() -> None:
+    for name, pool in list(_instrumented_pools.items()):
+        if isinstance(pool, QueuePool):
+            POOL_CHECKED_OUT.set(pool.checkedout(), engine=name)
+            POOL_SIZE.set(pool.size(), engine=name)
+            POOL_OVERFLOW.set(max(pool.overflow(), 0), engine=name)
+
+
+registry.add_collector(_collect_pool_gauges)
+
+
+def instrument_engine(engine, name: str) -> None:
+    '''
+    Attaches statement counters and timers to a (sync) Engine; for AsyncEngine pass engine.sync_engine.
+    Statements executed while serving a request are also added to that request's totals.
+    '''
+    _instrumented_pools[name] = engine.pool
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("events_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["events_query_start"].pop()
+        DB_STATEMENTS.inc(engine=name)
+        DB_STATEMENT_DURATION.observe(elapsed, engine=name)
+        request_sql = _request_sql.get()
+        if request_sql is not None:
+            request_sql[0] += 1
+            request_sql[1] += elapsed
+
+
+async def metrics_middleware(request: Request, call_next):
+    '''Records latency and SQL totals of every request, labelled by route template.'''
+    started = time.perf_counter()
+    request_sql = [0, 0.0]
+    token = _request_sql.set(request_sql)
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        _request_sql.reset(token)
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", "unmatched")
+        HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - started, method=request.method, route=route_path, status=status_code
+        )
+        HTTP_REQUEST_SQL_STATEMENTS.observe(request_sql[0], method=request.method, route=route_path)
+        HTTP_REQUEST_SQL_DURATION.observe(request_sql[1], method=request.method, route=route_path)
+
+
+def record_task_run(task: str, duration: float, series_scanned: int, events_created: int) -> None:
+    '''
+    Adds one run of a Celery task to the shared task metrics in Redis, so the API's
+    /metrics can expose numbers produced by worker processes.
+    '''
+    key = TASK_METRICS_KEY.format(task=task)
+    try:
+        pipeline = get_redis().pipeline(transaction=False)
+        pipeline.hincrby(key, "runs", 1)
+        pipeline.hincrbyfloat(key, "duration_seconds_sum", duration)
+        pipeline.hincrby(key, "series_scanned_total", series_scanned)
+        pipeline.hincrby(key, "events_created_total", events_created)
+        pipeline.hset(key, mapping={"last_duration_seconds": duration, "last_run_timestamp": time.time()})
+        for bound in TASK_DURATION_BUCKETS:
+            if duration <= bound:
+                pipeline.hincrby(key, f"bucket:{bound}", 1)
+        pipeline.execute()
+    except (RedisError, OSError) as e:
+        logger.warning(f"Cannot record metrics of task {task}: {e}")
+
+
+def _task_metrics(values_by_task: Dict[str, Dict[str, str]]) -> list:
+    '''Builds the task metric families from the Redis hashes of every task, one sample set per task.'''
+    runs = Counter("events_task_runs_total", "Runs of the Celery task.", ("task",))
+    series_scanned = Counter("events_task_series_scanned_total", "Series scanned by the Celery task.", ("task",))
+    events_created = Counter("events_task_events_created_total", "Events created by the Celery task.", ("task",))
+    last_duration = Gauge("events_task_last_duration_seconds", "Duration of the last run of the Celery task.", ("task",))
+    last_run = Gauge("events_task_last_run_timestamp_seconds", "Unix time the last run of the Celery task finished.", ("task",))
+    duration = Histogram(
+        "events_task_duration_seconds", "Duration of the Celery task runs.", ("task",), buckets=TASK_DURATION_BUCKETS
+    )
+    for task, values in values_by_task.items():
+        run_count = int(values.get("runs", 0))
+        runs.inc(run_count, task=task)
+        series_scanned.inc(int(values.get("series_scanned_total", 0)), task=task)
+        events_created.inc(int(values.get("events_created_total", 0)), task=task)
+        last_duration.set(float(values.get("last_duration_seconds", 0)), task=task)
+        last_run.set(float(values.get("last_run_timestamp", 0)), task=task)
+        duration.load(
+            [int(values.get(f"bucket:{bound}", 0)) for bound in TASK_DURATION_BUCKETS],
+            run_count,
+            float(values.get("duration_seconds_sum", 0)),
+            task=task,
+        )
+    return [runs, series_scanned, events_created, last_duration, last_run, duration]
+
+
+async def render_task_metrics() -> str:
+    '''
+    Renders the Celery task metrics stored in Redis family by family (HELP, TYPE, then the
+    samples of every task); empty if Redis is unavailable.
+    '''
+    values_by_task = {}
+    try:
+        for task in TRACKED_TASKS:
+            raw = await get_async_redis().hgetall(TASK_METRICS_KEY.format(task=task))
+            values_by_task[task] = {key.decode(): value.decode() for key, value in raw.items()}
+    except (RedisError, OSError) as e:
+        logger.warning(f"Cannot read task metrics: {e}")
+        return ""
+    return "\n".join(metric.render() for metric in _task_metrics(values_by_task)) + "\n"
@@ -1,11 +1,22 @@
-from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, func, CheckConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, Text, Date, DateTime, func, CheckConstraint, Index, DDL, event
 from .database import Base
 
+
+def series_key_from_title(title: str) -> str:
+    '''Returns the series key (base title) of an event title like "Base - Month Year".'''
+    return title.split(' - ')[0].strip()
+
+
+def _default_series_key(context):
+    return series_key_from_title(context.get_current_parameters()["title"])
+
+
 class Event(Base):
     '''SQLAlchemy model for the event table.'''
     __tablename__ = "event"
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(150), nullable=False)
+    series_key = Column(String(150), nullable=False, default=_default_series_key)
     theme = Column(String(100), nullable=False)
     description = Column(Text, default="")
     start_date = Column(DateTime(timezone=True), nullable=False)
@@ -17,4 +28,130 @@ class Event(Base):
     __table_args__ = (
         CheckConstraint(registration_deadline < start_date, name="check_registration_deadline_before_start"),
         CheckConstraint(start_date < end_date, name="check_start_before_end"),
+        Index("uq_event_series_key_start_date", series_key, start_date, unique=True),
+        Index("ix_event_start_date_id", start_date, id),
+        Index("ix_event_is_active_start_date_id", is_active, start_date, id),
+        Index("ix_event_registration_deadline", registration_deadline),
+        Index("ix_event_end_date", end_date),
+    )
+
+
+class EventArchive(Base):
+    '''
+    Completed events moved out of the event table by the archive_completed_events task.
+    Same columns as Event (ids are kept) plus the time of archiving; read only through include_archived.
+    '''
+    __tablename__ = "event_archive"
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String(150), nullable=False)
+    series_key = Column(String(150), nullable=False)
+    theme = Column(String(100), nullable=False)
+    description = Column(Text)
+    start_date = Column(DateTime(timezone=True), nullable=False)
+    end_date = Column(DateTime(timezone=True), nullable=False)
+    registration_deadline = Column(DateTime(timezone=True), nullable=False)
+    is_active = Column(Boolean, nullable=False)
+    created_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_event_archive_start_date_id", start_date, id),
     )
+
+
+# Full-text search objects live outside the mapped columns: a generated tsvector column with a GIN index
+# on Postgres (created by migration 9a1f5c3e7d20), an external-content FTS5 table kept in sync by
+# triggers on SQLite. They are also created by create_all, for tests and local databases.
+SEARCH_CONFIG = "simple"
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(theme, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+)
+POSTGRES_SEARCH_DDL = [
+    f"ALTER TABLE event ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED",
+    "CREATE INDEX ix_event_search_vector ON event USING gin (search_vector)",
+]
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS event_search USING fts5("
+    "title, theme, description, content='event', content_rowid='id')",
+    "CREATE TRIGGER event_search_ai AFTER INSERT ON event BEGIN "
+    "INSERT INTO event_search(rowid, title, theme, description) "
+    "VALUES (new.id, new.title, new.theme, new.description); END",
+    "CREATE TRIGGER event_search_ad AFTER DELETE ON event BEGIN "
+    "INSERT INTO event_search(event_search, rowid, title, theme, description) "
+    "VALUES ('delete', old.id, old.title, old.theme, old.description); END",
+    "CREATE TRIGGER event_search_au AFTER UPDATE ON event BEGIN "
+    "INSERT INTO event_search(event_search, rowid, title, theme, description) "
+    "VALUES ('delete', old.id, old.title, old.theme, old.description); "
+    "INSERT INTO event_search(rowid, title, theme, description) "
+    "VALUES (new.id, new.title, new.theme, new.description); END",
+]
+
+for statement in POSTGRES_SEARCH_DDL:
+    event.listen(Event.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Event.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Event.__table__, "after_drop", DDL("DROP TABLE IF EXISTS event_search").execute_if(dialect="sqlite"))
+
+
+class EventSeries(Base):
+    '''SQLAlchemy model for the recurrence rule of a series of events (keyed by Event.series_key).'''
+    __tablename__ = "event_series"
+    key = Column(String(150), primary_key=True)
+    frequency = Column(String(10), nullable=False, default="MONTHLY")
+    interval_count = Column(Integer, nullable=False, default=1)
+    duration_seconds = Column(Integer, nullable=False, default=5 * 24 * 60 * 60)
+    deadline_offset_seconds = Column(Integer, nullable=False, default=1)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Start of the series' latest event: the series is due for its next occurrence once this has passed.
+    # Kept current by every insert path of the managers (see advance_next_due_statement).
+    next_due_at = Column(DateTime(timezone=True))
+    # Start of the series' first event: every occurrence is stepped from it (see RecurrenceRule).
+    anchor_start = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("ix_event_series_next_due_at", next_due_at),
+        CheckConstraint(frequency.in_(["DAILY", "WEEKLY", "MONTHLY", "YEARLY"]), name="check_series_frequency"),
+        CheckConstraint(interval_count >= 1, name="check_series_interval_positive"),
+        CheckConstraint(duration_seconds > 0, name="check_series_duration_positive"),
+        CheckConstraint(deadline_offset_seconds > 0, name="check_series_deadline_offset_positive"),
+    )
+
+
+class EventWatermark(Base):
+    '''
+    Single-row change watermark of the event table. Every write bumps it in its own transaction,
+    so readers can tell whether anything changed from one primary-key lookup.
+    '''
+    __tablename__ = "event_watermark"
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    modified_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class EventOutbox(Base):
+    '''
+    Change records written in the same transaction as the events they describe.
+    tasks.relay_event_outbox publishes them to the change stream and deletes them.
+    '''
+    __tablename__ = "event_outbox"
+    id = Column(Integer, primary_key=True)
+    topic = Column(String(50), nullable=False)
+    event_id = Column(Integer, nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class EventCalendarBucket(Base):
+    '''
+    Event counts per Kyiv start day, grouped by the columns an event's status depends on, so
+    GET /events/calendar derives Open / Closed / Completed counts at read time without scanning
+    event. Incremented by every insert path; archiving leaves the counts in place.
+    '''
+    __tablename__ = "event_calendar_bucket"
+    day = Column(Date, primary_key=True)
+    registration_deadline = Column(DateTime(timezone=True), primary_key=True)
+    end_date = Column(DateTime(timezone=True), primary_key=True)
+    is_active = Column(Boolean, primary_key=True)
+    event_count = Column(Integer, nullable=False, default=0)
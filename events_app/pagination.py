@@ -0,0 +1,42 @@
+from typing import Tuple
+from datetime import datetime
+import base64
+import binascii
+import json
+from sqlalchemy import tuple_
+from .models import Event
+
+
+def encode_cursor(start_date: datetime, event_id: int) -> str:
+    '''Builds an opaque cursor pointing at the (start_date, id) position of an event.'''
+    payload = json.dumps({"s": start_date.isoformat(), "i": event_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    '''Parses a cursor produced by encode_cursor. Raises ValueError if it is malformed.'''
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["s"]), int(payload["i"])
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def after_cursor(cursor: str, source=Event):
+    '''
+    Returns a filter clause selecting events strictly after the cursor position
+    in (start_date, id) order. Matches the ix_event_start_date_id index (ix_event_is_active_start_date_id
+    with an is_active filter).
+    `source` is anything with start_date and id columns (the Event model by default).
+    '''
+    start_date, event_id = decode_cursor(cursor)
+    return tuple_(source.start_date, source.id) > tuple_(start_date, event_id)
+
+
+def next_cursor(events: list, limit: int):
+    '''Returns the cursor for the page after `events`, or None if this was the last page.'''
+    if not events or len(events) < limit:
+        return None
+    last = events[-1]
+    return encode_cursor(last.start_date, last.id)
@@ -0,0 +1,260 @@
+from typing import Dict, List, Optional
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import lru_cache
+import glob
+import ipaddress
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import orjson
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_REPORT_HEADER = "X-Profile-Report"
+PROFILE_DIR = os.getenv("EVENTS_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "events-profiles"))
+PROFILE_SLOW_QUERY_MS = float(os.getenv("EVENTS_PROFILE_SLOW_QUERY_MS", "100"))
+PROFILE_REPEAT_THRESHOLD = int(os.getenv("EVENTS_PROFILE_REPEAT_THRESHOLD", "5"))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("EVENTS_PROFILE_SAMPLE_INTERVAL_MS", "5"))
+PROFILE_MAX_REPORTS = int(os.getenv("EVENTS_PROFILE_MAX_REPORTS", "100"))
+PROFILE_MAX_STACKS = 50
+PROFILE_TRUSTED_IPS = [
+    address.strip() for address in os.getenv("EVENTS_PROFILE_TRUSTED_IPS", "127.0.0.1,::1").split(",") if address.strip()
+]
+
+_active_profile: ContextVar[Optional["Profile"]] = ContextVar("events_active_profile", default=None)
+
+
+@lru_cache(maxsize=1)
+def trusted_networks() -> tuple:
+    '''
+    Networks of PROFILE_TRUSTED_IPS (the EVENTS_PROFILE_TRUSTED_IPS setting): addresses or CIDR ranges,
+    loopback only by default. Host names are not accepted, so proxy names never widen the trust.
+    '''
+    return tuple(ipaddress.ip_network(address, strict=False) for address in PROFILE_TRUSTED_IPS)
+
+
+def is_trusted_client(request: Request) -> bool:
+    '''True if the request's peer address is in one of the trusted networks.'''
+    if request.client is None:
+        return False
+    try:
+        address = ipaddress.ip_address(request.client.host)
+    except ValueError:
+        return False
+    return any(address in network for network in trusted_networks())
+
+
+def profiling_requested(request: Request) -> bool:
+    '''True if the request asks for a profile (X-Profile: 1) and is allowed to get one.'''
+    if request.headers.get(PROFILE_HEADER, "").lower() not in ("1", "true", "yes"):
+        return False
+    if not is_trusted_client(request):
+        logger.warning(f"Ignoring {PROFILE_HEADER} from untrusted client {request.client}")
+        return False
+    return True
+
+
+class StackSampler:
+    '''
+    Samples the call stack of one thread every interval_ms from a background thread and counts
+    identical stacks. For async requests that thread is the event loop, so stacks of requests
+    served concurrently show up as well.
+    '''
+    def __init__(self, thread_id: int, interval_ms: float = PROFILE_SAMPLE_INTERVAL_MS):
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="events-profiler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_filename}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class Profile:
+    '''SQL statements and stack samples collected for one request or task run.'''
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.statements: List[dict] = []
+        self.sampler = StackSampler(threading.get_ident())
+        self.report_path: Optional[str] = None
+
+    def add_statement(self, statement: str, elapsed: float, executemany: bool) -> None:
+        self.statements.append({
+            "sql": statement,
+            "duration_ms": round(elapsed * 1000, 3),
+            "offset_ms": round((time.perf_counter() - self.started - elapsed) * 1000, 3),
+            "executemany": executemany,
+        })
+
+    def report(self) -> dict:
+        '''
+        The profile as a JSON-able dict. Statements with the same SQL text (bind parameters are
+        placeholders, so one query per series collapses into one entry) that ran at least
+        PROFILE_REPEAT_THRESHOLD times are listed under repeated_statements; statements slower
+        than PROFILE_SLOW_QUERY_MS under slow_statements.
+        '''
+        by_sql: Dict[str, List[float]] = {}
+        for statement in self.statements:
+            by_sql.setdefault(statement["sql"], []).append(statement["duration_ms"])
+        repeated = sorted(
+            (
+                {"sql": sql, "count": len(durations), "total_ms": round(sum(durations), 3)}
+                for sql, durations in by_sql.items() if len(durations) >= PROFILE_REPEAT_THRESHOLD
+            ),
+            key=lambda entry: entry["count"],
+            reverse=True,
+        )
+        total_samples = sum(self.sampler.stacks.values())
+        return {
+            "name": self.name,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 3),
+            "sql": {
+                "count": len(self.statements),
+                "total_ms": round(sum(statement["duration_ms"] for statement in self.statements), 3),
+                "slow_query_ms": PROFILE_SLOW_QUERY_MS,
+                "repeat_threshold": PROFILE_REPEAT_THRESHOLD,
+            },
+            "slow_statements": [
+                statement for statement in self.statements if statement["duration_ms"] >= PROFILE_SLOW_QUERY_MS
+            ],
+            "repeated_statements": repeated,
+            "statements": self.statements,
+            "samples": {
+                "interval_ms": PROFILE_SAMPLE_INTERVAL_MS,
+                "count": total_samples,
+                "stacks": [
+                    {"stack": stack, "count": count}
+                    for stack, count in self.sampler.stacks.most_common(PROFILE_MAX_STACKS)
+                ],
+            },
+        }
+
+
+def prune_reports(directory: str = PROFILE_DIR, keep: int = PROFILE_MAX_REPORTS) -> None:
+    '''Deletes the oldest reports in directory so that at most `keep` are left.'''
+    reports = sorted(glob.glob(os.path.join(directory, "*.json")), key=os.path.getmtime)
+    for path in reports[:max(len(reports) - keep, 0)]:
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f"Cannot delete old profile {path}: {e}")
+
+
+def write_report(report: dict, directory: str = PROFILE_DIR) -> str:
+    '''
+    Writes a profile report as JSON into directory and returns the file path. Only the newest
+    PROFILE_MAX_REPORTS reports are kept, see prune_reports.
+    '''
+    os.makedirs(directory, exist_ok=True)
+    safe_name = "".join(char if char.isalnum() else "-" for char in report["name"]).strip("-")
+    file_name = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{safe_name}-{uuid.uuid4().hex[:8]}.json"
+    path = os.path.join(directory, file_name)
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    prune_reports(directory, PROFILE_MAX_REPORTS)
+    return path
+
+
+def save_profile(profile: Profile, directory: str = PROFILE_DIR) -> Optional[str]:
+    '''Writes the report of a finished profile, stores its path as report_path and returns it (None on failure).'''
+    try:
+        profile.report_path = write_report(profile.report(), directory)
+        logger.info(f"Profile of {profile.name} written to {profile.report_path}")
+    except OSError as e:
+        profile.report_path = None
+        logger.error(f"Cannot write profile of {profile.name}: {e}")
+    return profile.report_path
+
+
+@contextmanager
+def collecting(name: str):
+    '''
+    Collects a profile of the enclosed block: stack samples of the current thread plus every SQL
+    statement run in this context on an engine passed to profile_engine. Nothing is written.
+    '''
+    profile = Profile(name)
+    token = _active_profile.set(profile)
+    profile.sampler.start()
+    try:
+        yield profile
+    finally:
+        profile.sampler.stop()
+        profile.duration = time.perf_counter() - profile.started
+        _active_profile.reset(token)
+
+
+@contextmanager
+def profiling(name: str, directory: str = PROFILE_DIR):
+    '''
+    Profiles the enclosed block (see collecting) and writes the report to directory when it exits;
+    its path is stored on the yielded profile as report_path.
+    '''
+    try:
+        with collecting(name) as profile:
+            yield profile
+    finally:
+        save_profile(profile, directory)
+
+
+def profile_engine(engine) -> None:
+    '''
+    Records statements of a (sync) Engine into the active profile, if any; for AsyncEngine pass
+    engine.sync_engine. Costs one ContextVar lookup per statement while nothing is profiled.
+    '''
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _active_profile.get() is not None:
+            conn.info.setdefault("events_profile_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = _active_profile.get()
+        starts = conn.info.get("events_profile_start")
+        if profile is not None and starts:
+            profile.add_statement(statement, time.perf_counter() - starts.pop(), executemany)
+
+
+async def profiling_middleware(request: Request, call_next):
+    '''
+    Profiles requests sent with X-Profile: 1 by trusted clients; the report path is returned in
+    X-Profile-Report. The report is built and written in the thread pool, off the event loop.
+    '''
+    if not profiling_requested(request):
+        return await call_next(request)
+    with collecting(f"{request.method} {request.url.path}") as profile:
+        response = await call_next(request)
+    await run_in_threadpool(save_profile, profile, PROFILE_DIR)
+    if profile.report_path:
+        response.headers[PROFILE_REPORT_HEADER] = os.path.basename(profile.report_path)
+    return response
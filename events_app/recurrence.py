@@ -0,0 +1,159 @@
+from typing import Iterator, Optional
+from datetime import datetime, timedelta, timezone
+from dateutil.relativedelta import relativedelta
+from .local_time import KYIV_TZ, as_utc
+
+FREQUENCY_UNITS = {
+    "DAILY": ("days", 1.0),
+    "WEEKLY": ("weeks", 7.0),
+    "MONTHLY": ("months", 30.436875),
+    "YEARLY": ("years", 365.2425),
+}
+
+DEFAULT_FREQUENCY = "MONTHLY"
+DEFAULT_INTERVAL = 1
+DEFAULT_DURATION_SECONDS = 5 * 24 * 60 * 60
+DEFAULT_DEADLINE_OFFSET_SECONDS = 1
+
+
+class RecurrenceRule:
+    '''
+    RRULE-style recurrence of a series: FREQ + INTERVAL, plus the duration of every
+    occurrence and how long before its start registration closes.
+
+    Occurrence k of a series anchored at start date A starts at A + k * INTERVAL * FREQ, added
+    to A's Kyiv wall-clock time: a series starting at Kyiv midnight on the 31st stays at Kyiv
+    midnight, on the last day of shorter months and across DST changes. The anchor is the start
+    of the series' first event (EventSeries.anchor_start); the methods taking `after` (the latest
+    stored start) return the occurrences of that grid after it. Without a stored anchor, `after`
+    itself is the anchor, so each step is chained from the latest event.
+    Every method expands occurrences lazily, so far-away windows cost no rows.
+    The default rule is the historical one: monthly, 5 days long, deadline 1 second before start.
+    '''
+    def __init__(
+        self,
+        frequency: str = DEFAULT_FREQUENCY,
+        interval: int = DEFAULT_INTERVAL,
+        duration: timedelta = timedelta(seconds=DEFAULT_DURATION_SECONDS),
+        deadline_offset: timedelta = timedelta(seconds=DEFAULT_DEADLINE_OFFSET_SECONDS),
+        anchor: Optional[datetime] = None,
+    ):
+        if frequency not in FREQUENCY_UNITS:
+            raise ValueError(f"Unsupported frequency: {frequency}")
+        if interval < 1:
+            raise ValueError("Interval must be at least 1.")
+        self.frequency = frequency
+        self.interval = interval
+        self.duration = duration
+        self.deadline_offset = deadline_offset
+        self.anchor = as_utc(anchor) if anchor is not None else None
+
+    @classmethod
+    def from_series(cls, series) -> "RecurrenceRule":
+        '''Builds the rule stored on an EventSeries row; None gives the default rule.'''
+        if series is None:
+            return cls()
+        return cls(
+            frequency=series.frequency,
+            interval=series.interval_count,
+            duration=timedelta(seconds=series.duration_seconds),
+            deadline_offset=timedelta(seconds=series.deadline_offset_seconds),
+            anchor=series.anchor_start,
+        )
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RecurrenceRule) and vars(self) == vars(other)
+
+    def __repr__(self) -> str:
+        return (
+            f"RecurrenceRule(FREQ={self.frequency};INTERVAL={self.interval};"
+            f"DURATION={self.duration};DEADLINE_OFFSET={self.deadline_offset};DTSTART={self.anchor})"
+        )
+
+    def start_of(self, anchor: datetime, index: int) -> datetime:
+        '''
+        Start (aware UTC) of occurrence number `index` after the anchor (index 0 is the anchor itself),
+        stepped in Kyiv local time.
+        '''
+        unit, _ = FREQUENCY_UNITS[self.frequency]
+        local_anchor = as_utc(anchor).astimezone(KYIV_TZ).replace(tzinfo=None)
+        local_start = local_anchor + relativedelta(**{unit: self.interval * index})
+        return KYIV_TZ.localize(local_start).astimezone(timezone.utc)
+
+    def dates_for_start(self, start_date: datetime) -> dict:
+        '''Applies the duration and deadline offset to an occurrence start.'''
+        return {
+            "start_date": start_date,
+            "end_date": start_date + self.duration,
+            "registration_deadline": start_date - self.deadline_offset,
+        }
+
+    def title_for(self, series_key: str, start_date: datetime) -> str:
+        '''Title of an occurrence: "Base - Month Year" of its Kyiv start day, with the day for sub-monthly series.'''
+        start_date = as_utc(start_date).astimezone(KYIV_TZ)
+        if self.frequency in ("DAILY", "WEEKLY"):
+            return f"{series_key} - {start_date.strftime('%d %B %Y')}"
+        return f"{series_key} - {start_date.strftime('%B %Y')}"
+
+    def iter_occurrences(self, anchor: datetime, first_index: int = 1) -> Iterator[dict]:
+        '''Lazily yields the dates of occurrences first_index, first_index + 1, ... after the anchor.'''
+        index = first_index
+        while True:
+            yield self.dates_for_start(self.start_of(anchor, index))
+            index += 1
+
+    def _first_index_from(self, anchor: datetime, window_start: datetime) -> int:
+        '''Smallest index >= 1 whose start is not before window_start, found without walking from 1.'''
+        _, unit_days = FREQUENCY_UNITS[self.frequency]
+        estimate = int((window_start - anchor).total_seconds() / 86400 / (unit_days * self.interval))
+        index = max(1, estimate - 1)
+        while index > 1 and self.start_of(anchor, index - 1) >= window_start:
+            index -= 1
+        while self.start_of(anchor, index) < window_start:
+            index += 1
+        return index
+
+    def min_gap(self) -> timedelta:
+        '''Half a step: grid points closer than this to a stored start belong to the same period.'''
+        _, unit_days = FREQUENCY_UNITS[self.frequency]
+        return timedelta(days=unit_days * self.interval / 2)
+
+    def _grid(self, after: datetime, window_start: Optional[datetime] = None):
+        '''
+        Anchor and first index of the occurrences after `after` (and not before window_start).
+        Grid points less than min_gap after `after` are skipped: a stored start that is off the
+        grid (rows chained before the anchor was stored) must not get a second occurrence in its period.
+        '''
+        after = as_utc(after)
+        anchor = self.anchor or after
+        first_start = after + (self.min_gap() if self.anchor else timedelta(microseconds=1))
+        if window_start is not None and as_utc(window_start) > first_start:
+            first_start = as_utc(window_start)
+        return anchor, self._first_index_from(anchor, first_start) if first_start > anchor else 1
+
+    def occurrences_after(self, after: datetime) -> Iterator[dict]:
+        '''Lazily yields the dates of the occurrences starting after `after`, in order.'''
+        anchor, first_index = self._grid(after)
+        return self.iter_occurrences(anchor, first_index)
+
+    def between(self, after: datetime, window_start: datetime, window_end: datetime) -> Iterator[dict]:
+        '''Lazily yields occurrences after `after` whose start is in [window_start, window_end).'''
+        anchor, first_index = self._grid(after, window_start)
+        window_end = as_utc(window_end)
+        for dates in self.iter_occurrences(anchor, first_index):
+            if dates["start_date"] >= window_end:
+                return
+            yield dates
+
+    def pending(self, after: datetime, until: datetime) -> Iterator[dict]:
+        '''
+        Occurrences missing after `after` up to `until`: the next one is due
+        as long as its predecessor starts before `until` (catch-up semantics).
+        '''
+        previous_start = as_utc(after)
+        until = as_utc(until)
+        for dates in self.occurrences_after(after):
+            if previous_start >= until:
+                return
+            yield dates
+            previous_start = dates["start_date"]
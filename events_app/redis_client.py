@@ -0,0 +1,31 @@
+import redis
+import redis.asyncio as aioredis
+import os
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/4")
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "1.0"))
+
+_redis = None
+_async_redis = None
+
+def get_redis() -> redis.Redis:
+    """Returns the shared sync Redis client (used by Celery tasks and sync routes)."""
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(
+            REDIS_URL,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+        )
+    return _redis
+
+def get_async_redis() -> aioredis.Redis:
+    """Returns the shared asyncio Redis client (used by async routes)."""
+    global _async_redis
+    if _async_redis is None:
+        _async_redis = aioredis.Redis.from_url(
+            REDIS_URL,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+        )
+    return _async_redis
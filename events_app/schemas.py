@@ -1,25 +1,58 @@
-from typing import Optional
-from pydantic import BaseModel
+from typing import Optional, List
+from enum import Enum
+from pydantic import BaseModel, root_validator, conint
 from datetime import datetime, timezone, date
+from .local_time import as_utc
+
+_MISSING = object()
+
+class EventStatus(str, Enum):
+    '''Registration status of an event relative to the current time.'''
+    OPEN = "Open"
+    CLOSED = "Closed"
+    COMPLETED = "Completed"
+
+def event_status(registration_deadline: datetime, end_date: datetime, now: Optional[datetime] = None) -> EventStatus:
+    '''
+    Determines the status of an event at `now` (default: current time).
+    Mirrors the SQL predicates of managers.status_filter; naive datetimes are taken to be UTC.
+    '''
+    now = now or datetime.now(timezone.utc)
+    end_date = as_utc(end_date)
+    registration_deadline = as_utc(registration_deadline)
+    if now > end_date:
+        return EventStatus.COMPLETED
+    elif now > registration_deadline:
+        return EventStatus.CLOSED
+    return EventStatus.OPEN
+
+class SearchSort(str, Enum):
+    '''Order of GET /events/search results: best match first, or the list order (start_date, id).'''
+    RELEVANCE = "relevance"
+    START_DATE = "start_date"
+
+class RecurrenceFrequency(str, Enum):
+    '''FREQ part of a recurrence rule.'''
+    DAILY = "DAILY"
+    WEEKLY = "WEEKLY"
+    MONTHLY = "MONTHLY"
+    YEARLY = "YEARLY"
+
+class RecurrenceRuleIn(BaseModel):
+    '''Recurrence rule of a series: every `interval` `frequency`, lasting `duration_days`.'''
+    frequency : RecurrenceFrequency = RecurrenceFrequency.MONTHLY
+    interval : conint(ge=1) = 1
+    duration_days : conint(ge=1) = 5
+    deadline_offset_seconds : conint(ge=1) = 1
 
 class EventBase(BaseModel):
-    '''Base model for event data. Contains logic for status calculation.'''
+    '''Base model for event data.'''
     title : str
     theme : str
     description : Optional[str] = ""
     start_date : date
     end_date : date
     registration_deadline : date
-    
-    @property
-    def status(self) -> str:
-        '''Determines the current status of the event based on the current date.'''
-        now = datetime.now(timezone.utc)
-        if now > self.end_date:
-            return "Completed"
-        elif now > self.registration_deadline:
-            return "Closed"
-        return "Open"
 
     class Config:
         orm_mode = True 
@@ -27,9 +60,67 @@ class EventBase(BaseModel):
 class EventCreate(EventBase):
     '''Model used for creating new events via the API. Excludes DB-generated fields.'''
     is_active : bool = True
+    recurrence : Optional[RecurrenceRuleIn] = None
 
 class EventSerializer(EventBase):
     '''Serializer model for event data get from the database, including status.'''
     id : int
     is_active : bool
-    created_at : datetime
\ No newline at end of file
+    created_at : datetime
+    status : Optional[EventStatus] = None
+
+    @root_validator(pre=True)
+    def compute_status(cls, values):
+        '''Computes status from the full deadline/end datetimes before they are narrowed to dates.'''
+        values = {name: values.get(name, _MISSING) for name in cls.__fields__}
+        values = {name: value for name, value in values.items() if value is not _MISSING}
+        deadline, end_date = values.get("registration_deadline"), values.get("end_date")
+        if values.get("status") is None and isinstance(deadline, datetime) and isinstance(end_date, datetime):
+            values["status"] = event_status(deadline, end_date)
+        return values
+
+class EventBulkConflict(BaseModel):
+    '''An item of a bulk request that was not created, identified by its position in the request.'''
+    index : int
+    title : str
+    detail : str
+
+class EventBulkResult(BaseModel):
+    '''Result of a bulk creation: the created events and the items that were skipped.'''
+    created : List[EventSerializer]
+    conflicts : List[EventBulkConflict]
+
+
+class CalendarDaySerializer(BaseModel):
+    '''Number of events starting on a Kyiv calendar day, by their current status.'''
+    day : date
+    open : int
+    closed : int
+    completed : int
+
+
+class TaskTriggerResult(BaseModel):
+    '''Task id of a manual trigger; coalesced is true when an already queued or running task was reused.'''
+    message : str
+    task_id : str
+    coalesced : bool
+
+
+class TaskStatusSerializer(BaseModel):
+    '''
+    Celery state of a task (PENDING, STARTED, SUCCESS, FAILURE, ...) with its outcome once finished.
+    skipped is true for a SUCCESS that did nothing because another run held the recurrence lock.
+    '''
+    task_id : str
+    status : str
+    created_count : Optional[int] = None
+    skipped : bool = False
+    error : Optional[str] = None
+
+
+class OccurrenceSerializer(EventBase):
+    '''A real (stored) or virtual (computed from the series rule) occurrence of a series.'''
+    id : Optional[int] = None
+    series_key : str
+    is_virtual : bool
+    status : EventStatus
@@ -0,0 +1,48 @@
+from sqlalchemy import func, literal_column, select, table, column
+from .models import SEARCH_CONFIG
+import re
+
+# Column weights of the SQLite ranking, matching the A/B/C weights of the Postgres tsvector.
+FTS5_WEIGHTS = (10.0, 4.0, 1.0)
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+SEARCH_VECTOR = literal_column("event.search_vector")
+# Inlined rather than bound: asyncpg has no binary encoder for regconfig parameters.
+SEARCH_REGCONFIG = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+event_search = table("event_search", column("rowid"))
+
+
+def search_terms(q: str) -> list:
+    '''Splits a query into words; raises ValueError if it contains none.'''
+    terms = _WORD.findall(q)
+    if not terms:
+        raise ValueError("The search query must contain at least one word.")
+    return terms
+
+
+def fts5_query(q: str) -> str:
+    '''FTS5 MATCH expression requiring every word of q; words are quoted, so user input is never parsed as syntax.'''
+    return " ".join('"' + term.replace('"', '""') + '"' for term in search_terms(q))
+
+
+def postgres_match(q: str):
+    '''
+    Returns (WHERE clause, rank expression) for the generated tsvector column.
+    plainto_tsquery requires every word, like fts5_query, and ignores any operator syntax.
+    '''
+    tsquery = func.plainto_tsquery(SEARCH_REGCONFIG, " ".join(search_terms(q)))
+    return SEARCH_VECTOR.op("@@")(tsquery), func.ts_rank_cd(SEARCH_VECTOR, tsquery)
+
+
+def sqlite_matches(q: str):
+    '''Subquery of (event_id, rank) for events matching q in the FTS5 table; higher rank is better.'''
+    fts_table = literal_column("event_search")
+    return (
+        select(
+            event_search.c.rowid.label("event_id"),
+            (-func.bm25(fts_table, *FTS5_WEIGHTS)).label("rank"),
+        )
+        .select_from(event_search)
+        .where(fts_table.op("MATCH")(fts5_query(q)))
+        .subquery()
+    )
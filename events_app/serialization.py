@@ -0,0 +1,37 @@
+from datetime import date, datetime
+from typing import Iterable
+import orjson
+from .schemas import EventSerializer, event_status
+
+DATE_FIELDS = frozenset(name for name, field in EventSerializer.__fields__.items() if field.type_ is date)
+STORED_FIELDS = [name for name in EventSerializer.__fields__ if name != "status"]
+
+
+def _json_value(name: str, value):
+    if isinstance(value, datetime):
+        # EventSerializer narrows date fields to their date part; jsonable_encoder uses isoformat().
+        return value.date().isoformat() if name in DATE_FIELDS else value.isoformat()
+    return value
+
+
+def event_row_to_dict(row) -> dict:
+    '''
+    Builds the dict EventSerializer would produce for a row of managers.LIST_COLUMNS,
+    without pydantic validation: same keys, same order, same date/datetime formats.
+    '''
+    data = {name: _json_value(name, value) for name, value in zip(STORED_FIELDS, row)}
+    data["status"] = event_status(row.registration_deadline, row.end_date).value
+    return data
+
+
+def event_to_json(event) -> bytes:
+    '''
+    Serializes the stored fields of one Event like an item of GET /events/. The status is left
+    out: it changes with time, so consumers derive it from the dates when they read the change.
+    '''
+    return orjson.dumps({name: _json_value(name, getattr(event, name)) for name in STORED_FIELDS})
+
+
+def render_event_rows(rows: Iterable) -> bytes:
+    '''Serializes list rows with orjson; byte-for-byte the body response_model=List[EventSerializer] gives.'''
+    return orjson.dumps([event_row_to_dict(row) for row in rows])
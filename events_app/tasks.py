@@ -1,57 +1,302 @@
-from .celery_app import celery_app
+from .celery_app import (
+    celery_app, RECURRENCE_SHARD_COUNT, RECURRENCE_LOCK_KEY, RECURRENCE_LOCK_TTL_SECONDS,
+    MANUAL_TRIGGER_KEY, MANUAL_TRIGGER_TTL_SECONDS, ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE,
+    OUTBOX_RELAY_MAX_BATCHES, OUTBOX_RELAY_LOCK_KEY, OUTBOX_RELAY_LOCK_TTL_SECONDS,
+)
 from .database import SessionLocal 
 from .managers import EventManager 
-from .models import Event
-from datetime import datetime, timezone
+from .cache import bump_event_list_version
+from .metrics import record_task_run
+from .change_feed import publish_outbox_batch, OUTBOX_BATCH_SIZE
+from .profiling import profiling
+from .locks import acquire_lock, lock_holder, release_lock, UNLOCKED
+from celery import chord, states
+from celery.result import AsyncResult
+from sqlalchemy.exc import OperationalError
+from typing import List, Optional
+from contextlib import nullcontext
+from datetime import datetime, timezone, timedelta
+from dateutil.relativedelta import relativedelta
 import logging
+import time
+import uuid
+import zlib
 logger = logging.getLogger(__name__)
 
-@celery_app.task(name='events_app.tasks.generate_recurring_events')
-def generate_recurring_events():
+
+def shard_for(series_key: str, shard_count: int) -> int:
+    """Stable shard number of a series (crc32 of its key), identical across processes."""
+    return zlib.crc32(series_key.encode("utf-8")) % shard_count
+
+
+def _generate_for_series(
+    series_keys: Optional[List[str]] = None,
+    catch_up: bool = False,
+    horizon_months: int = 0,
+    task_name: str = "generate_recurring_events",
+) -> dict:
     """
-    Celery task to generate recurring events based on existing ones.
+    Generates the due occurrences of all series, or only of series_keys.
+    All occurrences are inserted in batch mode (see EventManager.insert_events) and committed once.
+    Due-ness is re-checked against the database here, so running it twice for the
+    same series (retries, overlapping runs) never creates an occurrence twice.
+    Every run is recorded in the task metrics under task_name.
     """
     db = SessionLocal()
     created_count = 0
+    scanned_count = 0
+    started = time.perf_counter()
     now = datetime.now(timezone.utc).replace(microsecond=0) 
     try:
         manager = EventManager(db)
-        latest_events = manager.get_latest_events_by_title()
+        cutoff = now + relativedelta(months=horizon_months)
+        if series_keys is None:
+            latest_events = manager.get_due_events(due_before=cutoff)
+        else:
+            latest_events = manager.get_due_events(due_before=cutoff, series_keys=series_keys)
         
-        created = []
-
-        for base_title, latest_event in latest_events.items():
-            latest_db_date = latest_event.start_date
-            if latest_db_date.tzinfo is not None:
-                latest_db_date = latest_db_date.astimezone(timezone.utc)
-            else:
-                latest_db_date = latest_db_date.replace(tzinfo=timezone.utc)
-            latest_db_date = latest_db_date.replace(microsecond=0)
-            if now > latest_db_date: 
-                new_dates = manager._calculate_next_dates(latest_event)
-                month_year = new_dates['start_date'].strftime('%B %Y')
-                new_event_title_check = f"{base_title} - {month_year}"
-
-                exists = db.query(Event).filter(Event.title == new_event_title_check).first()
-                if not exists:
-                    new_event = manager.create_next_event(latest_event)
-                    if new_event:
-                        created.append(new_event)
-                        logger.info(f"Generated new event: {new_event.title}")
-                    else:
-                        logger.info(f"Skipping generation: attempted to create {new_event_title_check} but it was not added (possible duplicate).")
-                else:
-                    logger.info(f"Skipping event generation: {new_event_title_check} already exists.")
+        scanned_count = len(latest_events)
+        rules = manager.get_recurrence_rules(list(latest_events))
+        rows = []
+        for series_key, latest_event in latest_events.items():
+            rows.extend(manager.plan_next_events(
+                latest_event, until=cutoff if catch_up else None, rule=rules.get(series_key)
+            ))
+
+        created = manager.insert_events(rows)
+        for new_event in created:
+            logger.info(f"Generated new event: {new_event.title}")
+        if len(created) < len(rows):
+            logger.info(f"Skipped {len(rows) - len(created)} occurrences that already exist.")
         if created:
+            manager.bump_watermark()
             db.commit()
             created_count = len(created)
+            bump_event_list_version()
     except Exception as e:
         db.rollback()
         logger.error(f"Cannot generate recurring events. Rolled back transaction. Error: {e}")
         raise 
     finally:
         db.close()
+        record_task_run(task_name, time.perf_counter() - started, scanned_count, created_count)
         logger.info(f"Recurring event generation finished. Created {created_count} new events.")
 
-    logger.info(f"Recurring event generation complete: {created_count} new events")
-    return {"created_count": created_count}
\ No newline at end of file
+    return {"created_count": created_count}
+
+
+@celery_app.task(name='events_app.tasks.generate_recurring_events')
+def generate_recurring_events(catch_up: bool = False, horizon_months: int = 0, profile: bool = False):
+    """
+    Celery task to generate recurring events based on existing ones.
+    By default each due series gets its single next occurrence. With catch_up=True every
+    missed occurrence is created in one run, and horizon_months additionally materializes
+    occurrences that start up to that many months ahead.
+    A run enqueued by trigger_recurring_events frees the manual trigger when it ends.
+    With profile=True the run writes a profile report (see profiling.profiling).
+    """
+    try:
+        lock_token = acquire_lock(RECURRENCE_LOCK_KEY, RECURRENCE_LOCK_TTL_SECONDS)
+        if lock_token is None:
+            logger.info("Recurring event generation skipped: another run holds the lock.")
+            return {"created_count": 0, "skipped": True}
+        try:
+            with profiling("generate_recurring_events") if profile else nullcontext():
+                result = _generate_for_series(catch_up=catch_up, horizon_months=horizon_months)
+        finally:
+            release_lock(RECURRENCE_LOCK_KEY, lock_token)
+    finally:
+        release_lock(MANUAL_TRIGGER_KEY, generate_recurring_events.request.id)
+    logger.info(f"Recurring event generation complete: {result['created_count']} new events")
+    return result
+
+
+def trigger_recurring_events(**kwargs) -> dict:
+    """
+    Enqueues generate_recurring_events unless a manually triggered run is still queued or running,
+    in which case that run's task id is returned with coalesced=True. The trigger key holds the
+    task id; the run frees it when it ends, and a key left by a run that died is replaced.
+    Without Redis every call enqueues (the run itself is idempotent).
+    """
+    task_id = str(uuid.uuid4())
+    for _ in range(2):
+        token = acquire_lock(MANUAL_TRIGGER_KEY, MANUAL_TRIGGER_TTL_SECONDS, token=task_id)
+        if token is not None:
+            break
+        existing_id = lock_holder(MANUAL_TRIGGER_KEY)
+        if existing_id and AsyncResult(existing_id, app=celery_app).state not in states.READY_STATES:
+            return {"task_id": existing_id, "coalesced": True}
+        release_lock(MANUAL_TRIGGER_KEY, existing_id)
+    else:
+        logger.warning("Manual trigger key is contended, enqueuing without coalescing.")
+        token = UNLOCKED
+
+    try:
+        generate_recurring_events.apply_async(kwargs=kwargs, task_id=task_id)
+    except Exception:
+        release_lock(MANUAL_TRIGGER_KEY, token)
+        raise
+    return {"task_id": task_id, "coalesced": False}
+
+
+def task_status(task_id: str) -> dict:
+    """
+    Reads the state of a task from the result backend. Unknown ids report PENDING, like queued ones.
+    created_count is set once the task succeeded, error once it failed; skipped is true for a
+    run that did nothing because another run held the recurrence lock.
+    """
+    result = AsyncResult(task_id, app=celery_app)
+    status = {"task_id": task_id, "status": result.state, "created_count": None, "skipped": False, "error": None}
+    if result.state == states.SUCCESS and isinstance(result.result, dict):
+        status["created_count"] = result.result.get("created_count")
+        status["skipped"] = bool(result.result.get("skipped", False))
+    elif result.state == states.FAILURE:
+        status["error"] = repr(result.result)
+    return status
+
+
+@celery_app.task(
+    name='events_app.tasks.generate_recurring_events_shard',
+    autoretry_for=(OperationalError,),
+    retry_backoff=True,
+    max_retries=3,
+)
+def generate_recurring_events_shard(
+    series_keys: List[str], catch_up: bool = False, horizon_months: int = 0, profile: bool = False
+):
+    """
+    Celery task that generates recurring events for one shard of series.
+    Safe to retry: occurrences that already exist are skipped.
+    """
+    with profiling("generate_recurring_events_shard") if profile else nullcontext():
+        return _generate_for_series(
+            series_keys=series_keys, catch_up=catch_up, horizon_months=horizon_months,
+            task_name="generate_recurring_events_shard",
+        )
+
+
+@celery_app.task(name='events_app.tasks.combine_recurring_event_shards')
+def combine_recurring_event_shards(results: List[dict], lock_token: Optional[str] = None):
+    """
+    Chord callback that sums the created_count of all shards into one result
+    and releases the recurrence lock taken by dispatch_recurring_events.
+    """
+    release_lock(RECURRENCE_LOCK_KEY, lock_token)
+    created_count = sum(result["created_count"] for result in results)
+    logger.info(f"Recurring event generation complete: {created_count} new events across {len(results)} shards")
+    return {"created_count": created_count, "shard_count": len(results)}
+
+
+@celery_app.task(name='events_app.tasks.dispatch_recurring_events')
+def dispatch_recurring_events(
+    catch_up: bool = False,
+    horizon_months: int = 0,
+    shard_count: int = RECURRENCE_SHARD_COUNT,
+    profile: bool = False,
+):
+    """
+    Coordinator task: splits the due series into shards by hash of the series key and
+    runs generate_recurring_events_shard for each as a chord. The combined
+    created_count is the result of the chord callback, whose id is returned.
+    Holds the recurrence lock until the chord callback runs (or its TTL expires if a shard
+    fails for good), so overlapping beats or manual triggers skip instead of doubling the work.
+    profile=True is passed on to every shard.
+    """
+    lock_token = acquire_lock(RECURRENCE_LOCK_KEY, RECURRENCE_LOCK_TTL_SECONDS)
+    if lock_token is None:
+        logger.info("Recurring event generation skipped: another run holds the lock.")
+        return {"created_count": 0, "shard_count": 0, "series_count": 0, "skipped": True}
+
+    db = SessionLocal()
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    try:
+        cutoff = now + relativedelta(months=horizon_months)
+        due_series_keys = EventManager(db).get_due_series_keys(due_before=cutoff)
+    except Exception:
+        release_lock(RECURRENCE_LOCK_KEY, lock_token)
+        raise
+    finally:
+        db.close()
+
+    shards = [[] for _ in range(shard_count)]
+    for series_key in due_series_keys:
+        shards[shard_for(series_key, shard_count)].append(series_key)
+    header = [
+        generate_recurring_events_shard.s(
+            series_keys, catch_up=catch_up, horizon_months=horizon_months, profile=profile
+        )
+        for series_keys in shards if series_keys
+    ]
+    if not header:
+        release_lock(RECURRENCE_LOCK_KEY, lock_token)
+        logger.info("Recurring event generation: no due series.")
+        return {"created_count": 0, "shard_count": 0, "series_count": 0}
+
+    try:
+        result = chord(header)(combine_recurring_event_shards.s(lock_token=lock_token))
+    except Exception:
+        release_lock(RECURRENCE_LOCK_KEY, lock_token)
+        raise
+    logger.info(f"Dispatched {len(due_series_keys)} due series to {len(header)} shards. Chord ID: {result.id}")
+    return {"chord_id": result.id, "shard_count": len(header), "series_count": len(due_series_keys)}
+
+
+@celery_app.task(name='events_app.tasks.archive_completed_events')
+def archive_completed_events(after_days: int = ARCHIVE_AFTER_DAYS, batch_size: int = ARCHIVE_BATCH_SIZE):
+    """
+    Celery task that moves events which ended more than after_days ago into event_archive,
+    keeping the latest event of every series. Each batch is its own transaction, so an
+    interrupted run keeps what it moved and the next run continues.
+    """
+    db = SessionLocal()
+    archived_count = 0
+    started = time.perf_counter()
+    completed_before = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(days=after_days)
+    try:
+        archived_count = EventManager(db).archive_completed_events(completed_before, batch_size=batch_size)
+        if archived_count:
+            bump_event_list_version()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Cannot archive completed events. Rolled back transaction. Error: {e}")
+        raise
+    finally:
+        db.close()
+        record_task_run("archive_completed_events", time.perf_counter() - started, 0, archived_count)
+        logger.info(f"Event archiving finished. Archived {archived_count} events ended before {completed_before}.")
+
+    return {"archived_count": archived_count}
+
+
+@celery_app.task(name='events_app.tasks.relay_event_outbox')
+def relay_event_outbox(batch_size: int = OUTBOX_BATCH_SIZE, max_batches: int = OUTBOX_RELAY_MAX_BATCHES):
+    """
+    Celery task that publishes pending event_outbox rows to the change stream, batch by batch,
+    until the outbox is empty or max_batches were sent. Runs one at a time (relay lock) so the
+    stream keeps the outbox order; each batch is committed on its own.
+    """
+    lock_token = acquire_lock(OUTBOX_RELAY_LOCK_KEY, OUTBOX_RELAY_LOCK_TTL_SECONDS)
+    if lock_token is None:
+        return {"published_count": 0, "skipped": True}
+
+    db = SessionLocal()
+    published_count = 0
+    started = time.perf_counter()
+    try:
+        for _ in range(max_batches):
+            published = publish_outbox_batch(db, batch_size=batch_size)
+            published_count += published
+            if published < batch_size:
+                break
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Cannot relay the event outbox. Rolled back transaction. Error: {e}")
+        raise
+    finally:
+        db.close()
+        release_lock(OUTBOX_RELAY_LOCK_KEY, lock_token)
+        record_task_run("relay_event_outbox", time.perf_counter() - started, 0, published_count)
+
+    if published_count:
+        logger.info(f"Relayed {published_count} outbox rows to the change stream.")
+    return {"published_count": published_count}
@@ -0,0 +1,109 @@
+import pytest
+import pytest_asyncio
+from datetime import date, timedelta
+from unittest.mock import patch, AsyncMock
+from httpx import ASGITransport, AsyncClient
+from events_app import database
+from events_app.api_router import normalize_event_in
+from events_app.cache import EventListCache, LocalLRUCache
+from events_app.main import app
+from events_app.managers import AsyncEventManager
+from events_app.models import Event
+from events_app.schemas import EventCreate
+
+@pytest_asyncio.fixture
+async def sqlite_database(tmp_path, monkeypatch):
+    """
+    Points the async engine at a fresh SQLite file (aiosqlite) with every table created,
+    without a read replica, so get_async_db and get_async_read_db both use it.
+    """
+    monkeypatch.setattr(database, "ASYNC_DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'events.db'}")
+    monkeypatch.setattr(database, "ASYNC_DATABASE_READ_URL", None)
+    monkeypatch.setattr(database, "_async_engine", None)
+    engine = database.get_async_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Event.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+@pytest_asyncio.fixture
+async def client(sqlite_database):
+    """HTTP client for the app on the real session dependencies, with the Redis-backed list cache disabled."""
+    list_cache = EventListCache(LocalLRUCache(max_entries=4, ttl_seconds=1), ttl_seconds=1, enabled=False)
+    list_cache.invalidate = AsyncMock()
+    with patch('events_app.api_router.event_list_cache', list_cache):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as http_client:
+            yield http_client
+
+def _event_in(title, start_day, is_active=True):
+    """Builds an incoming event normalized the way the API does it."""
+    return normalize_event_in(EventCreate(
+        title=title, theme="T", is_active=is_active,
+        start_date=start_day, end_date=start_day + timedelta(days=2),
+        registration_deadline=start_day - timedelta(days=1),
+    ))
+
+def _payload(title, start, is_active=True):
+    """A request body for POST /events/initial with ISO dates."""
+    return {
+        "title": title, "theme": "T", "is_active": is_active,
+        "start_date": start, "end_date": "2030-03-05", "registration_deadline": "2030-02-20",
+    }
+
+@pytest.mark.asyncio
+async def test_get_async_db_yields_a_session_on_the_async_engine(sqlite_database):
+    """
+    Verifies that the dependency yields a session bound to the async engine and closes it afterwards.
+    """
+    dependency = database.get_async_db()
+    session = await dependency.__anext__()
+    manager = AsyncEventManager(session)
+    await manager.create_base_event(_event_in("Meetup", date(2030, 3, 1)))
+
+    assert session.get_bind() is sqlite_database.sync_engine
+    with pytest.raises(StopAsyncIteration):
+        await dependency.__anext__()
+    assert not session.in_transaction()
+
+@pytest.mark.asyncio
+async def test_async_manager_creates_lists_and_refuses_duplicates(sqlite_database):
+    """
+    Verifies that AsyncEventManager stores events with their series, bumps the watermark,
+    filters by is_active and reports a duplicate (series_key, start_date) as ValueError.
+    """
+    async with database.AsyncSessionLocal() as session:
+        manager = AsyncEventManager(session)
+        await manager.create_base_event(_event_in("Meetup", date(2030, 3, 1)))
+        await manager.create_base_event(_event_in("Workshop", date(2030, 3, 2), is_active=False))
+        with pytest.raises(ValueError):
+            await manager.create_base_event(_event_in("Meetup", date(2030, 3, 1)))
+
+        active = await manager.list_events(is_active=True)
+        everything = await manager.list_event_rows()
+        watermark = await manager.get_watermark()
+
+    assert [event.title for event in active] == ["Meetup - March 2030"]
+    assert sorted(row.title for row in everything) == ["Meetup - March 2030", "Workshop - March 2030"]
+    assert watermark.version == 2
+
+@pytest.mark.asyncio
+async def test_initial_event_route_and_list_route_round_trip(client):
+    """
+    Verifies that POST /events/initial stores the event, a duplicate gets 409 and an invalid one 400,
+    and that GET /events/ lists what was created with the is_active filter applied.
+    """
+    created = await client.post("/events/initial", json=_payload("Meetup", "2030-03-01"))
+    await client.post("/events/initial", json=_payload("Workshop", "2030-03-02", is_active=False))
+    duplicate = await client.post("/events/initial", json=_payload("Meetup - March 2030", "2030-03-01"))
+    invalid = await client.post("/events/initial", json=dict(_payload("Late", "2030-03-01"), registration_deadline="2030-03-01"))
+
+    listed = await client.get("/events/")
+    active = await client.get("/events/", params={"is_active": "true"})
+
+    assert created.status_code == 201
+    assert created.json()["title"] == "Meetup - March 2030"
+    assert (duplicate.status_code, invalid.status_code) == (409, 400)
+    assert listed.status_code == 200
+    assert [event["title"] for event in listed.json()] == ["Meetup - March 2030", "Workshop - March 2030"]
+    assert [event["title"] for event in active.json()] == ["Meetup - March 2030"]
+    assert listed.headers["ETag"] != ""
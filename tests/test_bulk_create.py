@@ -0,0 +1,183 @@
+import os
+import pytest
+import pytest_asyncio
+from datetime import date, timedelta
+from unittest.mock import patch, AsyncMock
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+from events_app.api_router import normalize_event_in
+from events_app.database import get_async_db
+from events_app.local_time import as_utc, to_aware_utc_midnight
+from events_app.main import app
+from events_app.managers import AsyncEventManager
+from events_app.models import Event, EventArchive, EventSeries
+from events_app.schemas import EventCreate, RecurrenceRuleIn
+
+@pytest_asyncio.fixture
+async def async_session():
+    """
+    Creates a temporary in-memory SQLite session on the aiosqlite driver.
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Event.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db_session:
+        yield db_session
+    await engine.dispose()
+
+TEST_ASYNC_DATABASE_URL = os.getenv("TEST_ASYNC_DATABASE_URL")
+requires_postgres = pytest.mark.skipif(
+    not (TEST_ASYNC_DATABASE_URL or "").startswith("postgresql"),
+    reason="TEST_ASYNC_DATABASE_URL does not point to a Postgres database",
+)
+
+@pytest_asyncio.fixture
+async def client(async_session):
+    """
+    HTTP client for the app with get_async_db bound to the SQLite session and the Redis list cache mocked out.
+    """
+    app.dependency_overrides[get_async_db] = lambda: async_session
+    try:
+        with patch('events_app.api_router.event_list_cache') as mock_cache:
+            mock_cache.invalidate = AsyncMock()
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as http_client:
+                yield http_client
+    finally:
+        app.dependency_overrides.clear()
+
+def _item(title, start, end="2030-03-05", deadline="2030-02-28"):
+    """A bulk request item with ISO dates."""
+    return {"title": title, "theme": "T", "start_date": start, "end_date": end, "registration_deadline": deadline}
+
+def _event_in(title, start_day, recurrence=None):
+    """Builds an incoming event normalized the way the API does it."""
+    return normalize_event_in(EventCreate(
+        title=title, theme="T", recurrence=recurrence,
+        start_date=start_day, end_date=start_day + timedelta(days=2),
+        registration_deadline=start_day - timedelta(days=1),
+    ))
+
+@pytest.mark.asyncio
+async def test_skipped_items_do_not_replace_the_series_rule(async_session):
+    """
+    Verifies that an item colliding with an existing event leaves the rule of its series alone,
+    while a created item in the same batch still stores its own rule.
+    """
+    manager = AsyncEventManager(async_session)
+    weekly = RecurrenceRuleIn(frequency="WEEKLY", interval=2)
+    await manager.create_base_events([_event_in("Standup", date(2030, 1, 6), weekly)])
+
+    created = await manager.create_base_events([
+        _event_in("Standup", date(2030, 1, 6), RecurrenceRuleIn(frequency="YEARLY")),
+        _event_in("Retro", date(2030, 1, 10), RecurrenceRuleIn(frequency="DAILY", interval=3)),
+    ])
+
+    series = {row.key: row for row in (await async_session.scalars(select(EventSeries))).all()}
+    assert [event.series_key for event in created] == ["Retro"]
+    assert (series["Standup"].frequency, series["Standup"].interval_count) == ("WEEKLY", 2)
+    assert (series["Retro"].frequency, series["Retro"].interval_count) == ("DAILY", 3)
+
+@pytest.mark.asyncio
+async def test_bulk_reports_conflicts_per_item(client):
+    """
+    Verifies that duplicates of stored events, duplicates within the request and invalid items
+    are reported by index while the rest of the batch is created.
+    """
+    await client.post("/events/bulk", json=[_item("Meetup", "2030-03-01")])
+
+    response = await client.post("/events/bulk", json=[
+        _item("Meetup - March 2030", "2030-03-01"),
+        _item("Workshop", "2030-03-02"),
+        _item("Workshop", "2030-03-02"),
+        _item("Late", "2030-03-02", deadline="2030-03-02"),
+        _item("Backwards", "2030-03-02", end="2030-03-01"),
+        _item("Talk", "2030-03-03"),
+    ])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [event["title"] for event in body["created"]] == ["Workshop - March 2030", "Talk - March 2030"]
+    assert [conflict["index"] for conflict in body["conflicts"]] == [0, 2, 3, 4]
+    assert "already exists" in body["conflicts"][0]["detail"]
+    assert body["conflicts"][1]["detail"] == "Duplicate of item 1 in this request."
+    assert "Registration deadline" in body["conflicts"][2]["detail"]
+    assert "end date" in body["conflicts"][3]["detail"]
+
+@pytest.mark.asyncio
+async def test_bulk_reports_archived_occurrences_as_conflicts(client, async_session):
+    """
+    Verifies that an item matching an archived event is reported as existing instead of being created again.
+    """
+    archived = _event_in("Meetup", date(2030, 3, 1))
+    async_session.add(EventArchive(
+        id=1, title=archived.title, series_key="Meetup", theme="T", start_date=archived.start_date,
+        end_date=archived.end_date, registration_deadline=archived.registration_deadline, is_active=True,
+    ))
+    await async_session.commit()
+
+    response = await client.post("/events/bulk", json=[_item("Meetup", "2030-03-01"), _item("Talk", "2030-03-03")])
+    single = await client.post("/events/initial", json=_item("Meetup", "2030-03-01"))
+
+    body = response.json()
+    assert [event["title"] for event in body["created"]] == ["Talk - March 2030"]
+    assert [conflict["index"] for conflict in body["conflicts"]] == [0]
+    assert single.status_code == 409
+    assert [event.series_key for event in (await async_session.scalars(select(Event))).all()] == ["Talk"]
+
+@pytest.mark.asyncio
+async def test_bulk_normalizes_dates_to_kyiv_midnight(client, async_session):
+    """
+    Verifies that created events are stored at Kyiv midnight in UTC and titled with their Kyiv month.
+    """
+    response = await client.post("/events/bulk", json=[_item("Meetup", "2030-03-01")])
+
+    stored = (await async_session.scalars(select(Event))).one()
+    assert response.json()["created"][0]["title"] == "Meetup - March 2030"
+    assert stored.series_key == "Meetup"
+    assert [as_utc(value) for value in (stored.start_date, stored.end_date, stored.registration_deadline)] == [
+        to_aware_utc_midnight(date(2030, 3, 1)),
+        to_aware_utc_midnight(date(2030, 3, 5)),
+        to_aware_utc_midnight(date(2030, 2, 28)),
+    ]
+
+@pytest.mark.asyncio
+async def test_bulk_rejects_payloads_over_the_cap(client, async_session):
+    """
+    Verifies that a payload larger than BULK_MAX_ITEMS is refused with 413 before anything is written.
+    """
+    with patch('events_app.api_router.BULK_MAX_ITEMS', 2):
+        response = await client.post("/events/bulk", json=[
+            _item("Meetup", "2030-03-01"), _item("Workshop", "2030-03-02"), _item("Talk", "2030-03-03"),
+        ])
+
+    assert response.status_code == 413
+    assert (await async_session.scalars(select(Event))).all() == []
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_bulk_copy_path_skips_existing_events():
+    """
+    Verifies on Postgres that the COPY + staging table path creates new rows and skips stored ones.
+    """
+    engine = create_async_engine(TEST_ASYNC_DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(Event.metadata.create_all)
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db_session:
+            manager = AsyncEventManager(db_session)
+            await manager.create_base_events([_event_in("Copy Meetup", date(2030, 3, 1))])
+            with patch('events_app.managers.BULK_COPY_THRESHOLD', 2):
+                created = await manager.create_base_events([
+                    _event_in("Copy Meetup", date(2030, 3, 1)),
+                    _event_in("Copy Workshop", date(2030, 3, 2)),
+                    _event_in("Copy Talk", date(2030, 3, 3)),
+                ])
+            await db_session.execute(delete(Event).where(Event.series_key.like("Copy %")))
+            await db_session.execute(delete(EventSeries).where(EventSeries.key.like("Copy %")))
+            await db_session.commit()
+    finally:
+        await engine.dispose()
+
+    assert sorted(event.series_key for event in created) == ["Copy Talk", "Copy Workshop"]
@@ -0,0 +1,118 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from events_app.cache import LocalLRUCache, EventListCache, pack_page, unpack_page
+
+def test_local_cache_evicts_least_recently_used():
+    """
+    Verifies that the local tier never grows past max_entries and evicts the least recently used key.
+    """
+    cache = LocalLRUCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")
+    cache.set("c", b"3")
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+
+@patch('events_app.cache.time')
+def test_local_cache_expires_entries(mock_time):
+    """
+    Verifies that entries older than ttl_seconds are treated as misses.
+    """
+    mock_time.monotonic.return_value = 100.0
+    cache = LocalLRUCache(max_entries=10, ttl_seconds=5)
+    cache.set("a", b"1")
+
+    mock_time.monotonic.return_value = 104.0
+    assert cache.get("a") == b"1"
+
+    mock_time.monotonic.return_value = 105.0
+    assert cache.get("a") is None
+
+def test_build_key_changes_with_version():
+    """
+    Verifies that keys embed the list version, so a version bump makes old entries unreachable.
+    """
+    params = {"is_active": True, "limit": 100, "skip": 0, "cursor": None}
+
+    assert EventListCache.build_key("1", params) != EventListCache.build_key("2", params)
+    assert EventListCache.build_key("1", params) == EventListCache.build_key("1", dict(reversed(params.items())))
+
+@pytest.mark.parametrize("cursor", [None, "eyJzIjoiMjAyNSJ9"])
+def test_pack_page_round_trip(cursor):
+    """
+    Verifies that a rendered page and its next cursor survive the trip through the cache.
+    """
+    body = b'[{"title":"Meetup - May 2025"}]'
+
+    assert unpack_page(pack_page(body, cursor)) == (body, cursor)
+
+
+def test_list_cache_key_carries_the_replica_watermark():
+    """
+    Verifies that the list is read from the replica and cached under the watermark version read from
+    that same replica, so a lagging replica's page is never stored under a newer version.
+    """
+    from types import SimpleNamespace
+    from datetime import datetime, timezone
+    from fastapi.testclient import TestClient
+    from events_app.main import app
+    from events_app.database import get_async_read_db
+
+    app.dependency_overrides[get_async_read_db] = lambda: "replica"
+    try:
+        with patch('events_app.api_router.event_list_cache') as mock_cache, \
+                patch('events_app.api_router.AsyncEventManager') as MockManager:
+            mock_cache.key_for = AsyncMock(return_value="events:list:page:key")
+            mock_cache.get = AsyncMock(return_value=None)
+            mock_cache.set = AsyncMock()
+            MockManager.return_value.get_watermark = AsyncMock(
+                return_value=SimpleNamespace(version=7, modified_at=datetime(2030, 1, 1, tzinfo=timezone.utc))
+            )
+            MockManager.return_value.list_event_rows = AsyncMock(return_value=[])
+            response = TestClient(app).get("/events/")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    MockManager.assert_called_once_with("replica")
+    assert mock_cache.key_for.call_args.args[0]["watermark"] == 7
+
+def test_list_cache_key_changes_with_the_status_window():
+    """
+    Verifies that the same watermark gives a different cache key in the next status window, so a
+    cached body with stale Open/Closed statuses is not served under the new ETag.
+    """
+    from types import SimpleNamespace
+    from datetime import datetime, timedelta, timezone
+    from fastapi.testclient import TestClient
+    from events_app.main import app
+    from events_app.database import get_async_read_db
+    from events_app.conditional import list_validators, ETAG_STATUS_WINDOW_SECONDS
+
+    first_window = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    responses, keys = [], []
+    app.dependency_overrides[get_async_read_db] = lambda: "replica"
+    try:
+        for now in (first_window, first_window + timedelta(seconds=ETAG_STATUS_WINDOW_SECONDS)):
+            with patch('events_app.api_router.event_list_cache') as mock_cache, \
+                    patch('events_app.api_router.AsyncEventManager') as MockManager, \
+                    patch('events_app.api_router.list_validators', lambda version, modified_at: list_validators(
+                        version, modified_at, now=now
+                    )):
+                mock_cache.key_for = AsyncMock(return_value=None)
+                MockManager.return_value.get_watermark = AsyncMock(
+                    return_value=SimpleNamespace(version=7, modified_at=first_window)
+                )
+                MockManager.return_value.list_event_rows = AsyncMock(return_value=[])
+                responses.append(TestClient(app).get("/events/"))
+                keys.append(mock_cache.key_for.call_args.args[0])
+    finally:
+        app.dependency_overrides.clear()
+
+    assert [key["watermark"] for key in keys] == [7, 7]
+    assert keys[0] != keys[1]
+    assert [key["etag"] for key in keys] == [response.headers["ETag"] for response in responses]
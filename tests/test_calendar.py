@@ -0,0 +1,71 @@
+import pytest
+from datetime import datetime, date, timezone, timedelta
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from events_app.local_time import to_aware_utc_midnight, kyiv_day, month_days
+from events_app.managers import EventManager, calendar_days
+from events_app.models import Event, EventCalendarBucket
+from events_app.schemas import EventCreate
+
+@pytest.fixture
+def session():
+    """
+    Creates a temporary in-memory SQLite session.
+    """
+    engine = create_engine("sqlite:///:memory:")
+    Event.metadata.create_all(engine)
+    db_session = sessionmaker(bind=engine)()
+    yield db_session
+    db_session.close()
+
+def _create(manager, title, start_day, deadline_days=1, length_days=2):
+    """Creates an event the way the API does: every date at Kyiv midnight in UTC."""
+    event_in = EventCreate(
+        title=title, theme="T",
+        start_date=start_day, end_date=start_day + timedelta(days=length_days),
+        registration_deadline=start_day - timedelta(days=deadline_days),
+    )
+    event_in.start_date = to_aware_utc_midnight(event_in.start_date)
+    event_in.end_date = to_aware_utc_midnight(event_in.end_date)
+    event_in.registration_deadline = to_aware_utc_midnight(event_in.registration_deadline)
+    return manager.create_base_event(event_in)
+
+def test_month_days_and_kyiv_day():
+    """
+    Verifies month bounds (including December) and that Kyiv midnight in UTC is the Kyiv day, not the UTC day.
+    """
+    assert month_days("2030-12") == (date(2030, 12, 1), date(2031, 1, 1))
+    for bad in ("2030-13", "2030-1", "March"):
+        with pytest.raises(ValueError):
+            month_days(bad)
+
+    kyiv_midnight = to_aware_utc_midnight(date(2030, 7, 1))
+    assert kyiv_midnight.date() == date(2030, 6, 30)
+    assert kyiv_day(kyiv_midnight) == date(2030, 7, 1)
+    assert kyiv_day(kyiv_midnight.replace(tzinfo=None)) == date(2030, 7, 1)
+
+def test_calendar_counts_follow_inserts_and_status(session):
+    """
+    Verifies that creations increment the bucket of their Kyiv start day, that generated
+    occurrences are counted too, and that the status is derived at read time.
+    """
+    manager = EventManager(session)
+    first = _create(manager, "Meetup", date(2030, 7, 1))
+    _create(manager, "Workshop", date(2030, 7, 1))
+    _create(manager, "Late", date(2030, 7, 10), deadline_days=5)
+    generated = manager.create_next_events(first, until=datetime(2030, 7, 20, tzinfo=timezone.utc))
+
+    buckets = session.scalars(select(EventCalendarBucket).where(
+        EventCalendarBucket.day >= date(2030, 7, 1), EventCalendarBucket.day < date(2030, 8, 1)
+    )).all()
+
+    assert [kyiv_day(event.start_date) for event in generated] == [date(2030, 8, 1)]
+    assert sum(bucket.event_count for bucket in buckets) == 3
+    now = to_aware_utc_midnight(date(2030, 7, 7))
+    assert calendar_days(buckets, now=now) == [
+        {"day": date(2030, 7, 1), "open": 0, "closed": 0, "completed": 2},
+        {"day": date(2030, 7, 10), "open": 0, "closed": 1, "completed": 0},
+    ]
+    assert session.scalar(
+        select(EventCalendarBucket.event_count).where(EventCalendarBucket.day == date(2030, 8, 1))
+    ) == 1
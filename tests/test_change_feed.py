@@ -0,0 +1,86 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+from redis.exceptions import ResponseError
+from sqlalchemy import create_engine, select, func
+from sqlalchemy.orm import sessionmaker
+from events_app.change_feed import (
+    STREAM_KEY,
+    publish_outbox_batch,
+    ensure_consumer_group,
+    read_changes,
+    ack_changes,
+)
+from events_app.models import Event, EventOutbox
+
+@pytest.fixture
+def session():
+    """
+    Creates a temporary in-memory SQLite session with three pending outbox rows.
+    """
+    engine = create_engine("sqlite:///:memory:")
+    Event.metadata.create_all(engine)
+    db_session = sessionmaker(bind=engine)()
+    for event_id in (1, 2, 3):
+        db_session.add(EventOutbox(topic="event.created", event_id=event_id, payload=f'{{"id":{event_id}}}'))
+    db_session.commit()
+    yield db_session
+    db_session.close()
+
+@patch('events_app.change_feed.get_redis')
+def test_publish_outbox_batch_sends_oldest_rows_and_deletes_them(mock_get_redis, session):
+    """
+    Verifies that a batch is sent in outbox order through one pipeline and removed once published.
+    """
+    pipeline = mock_get_redis.return_value.pipeline.return_value
+
+    assert publish_outbox_batch(session, batch_size=2) == 2
+
+    sent = [c.args[1]["event_id"] for c in pipeline.xadd.call_args_list]
+    assert sent == [1, 2]
+    assert all(c.args[0] == STREAM_KEY for c in pipeline.xadd.call_args_list)
+    pipeline.execute.assert_called_once()
+    assert session.scalars(select(EventOutbox.event_id)).all() == [3]
+
+@patch('events_app.change_feed.get_redis')
+def test_publish_outbox_batch_keeps_rows_when_redis_fails(mock_get_redis, session):
+    """
+    Verifies that rows stay in the outbox when the stream cannot be written, so the next run retries them.
+    """
+    mock_get_redis.return_value.pipeline.return_value.execute.side_effect = ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        publish_outbox_batch(session, batch_size=10)
+    session.rollback()
+
+    assert session.scalar(select(func.count()).select_from(EventOutbox)) == 3
+
+@patch('events_app.change_feed.get_redis')
+def test_ensure_consumer_group_ignores_existing_group(mock_get_redis):
+    """
+    Verifies that creating an existing group is not an error but other failures are.
+    """
+    mock_redis = mock_get_redis.return_value
+    mock_redis.xgroup_create.side_effect = ResponseError("BUSYGROUP Consumer Group name already exists")
+    ensure_consumer_group("notifications")
+
+    mock_redis.xgroup_create.side_effect = ResponseError("WRONGTYPE")
+    with pytest.raises(ResponseError):
+        ensure_consumer_group("notifications")
+
+@patch('events_app.change_feed.get_redis')
+def test_read_changes_redelivers_pending_before_new_entries(mock_get_redis):
+    """
+    Verifies that unacknowledged entries are returned first and new ones only once none are pending.
+    """
+    mock_redis = mock_get_redis.return_value
+    mock_redis.xreadgroup.side_effect = [
+        [[STREAM_KEY.encode(), [(b"1-0", {b"event_id": b"7"})]]],
+        [[STREAM_KEY.encode(), []]],
+        [[STREAM_KEY.encode(), [(b"2-0", {b"event_id": b"8"})]]],
+    ]
+
+    assert read_changes("notifications", "worker-1") == [("1-0", {"event_id": "7"})]
+    assert read_changes("notifications", "worker-1", block_ms=10) == [("2-0", {"event_id": "8"})]
+    assert mock_redis.xreadgroup.call_args.args[2] == {STREAM_KEY: ">"}
+    assert ack_changes("notifications", []) == 0
@@ -0,0 +1,47 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from events_app.conditional import list_validators, http_date, is_not_modified
+
+NOW = datetime(2030, 5, 1, 12, 0, 30, tzinfo=timezone.utc)
+
+def test_validators_change_with_version_and_status_window():
+    """
+    Verifies that the ETag changes on every watermark bump and when a new status window starts.
+    """
+    etag, _ = list_validators(3, NOW - timedelta(hours=1), now=NOW)
+
+    assert list_validators(3, NOW - timedelta(hours=1), now=NOW + timedelta(seconds=1))[0] == etag
+    assert list_validators(4, NOW, now=NOW)[0] != etag
+    assert list_validators(3, NOW - timedelta(hours=1), now=NOW + timedelta(seconds=60))[0] != etag
+
+def test_last_modified_is_never_before_the_status_window():
+    """
+    Verifies that Last-Modified moves to the window start when the data itself is older.
+    """
+    _, last_modified = list_validators(1, datetime(2020, 1, 1), now=NOW)
+
+    assert last_modified == datetime(2030, 5, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert http_date(last_modified) == "Wed, 01 May 2030 12:00:00 GMT"
+
+def test_if_none_match_uses_weak_comparison_and_lists():
+    """
+    Verifies matching against one of several tags, with or without the W/ prefix, and "*".
+    """
+    etag, last_modified = list_validators(7, None, now=NOW)
+    strong = etag[2:]
+
+    assert is_not_modified(etag, last_modified, if_none_match=f'"other", {strong}')
+    assert is_not_modified(etag, last_modified, if_none_match="*")
+    assert not is_not_modified(etag, last_modified, if_none_match='W/"6-1"')
+
+def test_if_modified_since_is_ignored_when_an_etag_is_sent():
+    """
+    Verifies that If-None-Match takes precedence and that bad dates never produce a 304.
+    """
+    etag, last_modified = list_validators(7, None, now=NOW)
+    later = http_date(last_modified + timedelta(minutes=5))
+
+    assert is_not_modified(etag, last_modified, if_modified_since=later)
+    assert not is_not_modified(etag, last_modified, if_none_match='"stale"', if_modified_since=later)
+    assert not is_not_modified(etag, last_modified, if_modified_since="not a date")
+    assert not is_not_modified(etag, last_modified, if_modified_since=http_date(last_modified - timedelta(seconds=1)))
@@ -0,0 +1,63 @@
+import pytest
+from events_app import database
+from events_app.metrics import TimedAsyncAdaptedQueuePool
+
+def test_engine_options_apply_pool_settings(monkeypatch):
+    """
+    Verifies that pool size, overflow, recycle and timeout come from the DB_POOL_* settings.
+    """
+    monkeypatch.setattr(database, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(database, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(database, "DB_POOL_RECYCLE", 300)
+    monkeypatch.setattr(database, "DB_POOL_TIMEOUT", 5.0)
+
+    options = database.engine_options("postgresql+asyncpg://u:p@db/events", TimedAsyncAdaptedQueuePool, "async")
+
+    assert options["poolclass"] is TimedAsyncAdaptedQueuePool
+    assert (options["pool_size"], options["max_overflow"]) == (20, 0)
+    assert (options["pool_recycle"], options["pool_timeout"]) == (300, 5.0)
+    assert "connect_args" not in options
+
+def test_engine_options_keep_sqlite_default_pool():
+    """
+    Verifies that SQLite URLs get no QueuePool arguments (its default pools reject them).
+    """
+    options = database.engine_options("sqlite:///events.db", TimedAsyncAdaptedQueuePool, "primary")
+
+    assert "poolclass" not in options
+    assert "pool_size" not in options
+
+def test_pgbouncer_mode_disables_prepared_statement_reuse(monkeypatch):
+    """
+    Verifies that DB_PGBOUNCER turns off asyncpg's statement caches and gives every prepared statement a unique name.
+    """
+    monkeypatch.setattr(database, "DB_PGBOUNCER", True)
+
+    connect_args = database.engine_options(
+        "postgresql+asyncpg://u:p@pgbouncer/events", TimedAsyncAdaptedQueuePool, "async"
+    )["connect_args"]
+
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+def test_read_engine_falls_back_to_primary(monkeypatch):
+    """
+    Verifies that read routes use the primary's async engine when DATABASE_READ_URL is not set.
+    """
+    primary = object()
+    monkeypatch.setattr(database, "ASYNC_DATABASE_READ_URL", None)
+    monkeypatch.setattr(database, "get_async_engine", lambda: primary)
+
+    assert database.get_async_read_engine() is primary
+
+def test_missing_database_url_is_reported_on_first_use(monkeypatch):
+    """
+    Verifies that a missing DATABASE_URL fails when the engine is needed, not at import time.
+    """
+    monkeypatch.setattr(database, "DATABASE_URL", None)
+    monkeypatch.setattr(database, "_engine", None)
+
+    with pytest.raises(ValueError, match="DATABASE_URL"):
+        database.get_engine()
@@ -1,7 +1,36 @@
 import pytest
 from datetime import datetime, timezone, timedelta
-from unittest.mock import patch, MagicMock
-from events_app.tasks import generate_recurring_events
+from unittest.mock import patch, MagicMock, ANY
+from dateutil.relativedelta import relativedelta
+from events_app.tasks import (
+    generate_recurring_events,
+    generate_recurring_events_shard,
+    combine_recurring_event_shards,
+    dispatch_recurring_events,
+    archive_completed_events,
+    trigger_recurring_events,
+    task_status,
+    relay_event_outbox,
+    shard_for,
+)
+from events_app.celery_app import RECURRENCE_LOCK_KEY
+
+@pytest.fixture(autouse=True)
+def mock_record_task_run():
+    """
+    Keeps task metrics out of Redis in every test of this module.
+    """
+    with patch('events_app.tasks.record_task_run') as mock_record:
+        yield mock_record
+
+@pytest.fixture(autouse=True)
+def mock_lock():
+    """
+    Grants the recurrence lock without Redis in every test of this module.
+    """
+    with patch('events_app.tasks.acquire_lock', return_value="token") as mock_acquire, \
+            patch('events_app.tasks.release_lock') as mock_release:
+        yield mock_acquire, mock_release
 
 @pytest.fixture
 def mock_event_data():
@@ -32,14 +61,15 @@ def new_dates_data(mock_event_data):
         'registration_deadline': new_start_date - timedelta(days=5)
     }
 
+@patch('events_app.tasks.bump_event_list_version')
 @patch('events_app.tasks.SessionLocal')
 @patch('events_app.tasks.EventManager')
 @patch('events_app.tasks.datetime')
-def test_generate_recurring_events_success(mock_dt, MockEventManager, MockSessionLocal, 
-                                          mock_event_data, new_dates_data):
+def test_generate_recurring_events_success(mock_dt, MockEventManager, MockSessionLocal, mock_bump_version,
+                                          mock_event_data, new_dates_data, mock_record_task_run):
     """
     Verifies successful generation when the base event is outdated and the next event does not exist.
-    Checks if EventManager methods are called and transaction is committed.
+    Checks that only due series are requested and the transaction is committed.
     """
     current_mock_time = datetime.now(timezone.utc).replace(microsecond=0)
     mock_dt.now.return_value = current_mock_time
@@ -49,30 +79,37 @@ def test_generate_recurring_events_success(mock_dt, MockEventManager, MockSessio
     mock_manager = MockEventManager.return_value
 
     base_title = "Conference Base Title"
-    mock_manager.get_latest_events_by_title.return_value = {base_title: mock_event_data}
-    mock_manager._calculate_next_dates.return_value = new_dates_data
-    mock_db.query.return_value.filter.return_value.first.return_value = None
+    mock_manager.get_due_events.return_value = {base_title: mock_event_data}
 
     new_event_mock = MagicMock(title=f"{base_title} - {new_dates_data['start_date'].strftime('%B %Y')}")
-    mock_manager.create_next_event.return_value = new_event_mock
+    mock_manager.plan_next_events.return_value = [{"title": new_event_mock.title}]
+    mock_manager.insert_events.return_value = [new_event_mock]
     
     result = generate_recurring_events()
 
-    mock_manager._calculate_next_dates.assert_called_once_with(mock_event_data)
-    mock_manager.create_next_event.assert_called_once_with(mock_event_data)
+    mock_manager.get_due_events.assert_called_once_with(due_before=current_mock_time)
+    mock_manager.get_recurrence_rules.assert_called_once_with([base_title])
+    mock_manager.plan_next_events.assert_called_once_with(
+        mock_event_data, until=None, rule=mock_manager.get_recurrence_rules.return_value.get.return_value
+    )
+    mock_manager.insert_events.assert_called_once_with([{"title": new_event_mock.title}])
+    mock_db.query.assert_not_called()
+    mock_manager.bump_watermark.assert_called_once()
     mock_db.commit.assert_called_once()
+    mock_bump_version.assert_called_once()
     assert result['created_count'] == 1
     mock_db.close.assert_called_once()
+    mock_record_task_run.assert_called_once_with("generate_recurring_events", ANY, 1, 1)
 
 
 @patch('events_app.tasks.SessionLocal')
 @patch('events_app.tasks.EventManager')
 @patch('events_app.tasks.datetime')
-def test_generate_recurring_events_skip_exists(mock_dt, MockEventManager, MockSessionLocal, 
-                                              mock_event_data, new_dates_data):
+def test_generate_recurring_events_skip_duplicate(mock_dt, MockEventManager, MockSessionLocal, 
+                                                 mock_event_data, new_dates_data):
     """
-    Verifies that the task skips generation if the next event already exists in the DB.
-    Checks that create_next_event and db.commit are not called.
+    Verifies that the task skips a series whose next event already exists (skipped by the batch insert).
+    Checks that db.commit is not called and nothing is counted.
     """
     current_mock_time = datetime.now(timezone.utc).replace(microsecond=0)
     mock_dt.now.return_value = current_mock_time
@@ -82,14 +119,13 @@ def test_generate_recurring_events_skip_exists(mock_dt, MockEventManager, MockSe
     mock_manager = MockEventManager.return_value
 
     base_title = "Conference Base Title"
-    mock_manager.get_latest_events_by_title.return_value = {base_title: mock_event_data}
-    mock_manager._calculate_next_dates.return_value = new_dates_data
-    
-    mock_db.query.return_value.filter.return_value.first.return_value = MagicMock()
+    mock_manager.get_due_events.return_value = {base_title: mock_event_data}
+    mock_manager.plan_next_events.return_value = [{"title": "Conference Base Title - Next Month"}]
+    mock_manager.insert_events.return_value = []
 
     result = generate_recurring_events()
 
-    mock_manager.create_next_event.assert_not_called()
+    mock_manager.insert_events.assert_called_once()
     mock_db.commit.assert_not_called()
     assert result['created_count'] == 0
     mock_db.close.assert_called_once()
@@ -104,10 +140,275 @@ def test_generate_recurring_events_handles_exception(MockEventManager, MockSessi
     mock_db = MockSessionLocal.return_value
     mock_manager = MockEventManager.return_value
     
-    mock_manager.get_latest_events_by_title.side_effect = Exception("DB connection error")
+    mock_manager.get_due_events.side_effect = Exception("DB connection error")
 
     with pytest.raises(Exception, match="DB connection error"):
         generate_recurring_events()
 
     mock_db.rollback.assert_called_once()
-    mock_db.close.assert_called_once()
\ No newline at end of file
+    mock_db.close.assert_called_once()
+
+@patch('events_app.tasks.bump_event_list_version')
+@patch('events_app.tasks.SessionLocal')
+@patch('events_app.tasks.EventManager')
+@patch('events_app.tasks.datetime')
+def test_generate_recurring_events_catch_up_with_horizon(mock_dt, MockEventManager, MockSessionLocal, mock_bump_version,
+                                                        mock_event_data):
+    """
+    Verifies that catch-up mode creates all missed occurrences of a series in one run with a single commit,
+    and that the horizon moves the due cutoff ahead of now.
+    """
+    current_mock_time = datetime.now(timezone.utc).replace(microsecond=0)
+    mock_dt.now.side_effect = lambda tz=None: current_mock_time.astimezone(tz) if tz else current_mock_time
+
+    mock_db = MockSessionLocal.return_value
+    mock_manager = MockEventManager.return_value
+    mock_manager.get_due_events.return_value = {"Conference Base Title": mock_event_data}
+    mock_manager.plan_next_events.return_value = [{}, {}, {}]
+    mock_manager.insert_events.return_value = [MagicMock(), MagicMock(), MagicMock()]
+
+    result = generate_recurring_events(catch_up=True, horizon_months=6)
+
+    cutoff = current_mock_time + relativedelta(months=6)
+    mock_manager.get_due_events.assert_called_once_with(due_before=cutoff)
+    mock_manager.plan_next_events.assert_called_once_with(
+        mock_event_data, until=cutoff, rule=mock_manager.get_recurrence_rules.return_value.get.return_value
+    )
+    mock_db.commit.assert_called_once()
+    assert result['created_count'] == 3
+    mock_db.close.assert_called_once()
+
+
+
+def test_shard_for_is_stable_and_in_range():
+    """
+    Verifies that a series always lands on the same shard and shard numbers stay in range.
+    """
+    keys = [f"Series {i}" for i in range(100)]
+
+    shards = [shard_for(key, 4) for key in keys]
+
+    assert shards == [shard_for(key, 4) for key in keys]
+    assert set(shards) == {0, 1, 2, 3}
+
+
+@patch('events_app.tasks.chord')
+@patch('events_app.tasks.SessionLocal')
+@patch('events_app.tasks.EventManager')
+def test_dispatch_recurring_events_fans_out_shards(MockEventManager, MockSessionLocal, mock_chord):
+    """
+    Verifies that the coordinator sends every due series to exactly one shard task
+    and combines the shards with a chord callback.
+    """
+    keys = [f"Series {i}" for i in range(20)]
+    MockEventManager.return_value.get_due_series_keys.return_value = keys
+    mock_chord.return_value.return_value.id = "chord-id"
+
+    result = dispatch_recurring_events(catch_up=True, shard_count=3)
+
+    header = mock_chord.call_args[0][0]
+    dispatched = [key for signature in header for key in signature.args[0]]
+    assert sorted(dispatched) == sorted(keys)
+    assert all(signature.kwargs["catch_up"] is True for signature in header)
+    assert result == {"chord_id": "chord-id", "shard_count": len(header), "series_count": 20}
+    MockSessionLocal.return_value.close.assert_called_once()
+    mock_chord.return_value.assert_called_once_with(
+        combine_recurring_event_shards.s(lock_token="token")
+    )
+
+
+@patch('events_app.tasks.chord')
+@patch('events_app.tasks.SessionLocal')
+@patch('events_app.tasks.EventManager')
+def test_dispatch_recurring_events_without_due_series(MockEventManager, MockSessionLocal, mock_chord, mock_lock):
+    """
+    Verifies that nothing is dispatched when no series is due.
+    """
+    MockEventManager.return_value.get_due_series_keys.return_value = []
+
+    result = dispatch_recurring_events()
+
+    mock_chord.assert_not_called()
+    assert result["created_count"] == 0
+    mock_lock[1].assert_called_once_with(RECURRENCE_LOCK_KEY, "token")
+
+
+@patch('events_app.tasks.chord')
+@patch('events_app.tasks.SessionLocal')
+def test_recurrence_tasks_skip_while_locked(MockSessionLocal, mock_chord, mock_lock):
+    """
+    Verifies that a run which finds the recurrence lock taken does nothing and releases nothing.
+    """
+    mock_acquire, mock_release = mock_lock
+    mock_acquire.return_value = None
+
+    assert generate_recurring_events()["skipped"] is True
+    assert dispatch_recurring_events()["skipped"] is True
+
+    MockSessionLocal.assert_not_called()
+    mock_chord.assert_not_called()
+    assert all(c.args[0] != RECURRENCE_LOCK_KEY for c in mock_release.call_args_list)
+
+
+@patch('events_app.tasks.bump_event_list_version')
+@patch('events_app.tasks.SessionLocal')
+@patch('events_app.tasks.EventManager')
+def test_generate_recurring_events_shard_limits_series(MockEventManager, MockSessionLocal, mock_bump_version,
+                                                       mock_event_data):
+    """
+    Verifies that a shard only loads its own series and that shard results are summed.
+    """
+    mock_manager = MockEventManager.return_value
+    mock_manager.get_due_events.return_value = {"Conference Base Title": mock_event_data}
+    mock_manager.plan_next_events.return_value = [{}]
+    mock_manager.insert_events.return_value = [MagicMock()]
+
+    result = generate_recurring_events_shard(["Conference Base Title"])
+
+    assert mock_manager.get_due_events.call_args.kwargs["series_keys"] == ["Conference Base Title"]
+    assert result == {"created_count": 1}
+    assert combine_recurring_event_shards([result, {"created_count": 2}]) == {"created_count": 3, "shard_count": 2}
+
+
+@patch('events_app.tasks.bump_event_list_version')
+@patch('events_app.tasks.SessionLocal')
+@patch('events_app.tasks.EventManager')
+def test_generate_recurring_events_releases_lock_on_error(MockEventManager, MockSessionLocal, mock_bump_version,
+                                                         mock_lock):
+    """
+    Verifies that a failing run still releases the lock it took.
+    """
+    MockEventManager.return_value.get_due_events.side_effect = Exception("DB connection error")
+
+    with pytest.raises(Exception):
+        generate_recurring_events()
+
+    mock_lock[1].assert_any_call(RECURRENCE_LOCK_KEY, "token")
+
+
+@patch('events_app.tasks.bump_event_list_version')
+@patch('events_app.tasks.SessionLocal')
+@patch('events_app.tasks.EventManager')
+@patch('events_app.tasks.datetime')
+def test_archive_completed_events_uses_retention_cutoff(mock_dt, MockEventManager, MockSessionLocal,
+                                                        mock_bump_version, mock_record_task_run):
+    """
+    Verifies that events older than after_days are archived and the list cache version is bumped.
+    """
+    current_mock_time = datetime(2030, 6, 1, tzinfo=timezone.utc)
+    mock_dt.now.return_value = current_mock_time
+    mock_manager = MockEventManager.return_value
+    mock_manager.archive_completed_events.return_value = 42
+
+    result = archive_completed_events(after_days=30, batch_size=100)
+
+    mock_manager.archive_completed_events.assert_called_once_with(
+        current_mock_time - timedelta(days=30), batch_size=100
+    )
+    mock_bump_version.assert_called_once()
+    MockSessionLocal.return_value.close.assert_called_once()
+    mock_record_task_run.assert_called_once_with("archive_completed_events", ANY, 0, 42)
+    assert result == {"archived_count": 42}
+
+
+@patch('events_app.tasks.generate_recurring_events.apply_async')
+def test_trigger_recurring_events_enqueues_with_trigger_key_id(mock_apply_async, mock_lock):
+    """
+    Verifies that a free trigger key is taken with the id of the task that gets enqueued.
+    """
+    mock_acquire, _ = mock_lock
+    mock_acquire.side_effect = lambda name, ttl, token=None: token
+
+    result = trigger_recurring_events(catch_up=True)
+
+    assert result["coalesced"] is False
+    assert mock_acquire.call_args.kwargs["token"] == result["task_id"]
+    mock_apply_async.assert_called_once_with(kwargs={"catch_up": True}, task_id=result["task_id"])
+
+
+@patch('events_app.tasks.AsyncResult')
+@patch('events_app.tasks.lock_holder', return_value="running-id")
+@patch('events_app.tasks.generate_recurring_events.apply_async')
+def test_trigger_recurring_events_coalesces_while_running(mock_apply_async, mock_holder, MockAsyncResult, mock_lock):
+    """
+    Verifies that a trigger while a triggered run is still running returns that run's id.
+    """
+    mock_lock[0].return_value = None
+    MockAsyncResult.return_value.state = "STARTED"
+
+    assert trigger_recurring_events() == {"task_id": "running-id", "coalesced": True}
+    mock_apply_async.assert_not_called()
+
+
+@patch('events_app.tasks.AsyncResult')
+@patch('events_app.tasks.lock_holder', return_value="finished-id")
+@patch('events_app.tasks.generate_recurring_events.apply_async')
+def test_trigger_recurring_events_replaces_finished_run(mock_apply_async, mock_holder, MockAsyncResult, mock_lock):
+    """
+    Verifies that a trigger key left by a finished run is released and a new run is enqueued.
+    """
+    mock_acquire, mock_release = mock_lock
+    mock_acquire.side_effect = [None, "new-token"]
+    MockAsyncResult.return_value.state = "SUCCESS"
+
+    result = trigger_recurring_events()
+
+    assert result["coalesced"] is False
+    mock_release.assert_called_once_with(ANY, "finished-id")
+    mock_apply_async.assert_called_once()
+
+
+@patch('events_app.tasks.AsyncResult')
+def test_task_status_reports_created_count(MockAsyncResult):
+    """
+    Verifies that a finished task reports its created_count, a run skipped by the lock is flagged
+    as skipped, and a failed one reports its error.
+    """
+    MockAsyncResult.return_value.state = "SUCCESS"
+    MockAsyncResult.return_value.result = {"created_count": 4}
+
+    assert task_status("task-id") == {
+        "task_id": "task-id", "status": "SUCCESS", "created_count": 4, "skipped": False, "error": None,
+    }
+
+    MockAsyncResult.return_value.result = {"created_count": 0, "skipped": True}
+
+    assert task_status("task-id")["skipped"] is True
+
+    MockAsyncResult.return_value.state = "FAILURE"
+    MockAsyncResult.return_value.result = ValueError("boom")
+
+    assert task_status("task-id")["error"] == "ValueError('boom')"
+
+
+@patch('events_app.tasks.AsyncResult')
+def test_task_status_route_exposes_skipped_runs(MockAsyncResult):
+    """
+    Verifies that the status endpoint tells a run skipped by the lock apart from one that created nothing.
+    """
+    from fastapi.testclient import TestClient
+    from events_app.main import app
+
+    MockAsyncResult.return_value.state = "SUCCESS"
+    MockAsyncResult.return_value.result = {"created_count": 0, "skipped": True}
+
+    response = TestClient(app).get("/events/celery/tasks/task-id")
+
+    assert response.status_code == 200
+    assert response.json()["skipped"] is True
+
+
+@patch('events_app.tasks.publish_outbox_batch')
+@patch('events_app.tasks.SessionLocal')
+def test_relay_event_outbox_drains_in_batches(MockSessionLocal, mock_publish, mock_record_task_run):
+    """
+    Verifies that the relay keeps publishing full batches and stops at the first partial one.
+    """
+    mock_publish.side_effect = [10, 10, 3]
+
+    result = relay_event_outbox(batch_size=10, max_batches=5)
+
+    assert result == {"published_count": 23}
+    assert mock_publish.call_count == 3
+    MockSessionLocal.return_value.close.assert_called_once()
+    mock_record_task_run.assert_called_once_with("relay_event_outbox", ANY, 0, 23)
@@ -1,9 +1,15 @@
 import pytest
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, date, timezone, timedelta
 from unittest.mock import MagicMock
-from events_app.managers import EventManager
-from events_app.models import Event
+from events_app.managers import EventManager, build_events_query
+from events_app.pagination import encode_cursor
+from events_app.schemas import EventStatus, event_status, EventCreate, RecurrenceRuleIn
+from events_app.recurrence import RecurrenceRule
+from events_app.local_time import to_aware_utc_midnight, kyiv_day
+from events_app.models import Event, EventArchive, EventOutbox, EventSeries, EventWatermark
 from dateutil.relativedelta import relativedelta 
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
 
 @pytest.fixture
 def manager():
@@ -13,6 +19,28 @@ def manager():
     mock_db = MagicMock()
     return EventManager(mock_db)
 
+@pytest.fixture
+def session():
+    """
+    Creates a temporary in-memory SQLite session for query tests.
+    """
+    engine = create_engine("sqlite:///:memory:")
+    Event.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    db_session = Session()
+    yield db_session
+    db_session.close()
+
+def _make_event(title, start_date):
+    return Event(
+        title=title,
+        theme="Technology",
+        start_date=start_date,
+        end_date=start_date + timedelta(days=5),
+        registration_deadline=start_date - timedelta(seconds=1),
+        is_active=True,
+    )
+
 @pytest.fixture
 def previous_event_mock():
     """
@@ -23,6 +51,8 @@ def previous_event_mock():
     mock_event = MagicMock(spec=Event)
     mock_event.start_date = start_date
     mock_event.title = "Conference Base Title"
+    mock_event.series_key = "Conference Base Title"
+    mock_event.theme = "Technology"
     
     return mock_event
 
@@ -70,4 +100,275 @@ def test_create_next_event_logic_and_title(manager, previous_event_mock):
     manager.db.commit.assert_called_once()
     manager.db.refresh.assert_called_once()
     
-    assert result == added_event, "Should return the newly created Event object"
\ No newline at end of file
+    assert result == added_event, "Should return the newly created Event object"
+
+def test_get_latest_events_by_title_groups_in_sql(session):
+    """
+    Verifies that get_latest_events_by_title returns only the newest event per series key
+    and that due_before drops series whose latest event has not started yet.
+    """
+    jan = datetime(2025, 1, 1)
+    session.add_all([
+        _make_event("Meetup - January 2025", jan),
+        _make_event("Meetup - February 2025", jan + relativedelta(months=1)),
+        _make_event("Workshop - January 2025", jan),
+        _make_event("Workshop - March 2025", jan + relativedelta(months=2)),
+        _make_event("Standalone", jan),
+    ])
+    session.commit()
+
+    latest = EventManager(session).get_latest_events_by_title()
+
+    assert set(latest) == {"Meetup", "Workshop", "Standalone"}
+    assert latest["Meetup"].title == "Meetup - February 2025"
+    assert latest["Workshop"].title == "Workshop - March 2025"
+
+    due = EventManager(session).get_latest_events_by_title(due_before=jan + relativedelta(months=1, days=1))
+
+    assert set(due) == {"Meetup", "Standalone"}
+    assert set(EventManager(session).get_latest_events_by_title(series_keys=["Workshop"])) == {"Workshop"}
+
+def test_calculate_pending_dates_catches_up_without_drift(manager):
+    """
+    Verifies that catch-up produces every missed month until one starts after `until`,
+    computing each start from the anchor so month-end dates do not drift.
+    """
+    previous_event = MagicMock(spec=Event)
+    previous_event.start_date = to_aware_utc_midnight(date(2025, 1, 31))
+
+    pending = manager._calculate_pending_dates(previous_event, until=datetime(2025, 4, 1, tzinfo=timezone.utc))
+
+    assert [kyiv_day(dates['start_date']) for dates in pending] == [
+        date(2025, 2, 28),
+        date(2025, 3, 31),
+        date(2025, 4, 30),
+    ]
+    assert [dates['start_date'] for dates in pending] == [
+        to_aware_utc_midnight(date(2025, 2, 28)),
+        to_aware_utc_midnight(date(2025, 3, 31)),
+        to_aware_utc_midnight(date(2025, 4, 30)),
+    ]
+    assert all(d['registration_deadline'] == d['start_date'] - timedelta(seconds=1) for d in pending)
+
+def test_create_next_events_inserts_catch_up_in_one_transaction(session):
+    """
+    Verifies that create_next_events stores all pending occurrences with a single commit.
+    """
+    session.add(_make_event("Meetup - January 2025", datetime(2025, 1, 10)))
+    session.commit()
+    latest = EventManager(session).get_latest_events_by_title()["Meetup"]
+
+    created = EventManager(session).create_next_events(latest, until=datetime(2025, 3, 15, tzinfo=timezone.utc))
+
+    assert [e.title for e in created] == ["Meetup - February 2025", "Meetup - March 2025", "Meetup - April 2025"]
+    assert session.query(Event).count() == 4
+
+
+def test_insert_events_skips_existing_occurrences_without_commit(session):
+    """
+    Verifies that batch mode inserts all new rows, skips existing occurrences instead of raising,
+    and leaves committing to the caller.
+    """
+    session.add(_make_event("Meetup - January 2025", datetime(2025, 1, 10)))
+    session.commit()
+    manager = EventManager(session)
+    latest = manager.get_latest_events_by_title()["Meetup"]
+    rows = manager.plan_next_events(latest, until=datetime(2025, 3, 15, tzinfo=timezone.utc))
+    manager.insert_events(rows[:1])
+
+    created = manager.insert_events(rows)
+
+    assert [e.title for e in created] == ["Meetup - March 2025", "Meetup - April 2025"]
+    session.rollback()
+    assert session.query(Event).count() == 1
+
+
+@pytest.mark.parametrize("status", list(EventStatus))
+def test_status_filter_matches_python_status(session, status):
+    """
+    Verifies that the SQL status predicates select exactly the events whose computed status matches.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    session.add_all([
+        _make_event("Upcoming", now + timedelta(days=3)),
+        _make_event("Running", now - timedelta(days=2)),
+        _make_event("Finished", now - timedelta(days=30)),
+    ])
+    session.commit()
+
+    events = session.scalars(build_events_query(event_status=status)).all()
+
+    assert len(events) == 1
+    assert event_status(events[0].registration_deadline, events[0].end_date) == status
+
+
+def test_series_rules_are_stored_and_applied(session):
+    """
+    Verifies that an explicit recurrence rule is stored on the series, that a later event without
+    a rule keeps it, and that planning uses it for dates and titles.
+    """
+    manager = EventManager(session)
+    start_date = datetime(2025, 1, 6)
+    event_data = EventCreate(
+        title="Standup", theme="Team", start_date=start_date, end_date=start_date + timedelta(days=1),
+        registration_deadline=start_date - timedelta(days=1),
+        recurrence=RecurrenceRuleIn(frequency="WEEKLY", interval=2, duration_days=1, deadline_offset_seconds=3600),
+    )
+    latest = manager.create_base_event(event_data)
+    manager.save_series([EventCreate(**event_data.dict(exclude={"recurrence"}))])
+    session.commit()
+
+    rules = manager.get_recurrence_rules(["Standup", "Unknown"])
+
+    assert rules == {"Standup": RecurrenceRule(
+        "WEEKLY", 2, timedelta(days=1), timedelta(hours=1), anchor=datetime(2025, 1, 6, tzinfo=timezone.utc)
+    )}
+    rows = manager.plan_next_events(latest, rule=rules["Standup"])
+    assert rows[0]["start_date"].date() == datetime(2025, 1, 20).date()
+    assert rows[0]["title"] == "Standup - 20 January 2025"
+
+def test_writes_bump_the_watermark_only_when_rows_are_created(session):
+    """
+    Verifies that the watermark row is created by the first write, bumped by every
+    committed creation and left alone when nothing new was inserted.
+    """
+    manager = EventManager(session)
+    base = manager.create_base_event(EventCreate(
+        title="Watermark", theme="T",
+        start_date=datetime(2030, 1, 10), end_date=datetime(2030, 1, 15),
+        registration_deadline=datetime(2030, 1, 1),
+    ))
+    assert session.get(EventWatermark, 1).version == 1
+
+    manager.create_next_events(base, until=datetime(2030, 3, 20))
+    assert session.get(EventWatermark, 1).version == 2
+
+    session.expire_all()
+    manager.create_next_events(base, until=datetime(2030, 3, 20))
+    assert session.get(EventWatermark, 1).version == 2
+
+def test_created_events_are_written_to_the_outbox(session):
+    """
+    Verifies that every committed creation writes one outbox row per new event in the same
+    transaction, and that a rolled back duplicate leaves no outbox row behind.
+    """
+    manager = EventManager(session)
+    event_in = EventCreate(
+        title="Outbox", theme="T",
+        start_date=datetime(2030, 1, 10), end_date=datetime(2030, 1, 15),
+        registration_deadline=datetime(2030, 1, 1),
+    )
+    base = manager.create_base_event(event_in)
+    created = manager.create_next_events(base, until=datetime(2030, 3, 20))
+    with pytest.raises(ValueError):
+        manager.create_base_event(event_in)
+
+    rows = session.scalars(select(EventOutbox).order_by(EventOutbox.id)).all()
+    assert [row.event_id for row in rows] == [base.id] + [event.id for event in created]
+    assert {row.topic for row in rows} == {"event.created"}
+    assert rows[0].payload.startswith('{"title":"Outbox","theme":"T"')
+
+def test_archive_completed_events_keeps_latest_event_of_each_series(session):
+    """
+    Verifies that old events move to event_archive in batches, that the latest event of a
+    series stays even when it is old, and that include_archived lists both tables in order.
+    """
+    start = datetime(2020, 1, 1)
+    for month in range(5):
+        session.add(_make_event(f"Old - {month}", start + relativedelta(months=month)))
+    session.add(_make_event("Lonely - Jan", start))
+    session.add(_make_event("Old - recent", datetime(2030, 1, 1)))
+    session.commit()
+
+    archived = EventManager(session).archive_completed_events(datetime(2025, 1, 1), batch_size=2)
+
+    remaining = [event.title for event in session.scalars(build_events_query())]
+    archived_titles = [row.title for row in session.scalars(select(EventArchive).order_by(EventArchive.start_date))]
+    assert archived == 5
+    assert remaining == ["Lonely - Jan", "Old - recent"]
+    assert archived_titles == [f"Old - {month}" for month in range(5)]
+    assert session.get(EventWatermark, 1).version == 3
+
+    combined = session.execute(build_events_query(limit=3, include_archived=True)).all()
+    assert [row.title for row in combined] == ["Old - 0", "Lonely - Jan", "Old - 1"]
+    cursor = encode_cursor(combined[-1].start_date, combined[-1].id)
+    rest = session.execute(build_events_query(limit=10, cursor=cursor, include_archived=True)).all()
+    assert [row.title for row in rest] == ["Old - 2", "Old - 3", "Old - 4", "Old - recent"]
+
+def test_legacy_chained_series_gets_no_duplicate_after_the_anchor_backfill(session):
+    """
+    Verifies that a series whose rows were chained in UTC before anchor_start existed (and was
+    backfilled with its first start) continues in the next month instead of repeating the latest one.
+    """
+    first = to_aware_utc_midnight(date(2025, 1, 31))
+    starts = [first]
+    for _ in range(3):
+        starts.append(starts[-1] + relativedelta(months=1))
+    for start in starts:
+        session.add(_make_event(f"Legacy - {start:%B %Y}", start))
+    session.add(EventSeries(key="Legacy", anchor_start=first))
+    session.commit()
+    manager = EventManager(session)
+    latest = manager.get_latest_events_by_title()["Legacy"]
+
+    rows = manager.plan_next_events(
+        latest, until=datetime(2025, 7, 1, tzinfo=timezone.utc), rule=manager.get_recurrence_rules(["Legacy"])["Legacy"]
+    )
+
+    assert kyiv_day(latest.start_date) == date(2025, 4, 29)
+    assert [kyiv_day(row["start_date"]) for row in rows] == [date(2025, 5, 31), date(2025, 6, 30), date(2025, 7, 31)]
+    assert [row["title"] for row in rows] == ["Legacy - May 2025", "Legacy - June 2025", "Legacy - July 2025"]
+
+def test_create_refuses_occurrences_already_in_the_archive(session):
+    """
+    Verifies that an event whose (series_key, start_date) was archived cannot be created again,
+    so include_archived never lists the occurrence twice.
+    """
+    session.add(_make_event("Old - Jan 2020", datetime(2020, 1, 1)))
+    session.add(_make_event("Old - recent", datetime(2030, 1, 1)))
+    session.commit()
+    EventManager(session).archive_completed_events(datetime(2025, 1, 1))
+    event_in = EventCreate(
+        title="Old - January 2020", theme="T",
+        start_date=datetime(2020, 1, 1), end_date=datetime(2020, 1, 6),
+        registration_deadline=datetime(2019, 12, 31),
+    )
+
+    with pytest.raises(ValueError, match="archived"):
+        EventManager(session).create_base_event(event_in)
+
+    combined = session.execute(build_events_query(include_archived=True)).all()
+    assert [row.title for row in combined] == ["Old - Jan 2020", "Old - recent"]
+
+def test_next_due_at_follows_inserts_and_selects_due_series(session):
+    """
+    Verifies that next_due_at tracks the latest start of each series through the insert paths,
+    never moves backwards, and that the due queries read only series past it.
+    """
+    manager = EventManager(session)
+    for title, day in (("Meetup", 10), ("Workshop", 20)):
+        manager.create_base_event(EventCreate(
+            title=title, theme="T",
+            start_date=datetime(2030, 1, day), end_date=datetime(2030, 1, day + 5),
+            registration_deadline=datetime(2030, 1, 1),
+        ))
+    meetup = session.scalars(select(Event).where(Event.series_key == "Meetup")).one()
+    manager.insert_events(manager.plan_next_events(meetup))
+    session.commit()
+
+    series = {row.key: row.next_due_at for row in session.scalars(select(EventSeries))}
+    assert series == {"Meetup": datetime(2030, 2, 10), "Workshop": datetime(2030, 1, 20)}
+
+    late_columns = ("title", "series_key", "theme", "description", "end_date", "registration_deadline", "is_active")
+    late_row = {name: getattr(meetup, name) for name in late_columns}
+    manager.insert_events([{**late_row, "start_date": datetime(2030, 1, 5)}])
+    session.commit()
+    session.expire_all()
+    assert session.get(EventSeries, "Meetup").next_due_at == datetime(2030, 2, 10)
+
+    assert manager.get_due_series_keys(datetime(2030, 2, 1)) == ["Workshop"]
+    due = manager.get_due_events(datetime(2030, 3, 1))
+    assert {key: event.start_date for key, event in due.items()} == {
+        "Meetup": datetime(2030, 2, 10), "Workshop": datetime(2030, 1, 20),
+    }
+    assert set(manager.get_due_events(datetime(2030, 3, 1), series_keys=["Workshop"])) == {"Workshop"}
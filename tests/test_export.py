@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta, timezone
+from httpx import ASGITransport, AsyncClient
+from events_app import database
+from events_app.export import encode_ndjson, encode_csv, EXPORT_COLUMNS
+from events_app.main import app
+from events_app.models import Event
+
+def _row(event_id, start_date):
+    return {
+        "id": event_id,
+        "title": f"Meetup {event_id}",
+        "series_key": "Meetup",
+        "theme": "Technology",
+        "description": "",
+        "start_date": start_date,
+        "end_date": start_date + timedelta(days=5),
+        "registration_deadline": start_date - timedelta(seconds=1),
+        "is_active": True,
+        "created_at": start_date - timedelta(days=30),
+    }
+
+def test_encode_ndjson_writes_one_object_per_line():
+    """
+    Verifies that every row becomes one JSON line with ISO datetimes and a computed status.
+    """
+    start_date = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    lines = encode_ndjson([_row(1, start_date), _row(2, start_date)]).splitlines()
+
+    assert len(lines) == 2
+    first = json.loads(lines[0])
+    assert first["start_date"] == start_date.isoformat()
+    assert first["status"] == "Completed"
+
+def test_encode_csv_header_matches_rows():
+    """
+    Verifies that the header written once at the start lines up with every later batch.
+    """
+    start_date = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    text = encode_csv([], header=True) + encode_csv([_row(1, start_date)]) + encode_csv([_row(2, start_date)])
+
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert list(rows[0]) == EXPORT_COLUMNS + ["status"]
+    assert [row["id"] for row in rows] == ["1", "2"]
+
+@pytest_asyncio.fixture
+async def client(tmp_path, monkeypatch):
+    """
+    HTTP client for the app with the async engines pointed at a SQLite file (aiosqlite) holding
+    three events, the second one inactive.
+    """
+    monkeypatch.setattr(database, "ASYNC_DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'events.db'}")
+    monkeypatch.setattr(database, "ASYNC_DATABASE_READ_URL", None)
+    monkeypatch.setattr(database, "_async_engine", None)
+    engine = database.get_async_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Event.metadata.create_all)
+    start_date = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    async with database.AsyncSessionLocal() as db:
+        for event_id in (1, 2, 3):
+            db.add(Event(**dict(_row(event_id, start_date + timedelta(days=event_id)), is_active=event_id != 2)))
+        await db.commit()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as http_client:
+        yield http_client
+    await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_export_route_streams_ndjson(client):
+    """
+    Verifies that GET /events/export streams every event as NDJSON in start order, and only active ones with is_active.
+    """
+    everything = await client.get("/events/export")
+    active = await client.get("/events/export", params={"is_active": "true"})
+
+    assert everything.status_code == 200
+    assert everything.headers["content-type"] == "application/x-ndjson"
+    assert everything.headers["content-disposition"] == 'attachment; filename="events.ndjson"'
+    rows = [json.loads(line) for line in everything.text.splitlines()]
+    assert [row["id"] for row in rows] == [1, 2, 3]
+    assert rows[0]["title"] == "Meetup 1"
+    assert rows[0]["status"] == "Open"
+    assert [json.loads(line)["id"] for line in active.text.splitlines()] == [1, 3]
+
+@pytest.mark.asyncio
+async def test_export_route_streams_csv(client):
+    """
+    Verifies that the CSV export has one header line followed by the filtered rows.
+    """
+    response = await client.get("/events/export", params={"format": "csv", "is_active": "false"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert list(rows[0]) == EXPORT_COLUMNS + ["status"]
+    assert [(row["id"], row["title"], row["is_active"]) for row in rows] == [("2", "Meetup 2", "False")]
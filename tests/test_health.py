@@ -0,0 +1,74 @@
+import pytest
+import subprocess
+import sys
+from unittest.mock import patch, AsyncMock
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+from events_app.health import migration_head
+from events_app.main import app
+
+client = TestClient(app)
+
+def test_importing_app_does_not_create_engines():
+    """
+    Verifies that the engines are created lazily, so importing the app needs no database.
+    Runs in a fresh interpreter so other tests cannot have created them already.
+    """
+    code = (
+        "import events_app.main, events_app.database as database; "
+        "assert database._engine is None and database._async_engine is None"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+def test_live_does_not_touch_database():
+    """
+    Verifies that liveness answers without creating an engine.
+    """
+    with patch('events_app.health.get_async_engine') as mock_get_engine:
+        response = client.get("/health/live")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+    mock_get_engine.assert_not_called()
+
+def test_migration_head_is_read_from_alembic_scripts():
+    """
+    Verifies that the expected head is the newest revision shipped in alembic/versions.
+    """
+    assert migration_head()
+
+@patch('events_app.health._check_database', new_callable=AsyncMock)
+def test_ready_when_database_is_at_head(mock_check):
+    """
+    Verifies a 200 when the pool answers and the schema is at the migration head.
+    """
+    mock_check.return_value = {"database": "ok", "migrations": "ok"}
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+@patch('events_app.health._check_database', new_callable=AsyncMock)
+def test_not_ready_when_migrations_are_behind(mock_check):
+    """
+    Verifies a 503 while the applied revision differs from the head.
+    """
+    mock_check.return_value = {"database": "ok", "migrations": "applied none, expected abc"}
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["checks"]["migrations"] == "applied none, expected abc"
+
+@patch('events_app.health._check_database', new_callable=AsyncMock)
+def test_not_ready_when_database_is_unreachable(mock_check):
+    """
+    Verifies a 503 instead of an error when the database cannot be reached.
+    """
+    mock_check.side_effect = OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["checks"]["database"] == "unavailable: OperationalError"
@@ -0,0 +1,40 @@
+from unittest.mock import patch
+from redis.exceptions import ConnectionError as RedisConnectionError
+from events_app.locks import acquire_lock, release_lock, UNLOCKED
+
+@patch('events_app.locks.get_redis')
+def test_acquire_lock_uses_set_nx_with_ttl(mock_get_redis):
+    """
+    Verifies that the lock is taken with SET NX EX and that a held lock returns None.
+    """
+    mock_redis = mock_get_redis.return_value
+    mock_redis.set.return_value = True
+
+    token = acquire_lock("events:lock:test", 60)
+
+    mock_redis.set.assert_called_once_with("events:lock:test", token, nx=True, ex=60)
+    mock_redis.set.return_value = None
+    assert acquire_lock("events:lock:test", 60) is None
+
+@patch('events_app.locks.get_redis')
+def test_lock_degrades_to_unlocked_without_redis(mock_get_redis):
+    """
+    Verifies that an unavailable Redis lets the caller run and that releasing it is a no-op.
+    """
+    mock_get_redis.return_value.set.side_effect = RedisConnectionError("down")
+
+    token = acquire_lock("events:lock:test", 60)
+    release_lock("events:lock:test", token)
+
+    assert token == UNLOCKED
+    mock_get_redis.return_value.eval.assert_not_called()
+
+@patch('events_app.locks.get_redis')
+def test_release_lock_compares_token(mock_get_redis):
+    """
+    Verifies that the release deletes the key only through the compare-and-delete script.
+    """
+    release_lock("events:lock:test", "abc")
+
+    args = mock_get_redis.return_value.eval.call_args.args
+    assert args[1:] == (1, "events:lock:test", "abc")
@@ -0,0 +1,127 @@
+import pytest
+from unittest.mock import patch, call, AsyncMock
+from prometheus_client.parser import text_string_to_metric_families
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from events_app.metrics import (
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    instrument_engine,
+    metrics_middleware,
+    record_task_run,
+    render_task_metrics,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUEST_SQL_STATEMENTS,
+    DB_STATEMENTS,
+)
+
+def _sample(metric, suffix="", **labels):
+    """Returns the value of one rendered sample line, or None if it is missing."""
+    rendered_labels = ",".join(f'{name}="{value}"' for name, value in labels.items())
+    prefix = f"{metric.name}{suffix}{{{rendered_labels}}} "
+    for line in metric.render().splitlines():
+        if line.startswith(prefix):
+            return float(line[len(prefix):])
+    return None
+
+def test_registry_renders_prometheus_text():
+    """
+    Verifies HELP/TYPE lines, label rendering and cumulative histogram buckets.
+    """
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("test_total", "A counter.", ("kind",)))
+    histogram = registry.register(Histogram("test_seconds", "A histogram.", buckets=(0.1, 1.0)))
+    counter.inc(kind="a")
+    counter.inc(2, kind="a")
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+
+    body = registry.render()
+
+    assert "# TYPE test_total counter" in body
+    assert 'test_total{kind="a"} 3' in body
+    assert 'test_seconds_bucket{le="0.1"} 1' in body
+    assert 'test_seconds_bucket{le="1.0"} 2' in body
+    assert 'test_seconds_bucket{le="+Inf"} 2' in body
+    assert "test_seconds_count 2" in body
+    assert "test_seconds_sum 0.55" in body
+
+def test_middleware_labels_by_route_template_and_counts_sql():
+    """
+    Verifies that requests are labelled with the route template (not the raw path)
+    and that statements of instrumented engines are added to the request's SQL count.
+    """
+    engine = create_engine("sqlite://")
+    instrument_engine(engine, "test-middleware")
+    app = FastAPI()
+    app.middleware("http")(metrics_middleware)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {"id": item_id}
+
+    before = _sample(HTTP_REQUEST_SQL_STATEMENTS, "_sum", method="GET", route="/items/{item_id}") or 0
+    client = TestClient(app)
+    assert client.get("/items/1").status_code == 200
+    assert client.get("/items/2").status_code == 200
+
+    assert _sample(HTTP_REQUEST_DURATION, "_count", method="GET", route="/items/{item_id}", status="200") >= 2
+    assert _sample(HTTP_REQUEST_SQL_STATEMENTS, "_sum", method="GET", route="/items/{item_id}") == before + 4
+    assert _sample(DB_STATEMENTS, engine="test-middleware") == 4
+
+@patch('events_app.metrics.get_redis')
+def test_record_task_run_updates_shared_hash(mock_get_redis):
+    """
+    Verifies that a task run increments the counters and the matching duration buckets in Redis.
+    """
+    pipeline = mock_get_redis.return_value.pipeline.return_value
+
+    record_task_run("generate_recurring_events", 0.7, series_scanned=5, events_created=3)
+
+    key = "events:metrics:task:generate_recurring_events"
+    pipeline.hincrby.assert_any_call(key, "runs", 1)
+    pipeline.hincrby.assert_any_call(key, "series_scanned_total", 5)
+    pipeline.hincrby.assert_any_call(key, "events_created_total", 3)
+    pipeline.hincrby.assert_any_call(key, "bucket:1.0", 1)
+    assert call(key, "bucket:0.5", 1) not in pipeline.hincrby.call_args_list
+    pipeline.execute.assert_called_once()
+
+@pytest.mark.asyncio
+@patch('events_app.metrics.get_async_redis')
+async def test_task_metrics_are_rendered_family_by_family(mock_get_async_redis):
+    """
+    Verifies that the task metrics of several tasks parse as Prometheus text, one family
+    per metric with its HELP, type and the samples of every task.
+    """
+    stored = {
+        "events:metrics:task:generate_recurring_events": {
+            b"runs": b"3", b"series_scanned_total": b"12", b"events_created_total": b"4",
+            b"duration_seconds_sum": b"2.5", b"last_duration_seconds": b"0.7", b"bucket:1.0": b"3", b"bucket:0.5": b"1",
+        },
+        "events:metrics:task:archive_completed_events": {b"runs": b"1", b"duration_seconds_sum": b"0.2", b"bucket:0.5": b"1"},
+    }
+    mock_get_async_redis.return_value.hgetall = AsyncMock(side_effect=lambda key: stored.get(key, {}))
+
+    families = {family.name: family for family in text_string_to_metric_families(await render_task_metrics())}
+
+    assert set(families) == {
+        "events_task_runs", "events_task_series_scanned", "events_task_events_created",
+        "events_task_last_duration_seconds", "events_task_last_run_timestamp_seconds", "events_task_duration_seconds",
+    }
+    assert all(family.documentation for family in families.values())
+    assert families["events_task_duration_seconds"].type == "histogram"
+    runs = {sample.labels["task"]: sample.value for sample in families["events_task_runs"].samples}
+    assert runs == {
+        "generate_recurring_events": 3, "generate_recurring_events_shard": 0,
+        "archive_completed_events": 1, "relay_event_outbox": 0,
+    }
+    buckets = {
+        sample.labels["le"]: sample.value for sample in families["events_task_duration_seconds"].samples
+        if sample.name.endswith("_bucket") and sample.labels["task"] == "generate_recurring_events"
+    }
+    assert (buckets["0.5"], buckets["1.0"], buckets["+Inf"]) == (1, 3, 3)
@@ -95,4 +95,45 @@ def test_check_start_before_end_violation(session):
         
     session.rollback() 
 
-    assert "check_start_before_end" in str(excinfo.value) or True
\ No newline at end of file
+    assert "check_start_before_end" in str(excinfo.value) or True
+
+
+def test_series_key_defaults_to_base_title(session):
+    """
+    Verifies that series_key is derived from the title when it is not given explicitly.
+    """
+    now = datetime.now()
+    event = Event(
+        title="Monthly Meetup - January 2026",
+        theme="Testing",
+        start_date=now + timedelta(days=5),
+        end_date=now + timedelta(days=7),
+        registration_deadline=now + timedelta(days=1),
+    )
+    session.add(event)
+    session.commit()
+
+    assert event.series_key == "Monthly Meetup"
+
+
+def test_unique_series_key_start_date_violation(session):
+    """
+    Verifies the unique (series_key, start_date) index rejects a duplicate occurrence.
+    """
+    now = datetime.now()
+    for title in ("Monthly Meetup - January 2026", "Monthly Meetup - January 2026 (copy)"):
+        session.add(Event(
+            title=title,
+            series_key="Monthly Meetup",
+            theme="Testing",
+            start_date=now + timedelta(days=5),
+            end_date=now + timedelta(days=7),
+            registration_deadline=now + timedelta(days=1),
+        ))
+
+    with pytest.raises(IntegrityError) as excinfo:
+        session.commit()
+
+    session.rollback()
+
+    assert "series_key" in str(excinfo.value)
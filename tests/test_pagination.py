@@ -0,0 +1,80 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from events_app.models import Event
+from events_app.pagination import encode_cursor, decode_cursor, next_cursor
+from events_app.managers import build_events_query
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+@pytest.fixture
+def session():
+    """
+    Creates a temporary in-memory SQLite session for testing.
+    """
+    engine = create_engine("sqlite:///:memory:")
+    Event.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    db_session = Session()
+    yield db_session
+    db_session.close()
+
+def test_cursor_round_trip():
+    """
+    Verifies that a cursor decodes back to the same (start_date, id) position.
+    """
+    start_date = datetime(2025, 3, 1, 22, 0, tzinfo=timezone.utc)
+
+    cursor = encode_cursor(start_date, 42)
+
+    assert decode_cursor(cursor) == (start_date, 42)
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", ""])
+def test_decode_cursor_rejects_garbage(cursor):
+    """
+    Verifies that malformed cursors raise ValueError instead of leaking decoding errors.
+    """
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+def test_keyset_pages_cover_all_rows_once(session):
+    """
+    Verifies that walking pages of build_events_query returns every event exactly once,
+    including events that share the same start_date.
+    """
+    start = datetime(2025, 1, 1)
+    for i in range(7):
+        start_date = start + timedelta(days=i // 2)
+        session.add(Event(
+            title=f"Series {i}",
+            theme="Testing",
+            start_date=start_date,
+            end_date=start_date + timedelta(days=5),
+            registration_deadline=start_date - timedelta(seconds=1),
+        ))
+    session.commit()
+
+    seen, cursor = [], None
+    while True:
+        page = session.scalars(build_events_query(limit=3, cursor=cursor)).all()
+        seen.extend(e.id for e in page)
+        cursor = next_cursor(page, 3)
+        if cursor is None:
+            break
+
+    expected = [e.id for e in session.query(Event).order_by(Event.start_date, Event.id)]
+    assert seen == expected
+
+@pytest.mark.parametrize("is_active", [None, True])
+def test_cursor_page_is_an_index_range_scan(session, is_active):
+    """
+    Verifies that a cursor page, with or without the is_active filter, seeks into a
+    (start_date, id) index instead of scanning and sorting the whole table.
+    """
+    query = build_events_query(is_active=is_active, cursor=encode_cursor(datetime(2030, 1, 1, tzinfo=timezone.utc), 5))
+    compiled = query.compile(session.get_bind())
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+
+    plan = " ".join(row[3] for row in session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params))
+
+    assert "USING INDEX ix_event" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,94 @@
+import json
+import os
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from events_app import profiling as profiling_module
+from events_app.profiling import profiling, profile_engine, profiling_middleware, prune_reports, PROFILE_REPORT_HEADER
+
+def test_profile_flags_repeated_and_slow_statements(tmp_path):
+    """
+    Verifies that statements run inside profiling() are recorded with timings, that identical
+    statements above the repeat threshold and statements above the slow threshold are flagged,
+    and that nothing is recorded outside of it.
+    """
+    engine = create_engine("sqlite:///:memory:")
+    profile_engine(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 0"))
+        with patch.object(profiling_module, "PROFILE_SLOW_QUERY_MS", 0.0), \
+                patch.object(profiling_module, "PROFILE_REPEAT_THRESHOLD", 3), \
+                profiling("job", directory=str(tmp_path)) as profile:
+            for series_id in range(4):
+                conn.execute(text("SELECT :series_id"), {"series_id": series_id})
+            conn.execute(text("SELECT 1 + 1"))
+
+    with open(profile.report_path) as f:
+        report = json.load(f)
+    assert report["sql"]["count"] == 5
+    assert [(entry["sql"], entry["count"]) for entry in report["repeated_statements"]] == [("SELECT ?", 4)]
+    assert len(report["slow_statements"]) == 5
+    assert report["name"] == "job"
+    assert os.path.dirname(profile.report_path) == str(tmp_path)
+
+def _app():
+    app = FastAPI()
+    app.middleware("http")(profiling_middleware)
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+    return app
+
+def test_middleware_profiles_only_trusted_clients(tmp_path):
+    """
+    Verifies that X-Profile is honoured for trusted addresses only, that the report is written
+    in the thread pool and that its name is returned.
+    """
+    app = _app()
+    with patch.object(profiling_module, "PROFILE_DIR", str(tmp_path)), \
+            patch.object(profiling_module, "run_in_threadpool", wraps=profiling_module.run_in_threadpool) as threadpool:
+        untrusted = TestClient(app, client=("203.0.113.7", 50000)).get("/ping", headers={"X-Profile": "1"})
+        named = TestClient(app).get("/ping", headers={"X-Profile": "1"})
+        loopback = TestClient(app, client=("127.0.0.1", 50000))
+        trusted = loopback.get("/ping", headers={"X-Profile": "1"})
+        plain = loopback.get("/ping")
+
+    assert PROFILE_REPORT_HEADER not in untrusted.headers
+    assert PROFILE_REPORT_HEADER not in named.headers
+    assert PROFILE_REPORT_HEADER not in plain.headers
+    assert os.listdir(tmp_path) == [trusted.headers[PROFILE_REPORT_HEADER]]
+    assert threadpool.call_count == 1
+
+def test_trusted_ips_accept_addresses_and_ranges_only(tmp_path, monkeypatch):
+    """
+    Verifies that EVENTS_PROFILE_TRUSTED_IPS takes addresses and CIDR ranges and that anything else is untrusted.
+    """
+    monkeypatch.setattr(profiling_module, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling_module, "PROFILE_TRUSTED_IPS", ["10.0.0.0/8", "::1"])
+    profiling_module.trusted_networks.cache_clear()
+    try:
+        app = _app()
+        results = {
+            host: TestClient(app, client=(host, 50000)).get("/ping", headers={"X-Profile": "1"})
+            for host in ("10.1.2.3", "::1", "127.0.0.1", "web")
+        }
+    finally:
+        profiling_module.trusted_networks.cache_clear()
+
+    assert {host for host, response in results.items() if PROFILE_REPORT_HEADER in response.headers} == {"10.1.2.3", "::1"}
+
+def test_prune_reports_keeps_the_newest(tmp_path):
+    """
+    Verifies that only the newest reports are kept once the cap is reached.
+    """
+    for index in range(5):
+        path = tmp_path / f"report-{index}.json"
+        path.write_text("{}")
+        os.utime(path, (1000 + index, 1000 + index))
+
+    prune_reports(str(tmp_path), keep=2)
+
+    assert sorted(os.listdir(tmp_path)) == ["report-3.json", "report-4.json"]
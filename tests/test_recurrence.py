@@ -0,0 +1,94 @@
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from dateutil.relativedelta import relativedelta
+from events_app.local_time import KYIV_TZ, kyiv_day, to_aware_utc_midnight
+from events_app.recurrence import RecurrenceRule
+
+ANCHOR = datetime(2025, 1, 31, tzinfo=timezone.utc)
+
+def test_default_rule_matches_historical_monthly_rule():
+    """
+    Verifies that the default rule is monthly, 5 days long, with the deadline 1 second before start.
+    """
+    rule = RecurrenceRule()
+
+    dates = next(rule.iter_occurrences(datetime(2025, 1, 15, tzinfo=timezone.utc)))
+
+    assert dates["start_date"] == datetime(2025, 1, 15, tzinfo=timezone.utc) + relativedelta(months=1)
+    assert dates["end_date"] == dates["start_date"] + timedelta(days=5)
+    assert dates["registration_deadline"] == dates["start_date"] - timedelta(seconds=1)
+
+@pytest.mark.parametrize("frequency,interval", [("DAILY", 3), ("WEEKLY", 2), ("MONTHLY", 1), ("MONTHLY", 5), ("YEARLY", 1)])
+def test_between_matches_walking_every_occurrence(frequency, interval):
+    """
+    Verifies that jumping straight into a far window returns exactly what walking
+    occurrence by occurrence from the anchor would return.
+    """
+    rule = RecurrenceRule(frequency=frequency, interval=interval)
+    window_start = ANCHOR + timedelta(days=2000)
+    window_end = window_start + timedelta(days=400)
+
+    walked = []
+    for dates in rule.iter_occurrences(ANCHOR):
+        if dates["start_date"] >= window_end:
+            break
+        if dates["start_date"] >= window_start:
+            walked.append(dates)
+
+    assert list(rule.between(ANCHOR, window_start, window_end)) == walked
+    assert walked
+
+def test_between_is_lazy_for_far_windows():
+    """
+    Verifies that a window centuries away is expanded without generating the occurrences before it.
+    """
+    rule = RecurrenceRule(frequency="DAILY")
+    window_start = ANCHOR + timedelta(days=365 * 300)
+
+    occurrences = rule.between(ANCHOR, window_start, window_start + timedelta(days=2))
+
+    assert [d["start_date"] for d in occurrences] == [window_start, window_start + timedelta(days=1)]
+
+def test_rejects_invalid_rules():
+    """
+    Verifies that unsupported frequencies and non-positive intervals are refused.
+    """
+    with pytest.raises(ValueError):
+        RecurrenceRule(frequency="HOURLY")
+    with pytest.raises(ValueError):
+        RecurrenceRule(interval=0)
+
+def test_month_end_series_keeps_its_day_and_kyiv_midnight():
+    """
+    Verifies that a series anchored on the 31st comes back to the 31st after a short month,
+    and that a Kyiv-midnight series stays at Kyiv midnight across both DST changes.
+    """
+    month_end = RecurrenceRule(anchor=to_aware_utc_midnight(date(2031, 1, 31)))
+    summer = RecurrenceRule(anchor=to_aware_utc_midnight(date(2031, 7, 1)))
+
+    month_end_starts = [d["start_date"] for d in islice(month_end.occurrences_after(month_end.anchor), 3)]
+    after_february = next(month_end.occurrences_after(month_end_starts[0]))["start_date"]
+    summer_starts = [d["start_date"] for d in summer.between(summer.anchor, summer.anchor, datetime(2032, 4, 2, tzinfo=timezone.utc))]
+
+    assert month_end_starts == [to_aware_utc_midnight(date(2031, month, day)) for month, day in ((2, 28), (3, 31), (4, 30))]
+    assert after_february == to_aware_utc_midnight(date(2031, 3, 31))
+    assert [kyiv_day(start) for start in summer_starts] == [date(2031, month, 1) for month in range(8, 13)] + [
+        date(2032, month, 1) for month in range(1, 5)
+    ]
+    assert all(start.astimezone(KYIV_TZ).hour == 0 for start in summer_starts)
+    assert summer.title_for("Meetup", to_aware_utc_midnight(date(2031, 10, 1))) == "Meetup - October 2031"
+
+@pytest.mark.parametrize("anchor_day,latest,expected", [
+    (date(2025, 7, 15), datetime(2025, 11, 14, 21, tzinfo=timezone.utc), to_aware_utc_midnight(date(2025, 12, 15))),
+    (date(2025, 1, 31), to_aware_utc_midnight(date(2025, 4, 28)), to_aware_utc_midnight(date(2025, 5, 31))),
+])
+def test_off_grid_latest_start_gets_no_second_occurrence_in_its_period(anchor_day, latest, expected):
+    """
+    Verifies that when the latest stored start is off the anchor's grid (rows chained before the
+    anchor was stored), the next occurrence is in the following period, back on the grid.
+    """
+    rule = RecurrenceRule(anchor=to_aware_utc_midnight(anchor_day))
+
+    assert next(rule.occurrences_after(latest))["start_date"] == expected
+    assert [d["start_date"] for d in rule.between(latest, latest, expected)] == []
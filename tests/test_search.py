@@ -0,0 +1,104 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from events_app.models import Event
+from events_app.managers import build_search_query
+from events_app.pagination import next_cursor
+from events_app.schemas import SearchSort
+from events_app.search import fts5_query
+
+@pytest.fixture
+def session():
+    """
+    Creates a temporary in-memory SQLite session; create_all also creates the FTS5 table and its triggers.
+    """
+    engine = create_engine("sqlite:///:memory:")
+    Event.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    db_session = Session()
+    yield db_session
+    db_session.close()
+
+def _add_event(session, title, theme="General", description="", days=0, is_active=True):
+    start = datetime(2030, 1, 1) + timedelta(days=days)
+    event = Event(
+        title=title, theme=theme, description=description, is_active=is_active,
+        start_date=start, end_date=start + timedelta(days=1), registration_deadline=start - timedelta(days=1),
+    )
+    session.add(event)
+    session.commit()
+    return event
+
+def _search(session, q, **kwargs):
+    return session.execute(build_search_query("sqlite", q, **kwargs)).all()
+
+def test_search_ranks_title_above_theme_and_description(session):
+    """
+    Verifies that a match in the title outranks one in the theme, which outranks one in the description.
+    """
+    _add_event(session, "Workshop", description="Hands-on python", days=0)
+    _add_event(session, "Python Meetup", days=1)
+    _add_event(session, "Data Night", theme="Python", days=2)
+    _add_event(session, "Unrelated", days=3)
+
+    titles = [row.title for row in _search(session, "python")]
+
+    assert titles == ["Python Meetup", "Data Night", "Workshop"]
+
+def test_search_requires_every_word_and_filters_activity(session):
+    """
+    Verifies AND semantics across words and the is_active filter.
+    """
+    _add_event(session, "Python Meetup", theme="Backend")
+    _add_event(session, "Python Night", theme="Data", is_active=False)
+
+    assert [row.title for row in _search(session, "python backend")] == ["Python Meetup"]
+    assert [row.title for row in _search(session, "python", is_active=False)] == ["Python Night"]
+
+def test_search_index_follows_updates_and_deletes(session):
+    """
+    Verifies that the SQLite triggers keep the FTS5 table in sync with the event table.
+    """
+    event = _add_event(session, "Old Title")
+    event.title = "New Title"
+    session.commit()
+
+    assert _search(session, "old") == []
+    assert [row.title for row in _search(session, "new")] == ["New Title"]
+
+    session.delete(event)
+    session.commit()
+    assert _search(session, "new") == []
+
+def test_search_paginates_by_start_date_with_cursor(session):
+    """
+    Verifies that sort=start_date walks all matches exactly once with the list endpoint's cursor.
+    """
+    for day in range(5):
+        _add_event(session, f"Conference {day}", days=day)
+
+    seen, cursor = [], None
+    while True:
+        page = _search(session, "conference", limit=2, cursor=cursor, sort=SearchSort.START_DATE)
+        seen.extend(row.title for row in page)
+        cursor = next_cursor(page, 2)
+        if cursor is None:
+            break
+
+    assert seen == [f"Conference {day}" for day in range(5)]
+
+def test_fts5_query_quotes_user_input():
+    """
+    Verifies that FTS5 operators and quotes in the input are treated as plain words.
+    """
+    assert fts5_query('python OR "meetup') == '"python" "OR" "meetup"'
+
+def test_search_rejects_queries_without_words_and_relevance_cursors():
+    """
+    Verifies the ValueErrors the endpoint turns into 400 responses.
+    """
+    with pytest.raises(ValueError):
+        build_search_query("sqlite", "?!")
+    with pytest.raises(ValueError):
+        build_search_query("sqlite", "python", cursor="abc", sort=SearchSort.RELEVANCE)
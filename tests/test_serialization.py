@@ -0,0 +1,82 @@
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+from collections import namedtuple
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from events_app.models import Event
+from events_app.managers import LIST_COLUMNS, build_events_query
+from events_app.pagination import next_cursor
+from events_app.schemas import EventSerializer
+from events_app.serialization import render_event_rows
+
+@pytest.fixture
+def session():
+    """
+    Creates a temporary in-memory SQLite session for testing.
+    """
+    engine = create_engine("sqlite:///:memory:")
+    Event.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    db_session = Session()
+    yield db_session
+    db_session.close()
+
+def _pydantic_body(events) -> bytes:
+    """The body FastAPI renders for response_model=List[EventSerializer]."""
+    payload = jsonable_encoder([EventSerializer.from_orm(event) for event in events])
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def test_row_rendering_matches_pydantic_output(session):
+    """
+    Verifies that the orjson fast path produces exactly the bytes of the pydantic path,
+    including missing descriptions, non-ASCII text and all three statuses.
+    """
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    for offset, description in ((-40, None), (-3, "Зустріч"), (10, "")):
+        start = now + timedelta(days=offset)
+        session.add(Event(
+            title=f"Подія {offset}", theme="Tech", description=description,
+            start_date=start, end_date=start + timedelta(days=5),
+            registration_deadline=start - timedelta(days=1),
+        ))
+    session.commit()
+
+    events = session.scalars(build_events_query()).all()
+    rows = session.execute(build_events_query(columns=LIST_COLUMNS)).all()
+
+    assert render_event_rows(rows) == _pydantic_body(events)
+    assert {item["status"] for item in json.loads(render_event_rows(rows))} == {"Open", "Closed", "Completed"}
+
+def test_row_rendering_handles_aware_datetimes_with_microseconds():
+    """
+    Verifies the Postgres case (aware datetimes, created_at with microseconds) against the pydantic path.
+    """
+    start = datetime(2030, 3, 1, 22, 0, tzinfo=timezone.utc)
+    values = {
+        "title": "A - March 2030", "theme": "T", "description": "d",
+        "start_date": start, "end_date": start + timedelta(days=5),
+        "registration_deadline": start - timedelta(seconds=1),
+        "id": 7, "is_active": True, "created_at": datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+    }
+    row = namedtuple("Row", [column.name for column in LIST_COLUMNS])(**values)
+
+    assert render_event_rows([row]) == _pydantic_body([row])
+
+def test_next_cursor_works_on_rows(session):
+    """
+    Verifies that plain rows expose start_date and id for the next page cursor.
+    """
+    start = datetime(2030, 1, 1)
+    for day in range(3):
+        session.add(Event(
+            title=f"Event {day}", theme="T", start_date=start + timedelta(days=day),
+            end_date=start + timedelta(days=day + 1), registration_deadline=start - timedelta(days=1),
+        ))
+    session.commit()
+
+    rows = session.execute(build_events_query(limit=2, columns=LIST_COLUMNS)).all()
+    events = session.scalars(build_events_query(limit=2)).all()
+
+    assert next_cursor(rows, 2) == next_cursor(events, 2)